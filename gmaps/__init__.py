@@ -0,0 +1,5 @@
+"""Browser-independent parts of the Google Maps extractor
+
+google_maps_scraper.py holds the Selenium extractor, the GUI and the command
+line; the modules here hold what those share and can be used without Chrome.
+"""
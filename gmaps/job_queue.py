@@ -0,0 +1,331 @@
+"""Distributed mode: a SQLite job queue, its HTTP coordinator and the client workers use"""
+import gzip
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from gmaps.storage import RESULTS_DIR
+
+# A leased job returns to the queue unless its worker
+# heartbeats within JOB_LEASE_SECONDS; a job is given up after JOB_MAX_ATTEMPTS
+JOB_QUEUE_PATH = os.path.join(RESULTS_DIR, "jobs.db")
+JOB_LEASE_SECONDS = 120
+JOB_HEARTBEAT_SECONDS = 30
+JOB_MAX_ATTEMPTS = 3
+JOB_QUEUE_PORT = 8765
+
+class JobQueue:
+    """Queue of keyword/location jobs in a SQLite file, leased out to workers
+
+    Workers on any machine that can open the file (or reach a
+    JobQueueServer in front of it) lease() the oldest queued job, keep it
+    with heartbeat() and finish it with complete() or fail(). A lease that
+    is not renewed within lease_seconds expires and the job is queued
+    again, so a crashed worker's job is picked up by another; reports from
+    a worker that lost its lease are ignored. Records of finished jobs are
+    kept in the file until exported.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        keyword TEXT NOT NULL,
+        location TEXT NOT NULL,
+        max_results INTEGER NOT NULL,
+        status TEXT NOT NULL DEFAULT 'queued',
+        attempts INTEGER NOT NULL DEFAULT 0,
+        worker TEXT,
+        lease_expires REAL,
+        heartbeat_at REAL,
+        result_count INTEGER,
+        results BLOB,
+        error TEXT,
+        created REAL NOT NULL,
+        finished REAL
+    );
+    CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, id);
+    """
+
+    def __init__(self, path=JOB_QUEUE_PATH, lease_seconds=JOB_LEASE_SECONDS, max_attempts=JOB_MAX_ATTEMPTS):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Autocommit mode, so leases can take the write lock with BEGIN IMMEDIATE
+        # and worker processes sharing the file never lease the same job
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.lock = threading.Lock()
+        with self.lock:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript(self.SCHEMA)
+
+    @contextmanager
+    def _transaction(self):
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.conn
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+
+    def add(self, queries):
+        """Queue load_queries-style dicts; returns how many were added"""
+        now = time.time()
+        with self._transaction() as conn:
+            conn.executemany(
+                "INSERT INTO jobs (keyword, location, max_results, created) VALUES (?, ?, ?, ?)",
+                [(query['keyword'], query['location'], int(query['max_results']), now) for query in queries]
+            )
+        return len(queries)
+
+    def _requeue_expired(self, conn, now):
+        expired = conn.execute(
+            "SELECT id, attempts, worker FROM jobs WHERE status = 'leased' AND lease_expires < ?", (now,)
+        ).fetchall()
+        for job in expired:
+            status = 'queued' if job['attempts'] < self.max_attempts else 'failed'
+            logging.warning(f"Lease on job {job['id']} held by {job['worker']} expired; job {status}")
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker = NULL, lease_expires = NULL, error = ? WHERE id = ?",
+                (status, f"lease expired on {job['worker']}", job['id'])
+            )
+        return len(expired)
+
+    def requeue_expired(self):
+        """Queue jobs whose lease ran out again; returns how many"""
+        with self._transaction() as conn:
+            return self._requeue_expired(conn, time.time())
+
+    def lease(self, worker):
+        """Hand the oldest queued job to worker, or None if there is none
+
+        Returns {'id', 'keyword', 'location', 'max_results', 'attempt'}.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            self._requeue_expired(conn, now)
+            job = conn.execute(
+                "SELECT id, keyword, location, max_results, attempts FROM jobs "
+                "WHERE status = 'queued' ORDER BY id LIMIT 1"
+            ).fetchone()
+            if job is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'leased', worker = ?, attempts = attempts + 1, "
+                "lease_expires = ?, heartbeat_at = ? WHERE id = ?",
+                (worker, now + self.lease_seconds, now, job['id'])
+            )
+        return {
+            'id': job['id'], 'keyword': job['keyword'], 'location': job['location'],
+            'max_results': job['max_results'], 'attempt': job['attempts'] + 1,
+        }
+
+    def heartbeat(self, job_id, worker):
+        """Extend worker's lease on a job; False if the lease was lost
+
+        A lease that ran out but has not been handed to another worker yet
+        is still held, so a slow worker does not lose finished work.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            return conn.execute(
+                "UPDATE jobs SET lease_expires = ?, heartbeat_at = ? "
+                "WHERE id = ? AND worker = ? AND status = 'leased'",
+                (now + self.lease_seconds, now, job_id, worker)
+            ).rowcount == 1
+
+    def complete(self, job_id, worker, records):
+        """Store a job's records; False (and nothing stored) if the lease was lost"""
+        blob = gzip.compress(json.dumps([dict(record) for record in records], ensure_ascii=False).encode('utf-8'))
+        with self._transaction() as conn:
+            return conn.execute(
+                "UPDATE jobs SET status = 'done', result_count = ?, results = ?, error = NULL, "
+                "lease_expires = NULL, finished = ? WHERE id = ? AND worker = ? AND status = 'leased'",
+                (len(records), blob, time.time(), job_id, worker)
+            ).rowcount == 1
+
+    def fail(self, job_id, worker, error, retry=True):
+        """Give a job back after an error; it is queued again until max_attempts"""
+        with self._transaction() as conn:
+            job = conn.execute(
+                "SELECT attempts FROM jobs WHERE id = ? AND worker = ? AND status = 'leased'", (job_id, worker)
+            ).fetchone()
+            if job is None:
+                return False
+            status = 'queued' if retry and job['attempts'] < self.max_attempts else 'failed'
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker = NULL, lease_expires = NULL, error = ?, finished = ? "
+                "WHERE id = ?",
+                (status, str(error), time.time() if status == 'failed' else None, job_id)
+            )
+            return True
+
+    def status(self):
+        """Job counts by status, and each active worker's last heartbeat age"""
+        now = time.time()
+        with self.lock:
+            counts = dict(self.conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+            leases = self.conn.execute(
+                "SELECT worker, id, heartbeat_at, lease_expires FROM jobs WHERE status = 'leased'"
+            ).fetchall()
+            businesses = self.conn.execute("SELECT COALESCE(SUM(result_count), 0) FROM jobs").fetchone()[0]
+        return {
+            'jobs': {status: counts.get(status, 0) for status in ('queued', 'leased', 'done', 'failed')},
+            'businesses': businesses,
+            'workers': {
+                row['worker']: {
+                    'job': row['id'],
+                    'heartbeat_age': round(now - row['heartbeat_at'], 1),
+                    'lease_left': round(row['lease_expires'] - now, 1),
+                }
+                for row in leases
+            },
+        }
+
+    def iter_results(self):
+        """Yield the records of every finished job, in job order"""
+        with self.lock:
+            rows = self.conn.execute("SELECT results FROM jobs WHERE status = 'done' ORDER BY id").fetchall()
+        for row in rows:
+            yield from json.loads(gzip.decompress(row['results']).decode('utf-8'))
+
+    def close(self):
+        self.conn.close()
+
+class JobQueueServer:
+    """Small HTTP coordinator in front of a JobQueue, for workers on other machines
+
+    POST /lease, /heartbeat, /complete and /fail take and return JSON and
+    map onto the JobQueue methods; GET /status returns its status(). With
+    a token, requests must send it in an X-Queue-Token header.
+    """
+
+    def __init__(self, job_queue, host="127.0.0.1", port=JOB_QUEUE_PORT, token=None):
+        self.queue = job_queue
+        self.host = host
+        self.port = port
+        self.token = token
+        self._server = None
+
+    def handle(self, action, payload):
+        """Run one request against the queue; returns the JSON-able reply"""
+        if action == 'lease':
+            return {'job': self.queue.lease(payload['worker'])}
+        if action == 'heartbeat':
+            return {'ok': self.queue.heartbeat(payload['job'], payload['worker'])}
+        if action == 'complete':
+            return {'ok': self.queue.complete(payload['job'], payload['worker'], payload['records'])}
+        if action == 'fail':
+            return {'ok': self.queue.fail(payload['job'], payload['worker'], payload['error'], payload.get('retry', True))}
+        raise KeyError(action)
+
+    def start(self):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        coordinator = self
+
+        class QueueHandler(BaseHTTPRequestHandler):
+            def _reply(self, status, body):
+                data = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _authorized(self):
+                if coordinator.token and self.headers.get('X-Queue-Token') != coordinator.token:
+                    self._reply(403, {'error': 'bad token'})
+                    return False
+                return True
+
+            def do_GET(self):
+                if not self._authorized():
+                    return
+                if self.path != '/status':
+                    self._reply(404, {'error': 'not found'})
+                    return
+                self._reply(200, coordinator.queue.status())
+
+            def do_POST(self):
+                if not self._authorized():
+                    return
+                try:
+                    payload = json.loads(self.rfile.read(int(self.headers.get('Content-Length') or 0)) or b'{}')
+                    reply = coordinator.handle(self.path.strip('/'), payload)
+                except KeyError as e:
+                    self._reply(400, {'error': f"bad request: {e}"})
+                    return
+                except ValueError as e:
+                    self._reply(400, {'error': f"bad JSON: {e}"})
+                    return
+                self._reply(200, reply)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), QueueHandler)
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+class RemoteJobQueue:
+    """Client for a JobQueueServer with the worker-side JobQueue methods"""
+
+    def __init__(self, url, token=None, timeout=30):
+        self.url = url.rstrip('/')
+        self.token = token
+        self.timeout = timeout
+
+    def _call(self, action, payload=None):
+        from urllib.request import Request, urlopen
+
+        headers = {'Content-Type': 'application/json'}
+        if self.token:
+            headers['X-Queue-Token'] = self.token
+        data = json.dumps(payload).encode('utf-8') if payload is not None else None
+        request = Request(f"{self.url}/{action}", data=data, headers=headers)
+        with urlopen(request, timeout=self.timeout) as response:
+            return json.loads(response.read())
+
+    def lease(self, worker):
+        return self._call('lease', {'worker': worker})['job']
+
+    def heartbeat(self, job_id, worker):
+        return self._call('heartbeat', {'job': job_id, 'worker': worker})['ok']
+
+    def complete(self, job_id, worker, records):
+        return self._call('complete', {'job': job_id, 'worker': worker, 'records': [dict(record) for record in records]})['ok']
+
+    def fail(self, job_id, worker, error, retry=True):
+        return self._call('fail', {'job': job_id, 'worker': worker, 'error': str(error), 'retry': retry})['ok']
+
+    def status(self):
+        return self._call('status')
+
+    def close(self):
+        pass
+
+def open_job_queue(target, token=None):
+    """A RemoteJobQueue for an http(s):// coordinator URL, else a JobQueue on that file"""
+    if target.startswith(('http://', 'https://')):
+        return RemoteJobQueue(target, token)
+    return JobQueue(target)
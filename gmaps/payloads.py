@@ -0,0 +1,233 @@
+"""Maps network payloads: DevTools traffic, response capture and place parsing"""
+import json
+import logging
+import os
+import re
+import time
+
+MAPS_URL = "https://www.google.com/maps"
+# Maps responses that carry place data: search XHRs, place previews and search/place documents
+PAYLOAD_URL_RE = re.compile(r"/search\?(?:[^#]*&)?tbm=map|/maps/preview/place|/maps/(?:search|place)/")
+
+def read_performance_log(driver):
+    """Drain Chrome's performance log and return the parsed DevTools messages"""
+    try:
+        entries = driver.get_log('performance')
+    except Exception:
+        return []
+    messages = []
+    for entry in entries:
+        try:
+            messages.append(json.loads(entry['message'])['message'])
+        except (KeyError, ValueError):
+            continue
+    return messages
+
+class NetworkMeter:
+    """Count requests and bytes transferred from DevTools network events
+
+    The performance log can only be read once, so every message is also
+    handed to the callables in `listeners` (see PayloadCapture).
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.listeners = []
+        self._traffic = {'bytes': 0, 'requests': 0, 'blocked': 0}
+
+    def poll(self):
+        """Read new DevTools messages into the traffic counts and pass them on to listeners"""
+        for message in read_performance_log(self.driver):
+            method = message.get('method')
+            params = message.get('params', {})
+            if method == 'Network.loadingFinished':
+                self._traffic['requests'] += 1
+                self._traffic['bytes'] += int(params.get('encodedDataLength') or 0)
+            elif method == 'Network.loadingFailed' and params.get('blockedReason'):
+                self._traffic['blocked'] += 1
+            for listener in self.listeners:
+                listener(message)
+
+    def drain(self):
+        """Return traffic since the previous drain"""
+        self.poll()
+        traffic = self._traffic
+        self._traffic = {'bytes': 0, 'requests': 0, 'blocked': 0}
+        return traffic
+
+def _dig(value, *path):
+    """value[a][b]...; None where the nested lists are shorter or missing"""
+    for index in path:
+        try:
+            value = value[index]
+        except (IndexError, KeyError, TypeError):
+            return None
+    return value
+
+def _payload_json(text):
+    """Decode a Maps response body into its nested JSON arrays
+
+    Handles the )]}' guard prefix, search XHRs wrapped as {"c":0,"d":"..."}
+    and documents embedding payloads in APP_INITIALIZATION_STATE, whose
+    guarded strings come back as a list of decoded payloads. Raises
+    ValueError for anything else.
+    """
+    text = text.strip()
+    if text.startswith('<'):
+        match = re.search(r"APP_INITIALIZATION_STATE=(.*?);window\.APP_", text, re.DOTALL)
+        if not match:
+            return []
+        payloads = []
+        stack = [json.loads(match.group(1))]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, list):
+                stack.extend(node)
+            elif isinstance(node, str) and node.startswith(")]}'"):
+                payloads.append(json.loads(node[4:]))
+        return payloads
+    if text.startswith('{'):
+        wrapper = json.loads(text[:text.rfind('}') + 1])
+        if not isinstance(wrapper.get('d'), str):
+            raise ValueError("wrapped response has no 'd' payload")
+        text = wrapper['d']
+    if text.startswith(")]}'"):
+        text = text[4:]
+    return json.loads(text)
+
+def _is_place_entry(node):
+    """True for the array Maps uses to describe one place"""
+    return (
+        isinstance(node, list) and len(node) > 11 and isinstance(node[11], str)
+        and isinstance(_dig(node, 9, 2), (int, float)) and isinstance(_dig(node, 9, 3), (int, float))
+    )
+
+def _payload_website(value):
+    """Unwrap a /url?q= redirect into the site it points to"""
+    if not isinstance(value, str) or not value:
+        return ''
+    if value.startswith('/url?'):
+        from urllib.parse import parse_qs, urlparse
+
+        value = parse_qs(urlparse(value).query).get('q', [''])[0]
+    return value
+
+def place_from_entry(entry):
+    """Fields of one place entry from a search or place payload"""
+    from urllib.parse import quote_plus
+
+    name = entry[11].strip()
+    latitude, longitude = entry[9][2], entry[9][3]
+    address = _dig(entry, 39)
+    if not isinstance(address, str):
+        parts = _dig(entry, 2)
+        address = ', '.join(part for part in parts if isinstance(part, str)) if isinstance(parts, list) else ''
+    phone = _dig(entry, 178, 0, 0)
+    feature_id = _dig(entry, 10)
+    place_id = _dig(entry, 78)
+    url = f"{MAPS_URL}/place/{quote_plus(name)}/data=!4m5!3m4"
+    if isinstance(feature_id, str):
+        url += f"!1s{feature_id}"
+    url += f"!8m2!3d{latitude:.7f}!4d{longitude:.7f}"
+    if isinstance(place_id, str):
+        url += f"!19s{place_id}"
+    return {
+        'name': name,
+        'address': address.strip(),
+        'phone': phone if isinstance(phone, str) else '',
+        'website': _payload_website(_dig(entry, 7, 0)),
+        'rating': _dig(entry, 4, 7),
+        'reviews': _dig(entry, 4, 8),
+        'latitude': latitude,
+        'longitude': longitude,
+        'url': url,
+    }
+
+def parse_maps_payload(text):
+    """Places in a captured Maps response body, in the order Maps lists them
+
+    Search results nest each place at [0][1][i][14] and place previews at
+    [6], but the layout shifts between Maps releases, so the decoded arrays
+    are walked for anything shaped like a place entry instead. Raises
+    ValueError if the body cannot be decoded at all.
+    """
+    places = []
+    ids = set()
+    stack = [_payload_json(text)]
+    while stack:
+        node = stack.pop()
+        if _is_place_entry(node):
+            place = place_from_entry(node)
+            if place['url'] not in ids:
+                ids.add(place['url'])
+                places.append(place)
+        elif isinstance(node, list):
+            # Reversed, so popping visits children in document order
+            stack.extend(reversed(node))
+    return places
+
+class PayloadCapture:
+    """Capture Maps search and place responses from DevTools network events
+
+    Registers with a NetworkMeter: responses whose URL matches
+    PAYLOAD_URL_RE are noted as they arrive and, once loaded, their bodies
+    are fetched with Network.getResponseBody. With record_dir each body is
+    also saved there, for parse-payloads to check offline.
+    """
+
+    def __init__(self, driver, meter, record_dir=None):
+        self.driver = driver
+        self.meter = meter
+        self.record_dir = record_dir
+        self.responses = 0
+        self._pending = {}
+        self._loaded = []
+        meter.listeners.append(self.on_message)
+        if record_dir:
+            os.makedirs(record_dir, exist_ok=True)
+
+    def on_message(self, message):
+        params = message.get('params', {})
+        method = message.get('method')
+        if method == 'Network.responseReceived':
+            url = params.get('response', {}).get('url', '')
+            if PAYLOAD_URL_RE.search(url):
+                self._pending[params.get('requestId')] = url
+        elif method == 'Network.loadingFinished' and params.get('requestId') in self._pending:
+            self._loaded.append((params['requestId'], self._pending.pop(params['requestId'])))
+
+    def bodies(self):
+        """(url, body) for each matching response loaded since the last call"""
+        self.meter.poll()
+        loaded, self._loaded = self._loaded, []
+        for request_id, url in loaded:
+            try:
+                response = self.driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+            except Exception as e:
+                # Chrome evicts bodies it no longer buffers
+                logging.debug(f"No body for {url}: {e}")
+                continue
+            body = response.get('body', '')
+            if response.get('base64Encoded'):
+                import base64
+
+                body = base64.b64decode(body).decode('utf-8', 'replace')
+            self.responses += 1
+            if self.record_dir:
+                name = f"payload_{int(time.time() * 1000)}_{self.responses}.txt"
+                with open(os.path.join(self.record_dir, name), 'w', encoding='utf-8') as f:
+                    f.write(body)
+            yield url, body
+
+    def reset(self):
+        """Forget responses seen so far, e.g. those left over from the previous search"""
+        self.meter.poll()
+        self._pending.clear()
+        self._loaded = []
+
+    def places(self):
+        """Places from every response loaded since the last call"""
+        places = []
+        for _, body in self.bodies():
+            places.extend(parse_maps_payload(body))
+        return places
@@ -0,0 +1,200 @@
+"""Post-processing of a result set: cleaning, duplicate flagging and filters"""
+import re
+
+from gmaps.records import RATING_PATTERN, REVIEW_COUNT_PATTERN, extract_place_id
+
+# Post-processing: phones without a country code are taken to be national
+# numbers of this calling code (India unless --country-code says otherwise),
+# and near-duplicates need this name/address similarity
+DEFAULT_COUNTRY_CODE = "91"
+NATIONAL_NUMBER_LENGTH = 10
+E164_PATTERN = r"\+[1-9]\d{7,14}"
+DUPLICATE_SIMILARITY = 0.88
+# Each listing is fuzzy-compared with this many neighbours in its block
+DUPLICATE_WINDOW = 8
+ADDRESS_ABBREVIATIONS = {
+    'rd': 'road', 'st': 'street', 'ave': 'avenue', 'nr': 'near', 'opp': 'opposite',
+    'sec': 'sector', 'blvd': 'boulevard', 'mkt': 'market', 'bldg': 'building', 'flr': 'floor',
+}
+ADDRESS_ABBREVIATION_RE = re.compile(r"\b(?:" + "|".join(ADDRESS_ABBREVIATIONS) + r")\b")
+
+def normalize_records(records, country_code=DEFAULT_COUNTRY_CODE):
+    """Clean a result set into a DataFrame with column-wide string operations
+
+    Rating becomes a float and Reviews an integer, phones are rewritten to
+    E.164 where they can be (others are kept as they were) and addresses
+    get their whitespace and punctuation tidied.
+    """
+    import pandas as pd
+
+    frame = pd.DataFrame([dict(record) for record in records])
+    for column in ('Business Name', 'Address', 'Phone', 'Website', 'Rating', 'Reviews', 'Place URL'):
+        if column not in frame:
+            frame[column] = ''
+        frame[column] = frame[column].fillna('').astype(str)
+
+    frame['Rating'] = pd.to_numeric(
+        frame['Rating'].str.extract(RATING_PATTERN)[0].str.replace(',', '.'), errors='coerce'
+    )
+    frame['Reviews'] = pd.to_numeric(
+        frame['Reviews'].str.extract(REVIEW_COUNT_PATTERN)[0].str.replace(r"\D", "", regex=True), errors='coerce'
+    ).astype('Int64')
+
+    phone = frame['Phone'].str.strip()
+    digits = phone.str.replace(r"\D", "", regex=True)
+    has_plus = phone.str.startswith('+')
+    international = ~has_plus & digits.str.startswith('00')
+    trunk = ~has_plus & ~international & digits.str.startswith('0') & (digits.str.len() == NATIONAL_NUMBER_LENGTH + 1)
+    national = ~has_plus & ~international & (digits.str.len() == NATIONAL_NUMBER_LENGTH)
+    e164 = pd.Series('', index=frame.index)
+    e164 = e164.mask(has_plus, '+' + digits)
+    e164 = e164.mask(international, '+' + digits.str[2:])
+    e164 = e164.mask(trunk, '+' + country_code + digits.str[1:])
+    e164 = e164.mask(national, '+' + country_code + digits)
+    frame['Phone'] = e164.where(e164.str.fullmatch(E164_PATTERN), phone)
+
+    frame['Address'] = (
+        frame['Address']
+        .str.replace(r"^[\s·,]+|[\s·,]+$", "", regex=True)
+        .str.replace(r"\s+", " ", regex=True)
+        .str.replace(r"\s*,[\s,]*", ", ", regex=True)
+    )
+    return frame
+
+def _match_key(series):
+    """Lowercase words without punctuation, with common abbreviations expanded"""
+    words = (
+        series.str.lower()
+        .str.replace(r"[^\w\s]", " ", regex=True)
+        .str.replace(r"\s+", " ", regex=True)
+        .str.strip()
+    )
+    return words.str.replace(ADDRESS_ABBREVIATION_RE, lambda match: ADDRESS_ABBREVIATIONS[match.group(0)], regex=True)
+
+def flag_duplicates(frame, threshold=DUPLICATE_SIMILARITY, window=DUPLICATE_WINDOW):
+    """Add a 'Duplicate Of' column naming the Sr No. each near-duplicate repeats
+
+    The same place key as the result store uses (the place ID, or name and
+    address for listings without a place URL) marks a duplicate outright.
+    A shared phone number only does together with the same address, or the
+    same name when one of the listings has no address, since chain branches
+    often share one call-centre number.
+
+    Names and addresses are only fuzzy-matched inside blocks of rows sharing
+    a name prefix and postcode, and within a block each row is compared with
+    its next `window` rows in sorted order, so the work stays linear in the
+    number of rows instead of comparing every pair. Names with different
+    numbers in them ("Branch 1" / "Branch 2") never match.
+    """
+    from difflib import SequenceMatcher
+
+    count = len(frame)
+    parent = list(range(count))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i, j):
+        i, j = find(i), find(j)
+        if i != j:
+            # The earliest listing stays the original
+            parent[max(i, j)] = min(i, j)
+
+    positions = frame.reset_index(drop=True)
+    name_key = _match_key(positions['Business Name'])
+    address_key = _match_key(positions['Address'])
+    place_id = positions['Place URL'].map(extract_place_id)
+    place_key = place_id.mask(
+        place_id == '', (positions['Business Name'] + "|" + positions['Address']).where(positions['Business Name'] != '', '')
+    )
+    postcode = positions['Address'].str.extract(r"\b(\d{5,6})\b")[0].fillna('')
+
+    phone = positions['Phone'].str.strip()
+    phone_address = (phone + "|" + address_key).where((phone != '') & (address_key != ''), '')
+    for key in (place_key, phone_address):
+        repeated = key[key.duplicated(keep=False) & (key != '')]
+        for rows in repeated.groupby(repeated).indices.values():
+            first = repeated.index[rows[0]]
+            for row in repeated.index[rows[1:]].tolist():
+                union(first, row)
+
+    # Same phone and name: only listings without an address join the first one
+    phone_name = (phone + "|" + name_key).where((phone != '') & (name_key != ''), '')
+    repeated = phone_name[phone_name.duplicated(keep=False) & (phone_name != '')]
+    for rows in repeated.groupby(repeated).indices.values():
+        rows = repeated.index[rows].tolist()
+        for row in rows[1:]:
+            if address_key[row] == '' or address_key[rows[0]] == '':
+                union(rows[0], row)
+
+    match_text = (name_key + " | " + address_key).tolist()
+    name_numbers = name_key.str.replace(r"\D", "", regex=True).tolist()
+    block = name_key.str[:4] + "|" + postcode
+    order = block.to_frame('block').assign(text=match_text).sort_values(['block', 'text']).index.to_numpy()
+    sorted_blocks = block.iloc[order].reset_index(drop=True)
+    for rows in sorted_blocks.groupby(sorted_blocks, sort=False).indices.values():
+        if len(rows) < 2:
+            continue
+        rows = order[rows].tolist()
+        for a_index, a in enumerate(rows):
+            for b in rows[a_index + 1:a_index + 1 + window]:
+                if name_numbers[a] != name_numbers[b] or find(a) == find(b):
+                    continue
+                matcher = SequenceMatcher(None, match_text[a], match_text[b])
+                if matcher.real_quick_ratio() >= threshold and matcher.ratio() >= threshold:
+                    union(a, b)
+
+    serials = positions['Sr No.'].tolist() if 'Sr No.' in positions else list(range(1, count + 1))
+    frame['Duplicate Of'] = [serials[find(i)] if find(i) != i else '' for i in range(count)]
+    return frame
+
+def filter_records(frame, min_rating=None, min_reviews=None, has_website=False, drop_duplicates=False,
+                   sort_by=None, descending=True):
+    """Keep rows passing the filters, optionally sorted by one column"""
+    keep = frame.index == frame.index
+    if min_rating is not None:
+        keep &= (frame['Rating'] >= min_rating).fillna(False).to_numpy(dtype=bool)
+    if min_reviews is not None:
+        keep &= (frame['Reviews'] >= min_reviews).fillna(False).to_numpy(dtype=bool)
+    if has_website:
+        keep &= (frame['Website'].str.strip() != '').to_numpy()
+    if drop_duplicates and 'Duplicate Of' in frame:
+        keep &= (frame['Duplicate Of'] == '').to_numpy()
+    frame = frame[keep]
+    if sort_by:
+        frame = frame.sort_values(sort_by, ascending=not descending, na_position='last', kind='stable')
+    return frame
+
+def frame_to_records(frame):
+    """DataFrame rows back to record dicts, with missing values as ''"""
+    frame = frame.astype(object).where(frame.notna(), '')
+    return frame.to_dict('records')
+
+def parse_country_code(text):
+    """'+44' or '44' -> '44'"""
+    code = str(text).strip().lstrip('+')
+    if not re.fullmatch(r"[1-9]\d{0,2}", code):
+        raise ValueError(f"Not a calling code: {text!r}")
+    return code
+
+def postprocess_records(records, country_code=DEFAULT_COUNTRY_CODE, dedupe=True, **filters):
+    """Normalize, flag duplicates and filter records ready for export
+
+    filters go to filter_records. Returns (records, stats).
+    """
+    if not records:
+        return [], {'rows': 0, 'phones_e164': 0, 'duplicates': 0, 'kept': 0}
+    frame = normalize_records(records, country_code)
+    if dedupe:
+        frame = flag_duplicates(frame)
+    filtered = filter_records(frame, **filters)
+    stats = {
+        'rows': len(frame),
+        'phones_e164': int(frame['Phone'].str.fullmatch(E164_PATTERN).sum()),
+        'duplicates': int((frame['Duplicate Of'] != '').sum()) if dedupe else 0,
+        'kept': len(filtered),
+    }
+    return frame_to_records(filtered), stats
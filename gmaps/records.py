@@ -0,0 +1,163 @@
+"""Extracted businesses: the compact record type, field parsing and place keys"""
+import math
+import re
+import sys
+from collections.abc import MutableMapping
+
+# First number in a rating label ("4.5 stars", "Rated 4,5 étoiles") and
+# first thousands-grouped count in a reviews label ("(1,234)", "1 234 avis")
+RATING_PATTERN = r"(\d+(?:[.,]\d+)?)"
+REVIEW_COUNT_PATTERN = r"(\d{1,3}(?:[,.\u00a0\u202f ]\d{3})+|\d+)"
+
+# Record dict keys and the BusinessRecord slot each one is stored in
+RECORD_KEY_FIELDS = {
+    'Sr No.': 'serial', 'Business Name': 'name', 'Address': 'address', 'Phone': 'phone',
+    'Website': 'website', 'Rating': 'rating', 'Reviews': 'reviews', 'Category': 'category',
+    'Location': 'location', 'Scraped Date': 'scraped_date', 'Place URL': 'place_url',
+    'Plus Code': 'plus_code', 'Hours': 'hours', 'Latitude': 'latitude', 'Longitude': 'longitude',
+}
+# Keys that only exist once detail enrichment or payload extraction has filled them in
+OPTIONAL_RECORD_KEYS = ('Plus Code', 'Hours', 'Latitude', 'Longitude')
+
+def parse_rating(text):
+    """'4.5 stars' -> 4.5; None if there is no rating"""
+    match = re.search(RATING_PATTERN, str(text))
+    if not match:
+        return None
+    rating = float(match.group(1).replace(',', '.'))
+    return rating if math.isfinite(rating) else None
+
+def parse_review_count(text):
+    """'(1,234)' -> 1234; None if there is no count"""
+    match = re.search(REVIEW_COUNT_PATTERN, str(text))
+    return int(re.sub(r"\D", "", match.group(1))) if match else None
+
+class BusinessRecord(MutableMapping):
+    """One extracted business, stored compactly
+
+    Fields live in slots rather than a per-record dict, Rating is a float,
+    Reviews an int and the place ID a field of its own. The keyword,
+    location and date strings that every record of a search repeats are
+    interned, so all records share one copy. Indexing by the old dict keys
+    still works ('Rating' reads as "4.5", 'Reviews' as "(1,234)"), so sinks,
+    the store and the exports accept these and plain dicts alike.
+    """
+
+    __slots__ = tuple(RECORD_KEY_FIELDS.values()) + ('place_id', 'extra')
+
+    def __init__(self, serial=0, name='', address='', phone='', website='', rating=None, reviews=None,
+                 category='', location='', scraped_date='', place_url='', plus_code=None, hours=None,
+                 latitude=None, longitude=None):
+        self.serial = serial
+        self.name = name
+        self.address = address
+        self.phone = phone
+        self.website = website
+        self.rating = rating
+        self.reviews = reviews
+        self.category = sys.intern(category)
+        self.location = sys.intern(location)
+        self.scraped_date = sys.intern(scraped_date)
+        self.place_url = place_url
+        self.place_id = extract_place_id(place_url)
+        self.plus_code = plus_code
+        self.hours = hours
+        self.latitude = latitude
+        self.longitude = longitude
+        self.extra = None
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a record from the dict shape; unknown keys are kept too"""
+        record = cls()
+        for key, value in data.items():
+            record[key] = value
+        return record
+
+    def to_dict(self):
+        """The record in the dict shape the exports were written for"""
+        return dict(self)
+
+    def __getitem__(self, key):
+        field = RECORD_KEY_FIELDS.get(key)
+        if field is None:
+            if self.extra and key in self.extra:
+                return self.extra[key]
+            raise KeyError(key)
+        value = getattr(self, field)
+        if key == 'Rating':
+            return '' if value is None else f"{value:.1f}"
+        if key == 'Reviews':
+            return '' if value is None else f"({value:,})"
+        if value is None:
+            # Optional keys are absent until they are set; other fields read as empty
+            if key in OPTIONAL_RECORD_KEYS:
+                raise KeyError(key)
+            return ''
+        return value
+
+    def __setitem__(self, key, value):
+        field = RECORD_KEY_FIELDS.get(key)
+        if field is None:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+        elif key == 'Rating':
+            self.rating = value if isinstance(value, float) else parse_rating(value)
+        elif key == 'Reviews':
+            self.reviews = value if isinstance(value, int) else parse_review_count(value)
+        elif key in ('Category', 'Location', 'Scraped Date'):
+            setattr(self, field, sys.intern(str(value)))
+        else:
+            setattr(self, field, value)
+            if key == 'Place URL':
+                self.place_id = extract_place_id(value)
+
+    def __delitem__(self, key):
+        if key in OPTIONAL_RECORD_KEYS and getattr(self, RECORD_KEY_FIELDS[key]) is not None:
+            setattr(self, RECORD_KEY_FIELDS[key], None)
+        elif self.extra and key in self.extra:
+            del self.extra[key]
+        else:
+            raise KeyError(key)
+
+    def __iter__(self):
+        for key, field in RECORD_KEY_FIELDS.items():
+            if key not in OPTIONAL_RECORD_KEYS or getattr(self, field) is not None:
+                yield key
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"BusinessRecord({self.serial!r}, {self.name!r}, place_id={self.place_id!r})"
+
+def extract_place_id(url):
+    """Return a stable place ID from a maps/place href
+
+    Prefers the ChIJ place ID, then the 0x...:0x... feature ID, then the
+    place name with coordinates, and finally the URL itself.
+    """
+    if not url:
+        return ''
+    match = re.search(r"!19s(ChIJ[\w-]+)", url)
+    if match:
+        return match.group(1)
+    match = re.search(r"!1s(0x[0-9a-fA-F]+:0x[0-9a-fA-F]+)", url)
+    if match:
+        return match.group(1).lower()
+    name = re.search(r"/maps/place/([^/?]+)", url)
+    coords = re.search(r"!3d(-?[\d.]+)!4d(-?[\d.]+)", url)
+    if name and coords:
+        return f"{name.group(1)}@{coords.group(1)},{coords.group(2)}"
+    return url.split('?')[0]
+
+def business_key(record):
+    """Key iter_businesses deduplicates records by
+
+    The place ID, so a place read from a DOM card and from a network
+    payload (whose place URLs differ) is still recognised as one.
+    """
+    return extract_place_id(record['Place URL']) or (record['Business Name'], record['Address'])
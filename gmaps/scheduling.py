@@ -0,0 +1,144 @@
+"""Query pacing across browser sessions, with backoff when Google blocks"""
+import logging
+import random
+import threading
+import time
+
+# Multi-query pacing: queries/hour for a whole run and for each browser
+# session, with the bursts each may start back to back
+RATE_LIMIT_PER_HOUR = 720
+RATE_LIMIT_BURST = 5
+SESSION_RATE_PER_HOUR = 360
+SESSION_BURST = 2
+# After a block the global rate is halved (never below the floor) and all
+# dispatch pauses for a cooldown doubling with each block in a row; every
+# success adds back this share of the configured rate
+RATE_LIMIT_FLOOR_PER_HOUR = 30
+RATE_RECOVERY_STEP = 0.1
+BLOCK_BACKOFF_SECONDS = 30
+BLOCK_BACKOFF_MAX_SECONDS = 900
+# Times a blocked or failed query is retried on a fresh session
+QUERY_RETRIES = 2
+
+class BlockedError(RuntimeError):
+    """Google answered with a CAPTCHA/"unusual traffic" or consent page instead of Maps"""
+
+    def __init__(self, kind):
+        super().__init__(f"Blocked by Google ({kind} page)")
+        self.kind = kind
+
+class TokenBucket:
+    """Token bucket refilled at rate_per_hour, holding at most `burst` tokens
+
+    Thread-safe. The rate can be changed on the fly, which is how
+    RequestScheduler backs off and recovers.
+    """
+
+    def __init__(self, rate_per_hour, burst=1):
+        self.rate_per_hour = rate_per_hour
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + max(0.0, now - self.updated) * self.rate_per_hour / 3600)
+        self.updated = now
+
+    def wait_time(self, now=None):
+        """Seconds until a token is available; 0 if one is now"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._refill(now)
+            if self.tokens >= 1:
+                return 0.0
+            return (1 - self.tokens) * 3600 / self.rate_per_hour
+
+    def take(self, now=None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._refill(now)
+            self.tokens -= 1
+
+    def set_rate(self, rate_per_hour, now=None):
+        with self._lock:
+            # Tokens earned at the old rate are kept
+            self._refill(time.monotonic() if now is None else now)
+            self.rate_per_hour = rate_per_hour
+
+class RequestScheduler:
+    """Pace queries across browser sessions and back off when Google blocks
+
+    A global bucket caps queries/hour for the whole run and each session
+    has a bucket of its own; acquire() only lets a query start when both
+    have a token. A block halves the global rate and pauses all dispatch for
+    a cooldown that doubles with each block in a row; every success adds
+    back RATE_RECOVERY_STEP of the configured rate.
+    """
+
+    def __init__(self, rate_per_hour=RATE_LIMIT_PER_HOUR, session_rate_per_hour=SESSION_RATE_PER_HOUR,
+                 burst=RATE_LIMIT_BURST, session_burst=SESSION_BURST, max_retries=QUERY_RETRIES):
+        self.max_rate = rate_per_hour
+        self.session_rate = session_rate_per_hour
+        self.session_burst = session_burst
+        self.max_retries = max_retries
+        self.bucket = TokenBucket(rate_per_hour, burst)
+        self.sessions = {}
+        self.paused_until = 0.0
+        self.consecutive_blocks = 0
+        self.stats = {'started': 0, 'blocks': 0, 'captcha': 0, 'consent': 0, 'retries': 0}
+        self._lock = threading.Lock()
+
+    def reset_session(self, session_id):
+        """Give a (fresh) session a full bucket"""
+        with self._lock:
+            self.sessions[session_id] = TokenBucket(self.session_rate, self.session_burst)
+
+    def acquire(self, session_id, now=None):
+        """Start a query on session_id if allowed: 0, else seconds to wait"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            session = self.sessions.get(session_id)
+            if session is None:
+                session = self.sessions[session_id] = TokenBucket(self.session_rate, self.session_burst)
+            wait = max(self.paused_until - now, self.bucket.wait_time(now), session.wait_time(now))
+            if wait > 0:
+                return wait
+            self.bucket.take(now)
+            session.take(now)
+            self.stats['started'] += 1
+            return 0.0
+
+    def record_success(self):
+        with self._lock:
+            self.consecutive_blocks = 0
+            rate = min(self.max_rate, self.bucket.rate_per_hour + self.max_rate * RATE_RECOVERY_STEP)
+            self.bucket.set_rate(rate)
+
+    def record_block(self, kind, now=None):
+        """Slow down after a block; returns the cooldown in seconds"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self.consecutive_blocks += 1
+            self.stats['blocks'] += 1
+            self.stats[kind] = self.stats.get(kind, 0) + 1
+            self.bucket.set_rate(max(RATE_LIMIT_FLOOR_PER_HOUR, self.bucket.rate_per_hour / 2), now)
+            # Jittered so parallel runs do not come back in lockstep
+            cooldown = min(BLOCK_BACKOFF_MAX_SECONDS, BLOCK_BACKOFF_SECONDS * 2 ** (self.consecutive_blocks - 1))
+            cooldown *= random.uniform(0.75, 1.25)
+            self.paused_until = max(self.paused_until, now + cooldown)
+        logging.warning(
+            f"Blocked ({kind}); pausing {cooldown:.0f}s, rate now {self.bucket.rate_per_hour:.0f} queries/hour"
+        )
+        return cooldown
+
+    def should_retry(self, attempts):
+        """Whether a query that failed `attempts` times gets another try"""
+        if attempts > self.max_retries:
+            return False
+        with self._lock:
+            self.stats['retries'] += 1
+        return True
+
+    def summary(self):
+        return dict(self.stats, rate_per_hour=round(self.bucket.rate_per_hour, 1))
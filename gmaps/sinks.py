@@ -0,0 +1,342 @@
+"""Result sinks: where extracted records go, and the streaming export formats"""
+import csv
+import gzip
+import json
+import os
+import re
+from datetime import datetime
+
+from gmaps.records import parse_rating, parse_review_count
+
+# Excel column widths by header; unknown columns get the default
+EXCEL_COLUMN_WIDTHS = {
+    'Sr No.': 8, 'Business Name': 35, 'Address': 50, 'Phone': 18, 'Website': 35,
+    'Rating': 8, 'Reviews': 10, 'Category': 18, 'Location': 18, 'Scraped Date': 14,
+    'Place URL': 60, 'Plus Code': 18, 'Hours': 45,
+}
+EXCEL_DEFAULT_WIDTH = 15
+EXCEL_HEADER_COLOR = "4F81BD"
+
+# File formats the save buttons, batch mode and export command can write,
+# with their default extension and file dialog label
+EXPORT_FORMATS = {
+    'excel': ('.xlsx', "Excel files"),
+    'pdf': ('.pdf', "PDF files"),
+    'jsonl': ('.jsonl', "JSON Lines files"),
+    'csv': ('.csv', "CSV files"),
+    'parquet': ('', "Parquet dataset folder"),
+}
+EXPORT_BATCH_SIZE = 5000
+
+# Typed columns for Parquet; every other column is written as a string
+RECORD_COLUMN_TYPES = {
+    'Sr No.': 'int64', 'Rating': 'float64', 'Reviews': 'int64', 'Latitude': 'float64', 'Longitude': 'float64',
+}
+# Hive-style partition directories for Parquet datasets, from these record fields
+PARQUET_PARTITIONS = [('keyword', 'Category'), ('location', 'Location'), ('scrape_date', 'Scraped Date')]
+
+class ResultSink:
+    """Receives business records as soon as they are extracted"""
+
+    def write(self, record):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+class ListSink(ResultSink):
+    """Collect records into a list (the extractor's results by default)"""
+
+    def __init__(self, records=None):
+        self.records = [] if records is None else records
+
+    def write(self, record):
+        self.records.append(record)
+
+class CallbackSink(ResultSink):
+    """Call a function with every record, e.g. to update the GUI"""
+
+    def __init__(self, callback):
+        self.callback = callback
+
+    def write(self, record):
+        self.callback(record)
+
+def _open_text(path, mode, compression=None):
+    """Open a text file for writing, gzip-compressed if asked"""
+    if compression == 'gzip':
+        return gzip.open(path, mode + 't', encoding='utf-8', newline='')
+    if compression:
+        raise ValueError(f"Unsupported compression for text formats: {compression}")
+    return open(path, mode, encoding='utf-8', newline='')
+
+class JsonlSink(ResultSink):
+    """Append records to a JSON Lines file
+
+    By default every record is flushed as its own line; a larger batch_size
+    buffers that many lines per write, which is much cheaper for exports.
+    """
+
+    def __init__(self, path, batch_size=1, compression=None, append=True):
+        self.file = _open_text(path, 'a' if append else 'w', compression)
+        self.batch_size = max(1, batch_size)
+        self.buffer = []
+
+    def write(self, record):
+        self.buffer.append(json.dumps(dict(record), ensure_ascii=False))
+        if len(self.buffer) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        if self.buffer:
+            self.file.write("\n".join(self.buffer) + "\n")
+            self.file.flush()
+            self.buffer = []
+
+    def close(self):
+        self._flush()
+        self.file.close()
+
+class CsvSink(ResultSink):
+    """Write records to a CSV file, batch_size rows per write
+
+    Columns come from the first record unless given. A header is written
+    unless rows are being appended to a non-empty file.
+    """
+
+    def __init__(self, path, columns=None, batch_size=EXPORT_BATCH_SIZE, compression=None, append=False):
+        write_header = not (append and os.path.exists(path) and os.path.getsize(path) > 0)
+        self.file = _open_text(path, 'a' if append else 'w', compression)
+        self.columns = list(columns) if columns else None
+        self.batch_size = max(1, batch_size)
+        self.buffer = []
+        self.writer = None
+        self._write_header = write_header
+
+    def write(self, record):
+        if self.writer is None:
+            self.columns = self.columns or list(record.keys())
+            self.writer = csv.DictWriter(self.file, fieldnames=self.columns, extrasaction='ignore')
+            if self._write_header:
+                self.writer.writeheader()
+        self.buffer.append(record)
+        if len(self.buffer) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        if self.buffer:
+            self.writer.writerows(self.buffer)
+            self.buffer = []
+
+    def close(self):
+        self._flush()
+        self.file.close()
+
+def _typed_value(column, value):
+    """Convert a record value to the Arrow type of its column"""
+    kind = RECORD_COLUMN_TYPES.get(column, 'string')
+    if value is None or value == '':
+        return None
+    if column == 'Rating':
+        return parse_rating(value)
+    if column == 'Reviews':
+        return parse_review_count(value)
+    if kind == 'int64':
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+    if kind == 'float64':
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+    return str(value)
+
+class ParquetSink(ResultSink):
+    """Write records into a Parquet dataset partitioned by keyword/location/date
+
+    Records are buffered and written batch_size at a time as typed Arrow
+    tables under root/keyword=.../location=.../scrape_date=.../, so
+    downstream readers can skip whole directories. Every batch adds new
+    files, so repeated exports into one root accumulate. Needs pyarrow.
+    """
+
+    def __init__(self, root, columns=None, batch_size=EXPORT_BATCH_SIZE, compression='snappy'):
+        try:
+            import pyarrow
+        except ImportError:
+            raise RuntimeError("Parquet export needs pyarrow: pip install pyarrow")
+
+        self.root = root
+        self.columns = list(columns) if columns else None
+        self.batch_size = max(1, batch_size)
+        self.compression = compression
+        self.buffer = []
+        self.rows = 0
+        self.batches = 0
+        self.schema = None
+        # Unique file names so a later export never overwrites this one's files
+        self.file_prefix = f"part-{datetime.now().strftime('%Y%m%d%H%M%S')}-{os.getpid()}"
+
+    def _build_schema(self):
+        import pyarrow as pa
+
+        fields = [
+            pa.field(column, getattr(pa, RECORD_COLUMN_TYPES.get(column, 'string'))())
+            for column in self.columns
+        ]
+        fields += [pa.field(name, pa.string()) for name, _ in PARQUET_PARTITIONS]
+        return pa.schema(fields)
+
+    def write(self, record):
+        if self.columns is None:
+            self.columns = list(record.keys())
+        self.buffer.append(record)
+        if len(self.buffer) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if not self.buffer:
+            return
+        if self.schema is None:
+            self.schema = self._build_schema()
+        data = {column: [_typed_value(column, record.get(column)) for record in self.buffer]
+                for column in self.columns}
+        for name, source in PARQUET_PARTITIONS:
+            data[name] = [str(record.get(source) or 'unknown') for record in self.buffer]
+        table = pa.Table.from_pydict(data, schema=self.schema)
+        pq.write_to_dataset(
+            table, self.root, partition_cols=[name for name, _ in PARQUET_PARTITIONS],
+            compression=self.compression,
+            basename_template=f"{self.file_prefix}-{self.batches}-{{i}}.parquet",
+        )
+        self.rows += len(self.buffer)
+        self.batches += 1
+        self.buffer = []
+
+    def close(self):
+        self._flush()
+
+def excel_sheet_name(keyword, location):
+    """Worksheet name for a keyword/location pair, within Excel's rules"""
+    name = re.sub(r"[\[\]:*?/\\]", " ", f"{keyword} - {location}").strip() or "Results"
+    return name[:31]
+
+class ExcelStreamWriter(ResultSink):
+    """Stream records into an .xlsx file with openpyxl's write-only mode
+
+    Rows are written as they arrive, so neither the records nor a DataFrame
+    copy has to be held in memory. With append=True the sheets of an existing
+    workbook are streamed across first, and rows for a sheet that already
+    exists go after its current rows. The workbook is written to a temporary
+    file and moved into place on close.
+    """
+
+    def __init__(self, path, sheet_name="Results", columns=None, append=False):
+        from openpyxl import Workbook, load_workbook
+
+        self.path = path
+        self.columns = list(columns) if columns else None
+        self.rows = 0
+        self.workbook = Workbook(write_only=True)
+        self.sheet = None
+        self._sheets_with_header = set()
+
+        if append and os.path.exists(path):
+            source = load_workbook(path, read_only=True)
+            try:
+                for existing in source.worksheets:
+                    rows = existing.iter_rows(values_only=True)
+                    header = next(rows, None)
+                    target = self._new_sheet(existing.title, list(header) if header else None)
+                    for row in rows:
+                        target.append(list(row))
+                    if existing.title == sheet_name:
+                        self.sheet = target
+                        if header:
+                            self.columns = list(header)
+            finally:
+                source.close()
+
+        if self.sheet is None:
+            self.sheet = self._new_sheet(sheet_name, self.columns)
+
+    def _new_sheet(self, title, columns):
+        """Create a sheet with widths and a styled header, if columns are known"""
+        sheet = self.workbook.create_sheet(title)
+        sheet.freeze_panes = "A2"
+        if columns:
+            self._write_header(sheet, columns)
+        return sheet
+
+    def _write_header(self, sheet, columns):
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Alignment, Font, PatternFill
+        from openpyxl.utils import get_column_letter
+
+        # Widths must be set before the first row is streamed
+        for index, column in enumerate(columns, 1):
+            width = EXCEL_COLUMN_WIDTHS.get(column, EXCEL_DEFAULT_WIDTH)
+            sheet.column_dimensions[get_column_letter(index)].width = width
+
+        font = Font(bold=True, color="FFFFFF")
+        fill = PatternFill("solid", fgColor=EXCEL_HEADER_COLOR)
+        alignment = Alignment(horizontal="center", vertical="center")
+        cells = []
+        for column in columns:
+            cell = WriteOnlyCell(sheet, value=column)
+            cell.font = font
+            cell.fill = fill
+            cell.alignment = alignment
+            cells.append(cell)
+        sheet.append(cells)
+        self._sheets_with_header.add(sheet.title)
+
+    def write(self, record):
+        if self.columns is None:
+            self.columns = list(record.keys())
+        if self.sheet.title not in self._sheets_with_header:
+            self._write_header(self.sheet, self.columns)
+        self.sheet.append([record.get(column, '') for column in self.columns])
+        self.rows += 1
+
+    def close(self):
+        temp_path = self.path + ".tmp"
+        self.workbook.save(temp_path)
+        os.replace(temp_path, self.path)
+
+def export_format_for(path):
+    """Guess the export format from a path, defaulting to Excel"""
+    name = path.lower()
+    if name.endswith('.gz'):
+        name = name[:-3]
+    if name.endswith('.pdf'):
+        return 'pdf'
+    if name.endswith(('.jsonl', '.ndjson')):
+        return 'jsonl'
+    if name.endswith('.csv'):
+        return 'csv'
+    if name.endswith('.parquet') or os.path.isdir(path):
+        return 'parquet'
+    return 'excel'
+
+def create_exporter(file_format, path, sheet_name="Results", append=False, compression=None,
+                    batch_size=EXPORT_BATCH_SIZE):
+    """Open a streaming sink for one of EXPORT_FORMATS
+
+    PDF needs every record up front and is written by save_to_pdf instead.
+    compression is 'gzip' for JSONL/CSV, or a Parquet codec such as 'zstd'.
+    """
+    if file_format == 'excel':
+        return ExcelStreamWriter(path, sheet_name, append=append)
+    if file_format == 'jsonl':
+        return JsonlSink(path, batch_size=batch_size, compression=compression, append=append)
+    if file_format == 'csv':
+        return CsvSink(path, batch_size=batch_size, compression=compression, append=append)
+    if file_format == 'parquet':
+        return ParquetSink(path, batch_size=batch_size, compression=compression or 'snappy')
+    raise ValueError(f"Unknown export format: {file_format}")
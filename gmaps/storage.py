@@ -0,0 +1,492 @@
+"""SQLite result store and query cache, and the per-query checkpoint journal"""
+import gzip
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from gmaps.records import BusinessRecord, extract_place_id
+from gmaps.sinks import ResultSink
+
+RESULTS_DIR = "extracted_results"
+DEFAULT_STORE_PATH = os.path.join(RESULTS_DIR, "results.db")
+# Finished queries are cached this long, in at most this much disk space
+QUERY_CACHE_PATH = os.path.join(RESULTS_DIR, "query_cache.db")
+QUERY_CACHE_TTL = 6 * 3600
+QUERY_CACHE_MAX_MB = 64
+# A checkpoint is written after this many new records or seconds, whichever comes first
+CHECKPOINT_EVERY = 25
+CHECKPOINT_SECONDS = 10
+
+class ResultStore:
+    """SQLite store of every business seen, keyed by Maps place ID
+
+    Records are upserted with first-seen/last-seen timestamps so repeated runs
+    only add what is new, and each run is logged so exports can ask for
+    "new since last run".
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS places (
+        place_id TEXT PRIMARY KEY,
+        name TEXT NOT NULL,
+        address TEXT,
+        phone TEXT,
+        website TEXT,
+        rating TEXT,
+        reviews TEXT,
+        keyword TEXT,
+        location TEXT,
+        place_url TEXT,
+        scrape_date TEXT,
+        first_seen TEXT NOT NULL,
+        last_seen TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_places_keyword ON places (keyword);
+    CREATE INDEX IF NOT EXISTS idx_places_location ON places (location);
+    CREATE INDEX IF NOT EXISTS idx_places_scrape_date ON places (scrape_date);
+    CREATE INDEX IF NOT EXISTS idx_places_first_seen ON places (first_seen);
+    CREATE TABLE IF NOT EXISTS runs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        keyword TEXT,
+        location TEXT,
+        started_at TEXT NOT NULL,
+        finished_at TEXT,
+        businesses INTEGER DEFAULT 0
+    );
+    CREATE INDEX IF NOT EXISTS idx_runs_query ON runs (keyword, location, started_at);
+    """
+
+    # Columns added after the first release; applied to older databases
+    MIGRATIONS = [
+        "ALTER TABLE places ADD COLUMN details_at TEXT",
+    ]
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Shared between the GUI worker thread and the main thread, and with
+        # other batch processes, so writes are serialized and WAL is enabled
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.lock = threading.Lock()
+        with self.lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript(self.SCHEMA)
+            for statement in self.MIGRATIONS:
+                try:
+                    self.conn.execute(statement)
+                except sqlite3.OperationalError:
+                    pass  # already applied
+
+    @staticmethod
+    def _now():
+        return datetime.now().isoformat(timespec='seconds')
+
+    def upsert(self, record, details=False):
+        """Insert or refresh one business_data record; returns its place ID
+
+        details=True records that the place's detail page was just read.
+        """
+        place_id = extract_place_id(record.get('Place URL', ''))
+        if not place_id:
+            place_id = f"{record.get('Business Name', '')}|{record.get('Address', '')}"
+        now = self._now()
+        with self.lock, self.conn:
+            self.conn.execute("""
+                INSERT INTO places (place_id, name, address, phone, website, rating, reviews,
+                                    keyword, location, place_url, scrape_date, first_seen, last_seen,
+                                    details_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(place_id) DO UPDATE SET
+                    name = excluded.name,
+                    address = COALESCE(NULLIF(excluded.address, ''), places.address),
+                    phone = COALESCE(NULLIF(excluded.phone, ''), places.phone),
+                    website = COALESCE(NULLIF(excluded.website, ''), places.website),
+                    rating = COALESCE(NULLIF(excluded.rating, ''), places.rating),
+                    reviews = COALESCE(NULLIF(excluded.reviews, ''), places.reviews),
+                    keyword = excluded.keyword,
+                    location = excluded.location,
+                    place_url = excluded.place_url,
+                    scrape_date = excluded.scrape_date,
+                    last_seen = excluded.last_seen,
+                    details_at = COALESCE(excluded.details_at, places.details_at)
+            """, (
+                place_id, record.get('Business Name', ''), record.get('Address', ''),
+                record.get('Phone', ''), record.get('Website', ''), str(record.get('Rating', '')),
+                str(record.get('Reviews', '')), record.get('Category', ''), record.get('Location', ''),
+                record.get('Place URL', ''), record.get('Scraped Date', ''), now, now,
+                now if details else None
+            ))
+        return place_id
+
+    def get(self, place_id):
+        """Return the stored row for place_id, or None"""
+        with self.lock:
+            return self.conn.execute(
+                "SELECT * FROM places WHERE place_id = ?", (place_id,)
+            ).fetchone()
+
+    def is_fresh(self, place_id, ttl_seconds):
+        """True if place_id's details were refreshed within the last ttl_seconds"""
+        row = self.get(place_id)
+        if row is None or not row['details_at']:
+            return False
+        age = datetime.now() - datetime.fromisoformat(row['details_at'])
+        return age.total_seconds() < ttl_seconds
+
+    def begin_run(self, keyword, location):
+        """Record the start of a run; returns the run ID"""
+        with self.lock, self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (keyword, location, started_at) VALUES (?, ?, ?)",
+                (keyword, location, self._now())
+            )
+            return cursor.lastrowid
+
+    def finish_run(self, run_id, businesses):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "UPDATE runs SET finished_at = ?, businesses = ? WHERE id = ?",
+                (self._now(), businesses, run_id)
+            )
+
+    def last_run_started(self, keyword=None, location=None):
+        """Start time of the most recent finished run for the query, or None"""
+        sql = "SELECT started_at FROM runs WHERE finished_at IS NOT NULL"
+        params = []
+        if keyword is not None:
+            sql += " AND keyword = ?"
+            params.append(keyword)
+        if location is not None:
+            sql += " AND location = ?"
+            params.append(location)
+        sql += " ORDER BY started_at DESC LIMIT 1"
+        with self.lock:
+            row = self.conn.execute(sql, params).fetchone()
+        return row['started_at'] if row else None
+
+    def iter_records(self, keyword=None, location=None, since=None, scrape_date=None):
+        """Yield stored places as business_data dicts, oldest first
+
+        since limits the result to places first seen at or after that
+        timestamp, which is how "new since last run" exports are built.
+        """
+        sql = "SELECT * FROM places WHERE 1 = 1"
+        params = []
+        for column, value in (('keyword', keyword), ('location', location), ('scrape_date', scrape_date)):
+            if value is not None:
+                sql += f" AND {column} = ?"
+                params.append(value)
+        if since is not None:
+            sql += " AND first_seen >= ?"
+            params.append(since)
+        sql += " ORDER BY first_seen, place_id"
+
+        with self.lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        for serial, row in enumerate(rows, 1):
+            yield {
+                'Sr No.': serial,
+                'Business Name': row['name'],
+                'Address': row['address'] or '',
+                'Phone': row['phone'] or '',
+                'Website': row['website'] or '',
+                'Rating': row['rating'] or '',
+                'Reviews': row['reviews'] or '',
+                'Category': row['keyword'] or '',
+                'Location': row['location'] or '',
+                'Scraped Date': row['scrape_date'] or '',
+                'Place URL': row['place_url'] or ''
+            }
+
+    def new_since_last_run(self, keyword=None, location=None):
+        """Places first seen during the latest finished run of the query
+
+        That is, everything that run found which no earlier run had.
+        """
+        since = self.last_run_started(keyword, location)
+        return list(self.iter_records(keyword, location, since=since))
+
+    def close(self):
+        self.conn.close()
+
+def normalize_query(text):
+    """'  Gyms   in DELHI ' -> 'gyms in delhi'"""
+    return " ".join(str(text).casefold().split())
+
+def query_variant(tiled=False, extraction_mode='dom', enriched=False):
+    """How a query was run, as part of its cache key: 'single:dom:plain' etc."""
+    return f"{'tiled' if tiled else 'single'}:{extraction_mode}:{'enriched' if enriched else 'plain'}"
+
+class QueryCache:
+    """SQLite cache of finished queries' records, to skip repeat browser runs
+
+    Entries are keyed by the normalized keyword and location, the
+    query_variant they were run with and max_results, and serve requests
+    for at most that many results. A single feed stops near
+    FEED_RESULT_CAP, so its entries never stand in for a tiled run, nor
+    unenriched ones for a request wanting phones and websites. Entries
+    expire after `ttl` seconds, and once the stored records exceed
+    max_bytes the least recently used entries are evicted.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS queries (
+        keyword TEXT NOT NULL,
+        location TEXT NOT NULL,
+        variant TEXT NOT NULL,
+        max_results INTEGER NOT NULL,
+        count INTEGER NOT NULL,
+        records BLOB NOT NULL,
+        size INTEGER NOT NULL,
+        created REAL NOT NULL,
+        last_used REAL NOT NULL,
+        PRIMARY KEY (keyword, location, variant, max_results)
+    );
+    CREATE INDEX IF NOT EXISTS idx_queries_last_used ON queries (last_used);
+    """
+
+    def __init__(self, path=QUERY_CACHE_PATH, ttl=QUERY_CACHE_TTL, max_bytes=QUERY_CACHE_MAX_MB * 1024 * 1024):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = {'hits': 0, 'misses': 0, 'stored': 0, 'evicted': 0}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.lock = threading.Lock()
+        with self.lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            columns = [row['name'] for row in self.conn.execute("PRAGMA table_info(queries)")]
+            if columns and 'variant' not in columns:
+                # Entries cached before variants were recorded cannot be told apart
+                self.conn.execute("DROP TABLE queries")
+            self.conn.executescript(self.SCHEMA)
+
+    def get(self, keyword, location, max_results, variant=None):
+        """(records, age in seconds) for a fresh entry covering the request, or None
+
+        variant defaults to query_variant(). The records are new
+        BusinessRecords, cut down to max_results.
+        """
+        now = time.time()
+        with self.lock, self.conn:
+            row = self.conn.execute("""
+                SELECT rowid, records, created FROM queries
+                WHERE keyword = ? AND location = ? AND variant = ? AND created >= ? AND max_results >= ?
+                ORDER BY created DESC LIMIT 1
+            """, (normalize_query(keyword), normalize_query(location), variant or query_variant(),
+                  now - self.ttl, max_results)).fetchone()
+            if row is None:
+                self.stats['misses'] += 1
+                return None
+            self.conn.execute("UPDATE queries SET last_used = ? WHERE rowid = ?", (now, row['rowid']))
+        self.stats['hits'] += 1
+        records = json.loads(gzip.decompress(row['records']).decode('utf-8'))[:max_results]
+        return [BusinessRecord.from_dict(record) for record in records], now - row['created']
+
+    def put(self, keyword, location, max_results, records, variant=None):
+        """Cache a finished query's records; returns False if there were none
+
+        An empty run is more likely a broken page than a place with no
+        listings, and as a short run it would answer every request size, so
+        it is not cached. Older entries for the query that this one covers
+        are replaced, and expired or least recently used entries are evicted.
+        """
+        if not records:
+            return False
+        blob = gzip.compress(json.dumps([dict(record) for record in records], ensure_ascii=False).encode('utf-8'))
+        keyword, location = normalize_query(keyword), normalize_query(location)
+        variant = variant or query_variant()
+        now = time.time()
+        with self.lock, self.conn:
+            self.conn.execute(
+                "DELETE FROM queries WHERE keyword = ? AND location = ? AND variant = ? AND max_results <= ?",
+                (keyword, location, variant, max_results)
+            )
+            self.conn.execute(
+                "INSERT INTO queries (keyword, location, variant, max_results, count, records, size, created, "
+                "last_used) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (keyword, location, variant, max_results, len(records), blob, len(blob), now, now)
+            )
+            self.stats['stored'] += 1
+            self._evict(now)
+        return True
+
+    def _evict(self, now):
+        self.stats['evicted'] += self.conn.execute(
+            "DELETE FROM queries WHERE created < ?", (now - self.ttl,)
+        ).rowcount
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM queries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for row in self.conn.execute("SELECT rowid, size FROM queries ORDER BY last_used").fetchall():
+            self.conn.execute("DELETE FROM queries WHERE rowid = ?", (row['rowid'],))
+            self.stats['evicted'] += 1
+            total -= row['size']
+            if total <= self.max_bytes:
+                break
+
+    def invalidate(self, keyword, location):
+        """Drop every cached entry for the query"""
+        with self.lock, self.conn:
+            self.conn.execute(
+                "DELETE FROM queries WHERE keyword = ? AND location = ?",
+                (normalize_query(keyword), normalize_query(location))
+            )
+
+    def summary(self):
+        """Hit/miss counts of this session plus the cache's size on disk"""
+        with self.lock:
+            entries, size = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM queries").fetchone()
+        lookups = self.stats['hits'] + self.stats['misses']
+        return dict(
+            self.stats, entries=entries, megabytes=round(size / 1024 / 1024, 2),
+            hit_rate=round(self.stats['hits'] / lookups, 3) if lookups else 0.0
+        )
+
+    def close(self):
+        self.conn.close()
+
+class StoreSink(ResultSink):
+    """Upsert every record into a ResultStore as it is extracted
+
+    Phone/website already known from an earlier run are merged into the
+    record so exports keep them.
+    """
+
+    def __init__(self, store):
+        self.store = store
+
+    def write(self, record):
+        place_id = self.store.upsert(record)
+        row = self.store.get(place_id)
+        if row is not None:
+            record['Phone'] = record.get('Phone') or row['phone'] or ''
+            record['Website'] = record.get('Website') or row['website'] or ''
+
+class CheckpointJournal:
+    """Append-only journal of one query's records and feed position
+
+    One JSON line per entry: a 'start' line naming the query, 'records'
+    lines with each batch of new records, their place IDs and how many
+    results the feed had loaded, and a 'done' line once the query finished.
+    Every entry is flushed and fsynced, and a torn last line from a crash is
+    ignored on load. With resume=True an unfinished journal for the same
+    query is picked up: state holds its records and feed depth, and new
+    entries are appended after them. Otherwise the journal starts over.
+    """
+
+    def __init__(self, path, keyword, location, max_results, resume=True):
+        self.path = path
+        self.query = {'keyword': keyword, 'location': location, 'max_results': max_results}
+        self.state = {'records': [], 'depth': 0}
+        intact = 0
+        if resume and os.path.exists(path):
+            self.state, intact = self._load()
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        if self.state['records']:
+            self.file = open(path, 'a', encoding='utf-8')
+            # Cut a torn last line off, so new entries start on a line of their own
+            self.file.truncate(intact)
+            logging.info(f"Resuming from checkpoint: {len(self.state['records'])} records, feed depth {self.state['depth']}")
+        else:
+            self.file = open(path, 'w', encoding='utf-8')
+            self._append({'type': 'start', 'query': self.query, 'at': datetime.now().isoformat(timespec='seconds')})
+
+    @classmethod
+    def for_query(cls, directory, keyword, location, max_results, resume=True):
+        """Journal under directory, named after the keyword and location"""
+        name = re.sub(r"[^\w-]+", "_", f"{keyword}_{location}".lower()).strip('_') or "query"
+        return cls(os.path.join(directory, f"{name}.jsonl"), keyword, location, max_results, resume)
+
+    @property
+    def resumed_count(self):
+        return len(self.state['records'])
+
+    def _load(self):
+        """Records and depth of an unfinished journal for this query, and where its intact lines end"""
+        state = {'records': [], 'depth': 0}
+        intact = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("unterminated line")
+                    entry = json.loads(line)
+                except ValueError:
+                    # The process died mid-write; everything before this line is intact
+                    break
+                if entry['type'] == 'start':
+                    if entry['query'] != self.query:
+                        logging.info(f"Checkpoint {self.path} is for {entry['query']}; starting over")
+                        return {'records': [], 'depth': 0}, 0
+                elif entry['type'] == 'records':
+                    state['records'].extend(BusinessRecord.from_dict(record) for record in entry['records'])
+                    state['depth'] = max(state['depth'], entry['depth'])
+                elif entry['type'] == 'done':
+                    return {'records': [], 'depth': 0}, 0
+                intact += len(line)
+        return state, intact
+
+    def _append(self, entry):
+        self.file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def checkpoint(self, records, depth):
+        """Journal a batch of new records and the feed depth they came from"""
+        self._append({
+            'type': 'records',
+            'depth': depth,
+            'place_ids': [extract_place_id(record.get('Place URL', '')) for record in records],
+            'records': [dict(record) for record in records],
+        })
+
+    def finish(self, count):
+        """Mark the query complete, so the next run starts fresh"""
+        self._append({'type': 'done', 'count': count, 'at': datetime.now().isoformat(timespec='seconds')})
+        self.close()
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+class JournalSink(ResultSink):
+    """Checkpoint records into a CheckpointJournal every few records or seconds
+
+    depth() returns how many results the feed has loaded; it is journaled
+    with each batch so a resumed run can scroll straight back there.
+    """
+
+    def __init__(self, journal, depth, every=CHECKPOINT_EVERY, interval=CHECKPOINT_SECONDS):
+        self.journal = journal
+        self.depth = depth
+        self.every = every
+        self.interval = interval
+        self.pending = []
+        self.last_checkpoint = time.monotonic()
+
+    def write(self, record):
+        self.pending.append(record)
+        if len(self.pending) >= self.every or time.monotonic() - self.last_checkpoint >= self.interval:
+            self._checkpoint()
+
+    def _checkpoint(self):
+        if self.pending:
+            self.journal.checkpoint(self.pending, self.depth())
+            self.pending = []
+        self.last_checkpoint = time.monotonic()
+
+    def close(self):
+        self._checkpoint()
@@ -1,661 +1,4218 @@
-import pandas as pd
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
-import time
-import re
-import os
-import sys
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib import colors
-import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
-import threading
-from datetime import datetime
-import logging
-
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-
-def resource_path(relative_path):
-    try:
-        base_path = sys._MEIPASS
-    except Exception:
-        base_path = os.path.abspath(".")
-    return os.path.join(base_path, relative_path)
-
-class GoogleMapsExtractor:
-    def __init__(self):
-        self.driver = None
-        self.results = []
-        self.current_keyword = ""
-        self.current_location = ""
-        self.total_businesses_scraped = 0
-        
-    def setup_driver(self):
-        """Initialize Chrome driver with webdriver-manager (NO MANUAL DOWNLOAD)"""
-        try:
-            options = webdriver.ChromeOptions()
-            options.add_argument("--start-maximized")
-            options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            options.add_experimental_option('useAutomationExtension', False)
-            
-            # Webdriver-manager automatic download
-            service = ChromeService(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=options)
-            
-            self.driver.implicitly_wait(10)
-            logging.info("Chrome driver initialized with webdriver-manager")
-            return True
-        except Exception as e:
-            logging.error(f"Failed to initialize driver: {e}")
-            return False
-
-    def open_google_maps(self):
-        """Open Google Maps in the browser"""
-        try:
-            self.driver.get("https://www.google.com/maps")
-            logging.info("Opened Google Maps")
-            time.sleep(3)
-            return True
-        except Exception as e:
-            logging.error(f"Failed to open Google Maps: {e}")
-            return False
-
-    def search_businesses(self, keyword, location):
-        """Search for businesses on Google Maps"""
-        try:
-            self.current_keyword = keyword
-            self.current_location = location
-            
-            # Find search box
-            search_box = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.ID, "searchboxinput"))
-            )
-            search_box.clear()
-            
-            # Enter search query
-            search_query = f"{keyword} in {location}"
-            search_box.send_keys(search_query)
-            search_box.send_keys(Keys.RETURN)
-            
-            logging.info(f"Searching for: {search_query}")
-            time.sleep(5)
-            return True
-            
-        except Exception as e:
-            logging.error(f"Search failed: {e}")
-            return False
-
-    def scroll_and_load(self, max_results=100):
-        """Scroll through results to load more businesses"""
-        try:
-            results_pane = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, "//div[@role='feed']"))
-            )
-            
-            last_height = self.driver.execute_script(
-                "return arguments[0].scrollHeight", results_pane
-            )
-            
-            loaded_results = 0
-            scroll_attempts = 0
-            max_scroll_attempts = 20
-            
-            while loaded_results < max_results and scroll_attempts < max_scroll_attempts:
-                # Scroll down
-                self.driver.execute_script(
-                    "arguments[0].scrollTop = arguments[0].scrollHeight", results_pane
-                )
-                time.sleep(2)
-                
-                # Check for new results
-                new_height = self.driver.execute_script(
-                    "return arguments[0].scrollHeight", results_pane
-                )
-                
-                if new_height == last_height:
-                    scroll_attempts += 1
-                    if scroll_attempts >= 3:
-                        break
-                else:
-                    scroll_attempts = 0
-                
-                last_height = new_height
-                
-                # Count loaded results
-                current_results = self.driver.find_elements(
-                    By.XPATH, "//a[contains(@href, 'maps/place')]"
-                )
-                loaded_results = len(current_results)
-                
-                logging.info(f"Loaded {loaded_results} results so far...")
-                
-                # Check for "Show more" button
-                try:
-                    show_more = self.driver.find_element(
-                        By.XPATH, "//button[contains(., 'Show more results') or contains(., 'More results')]"
-                    )
-                    show_more.click()
-                    time.sleep(2)
-                except:
-                    pass
-            
-            return True
-            
-        except Exception as e:
-            logging.error(f"Scrolling failed: {e}")
-            return False
-
-    def extract_business_data(self):
-        """Extract data from each business listing"""
-        try:
-            # Wait for results to load
-            time.sleep(3)
-            
-            # Find all business cards
-            business_cards = self.driver.find_elements(
-                By.XPATH, "//div[contains(@role, 'article') or contains(@class, 'section-result')]"
-            )
-            
-            if not business_cards:
-                business_cards = self.driver.find_elements(
-                    By.XPATH, "//a[contains(@href, 'maps/place')]/../.."
-                )
-            
-            logging.info(f"Found {len(business_cards)} business cards")
-            
-            for index, card in enumerate(business_cards):
-                try:
-                    business_data = {
-                        'Sr No.': len(self.results) + 1,
-                        'Business Name': '',
-                        'Address': '',
-                        'Phone': '',
-                        'Website': '',
-                        'Rating': '',
-                        'Reviews': '',
-                        'Category': self.current_keyword,
-                        'Location': self.current_location,
-                        'Scraped Date': datetime.now().strftime("%Y-%m-%d")
-                    }
-                    
-                    # Extract business name
-                    try:
-                        name_element = card.find_element(
-                            By.XPATH, ".//div[contains(@role, 'heading')]//span | .//h3 | .//div[contains(@class, 'fontHeadlineSmall')]"
-                        )
-                        business_data['Business Name'] = name_element.text.strip()
-                    except:
-                        pass
-                    
-                    # Extract rating
-                    try:
-                        rating_element = card.find_element(
-                            By.XPATH, ".//span[contains(@aria-label, 'stars')] | .//span[@role='img']"
-                        )
-                        rating_text = rating_element.get_attribute('aria-label')
-                        if rating_text:
-                            business_data['Rating'] = rating_text.replace('stars', '').replace('star', '').strip()
-                    except:
-                        pass
-                    
-                    # Extract number of reviews
-                    try:
-                        reviews_element = card.find_element(
-                            By.XPATH, ".//span[contains(text(), 'reviews') or contains(text(), 'review')]"
-                        )
-                        business_data['Reviews'] = reviews_element.text.strip()
-                    except:
-                        pass
-                    
-                    # Extract address
-                    try:
-                        address_element = card.find_element(
-                            By.XPATH, ".//div[contains(text(), '·')]/following-sibling::div | .//div[contains(@class, 'fontBodyMedium')]"
-                        )
-                        business_data['Address'] = address_element.text.strip()
-                    except:
-                        pass
-                    
-                    # Only save if we have at least a business name
-                    if business_data['Business Name']:
-                        self.results.append(business_data)
-                        self.total_businesses_scraped += 1
-                    
-                except Exception as e:
-                    logging.warning(f"Error extracting data from card {index}: {e}")
-                    continue
-            
-            logging.info(f"Successfully extracted {len(self.results)} businesses")
-            return True
-            
-        except Exception as e:
-            logging.error(f"Data extraction failed: {e}")
-            return False
-
-    def save_to_excel(self, filename):
-        """Save results to Excel file"""
-        try:
-            if not self.results:
-                return False, "No data to save"
-            
-            df = pd.DataFrame(self.results)
-            df.to_excel(filename, index=False)
-            logging.info(f"Data saved to {filename}")
-            return True, f"Data saved successfully to {filename}"
-            
-        except Exception as e:
-            logging.error(f"Failed to save Excel: {e}")
-            return False, f"Error saving file: {str(e)}"
-
-    def save_to_pdf(self, filename):
-        """Save results to PDF file"""
-        try:
-            if not self.results:
-                return False, "No data to save"
-            
-            doc = SimpleDocTemplate(filename, pagesize=letter)
-            elements = []
-            styles = getSampleStyleSheet()
-            
-            # Title
-            title = Paragraph(
-                f"Google Maps Business Extraction Report<br/>"
-                f"Keyword: {self.current_keyword}<br/>"
-                f"Location: {self.current_location}<br/>"
-                f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}<br/>"
-                f"Total Businesses: {len(self.results)}",
-                styles['Heading2']
-            )
-            elements.append(title)
-            elements.append(Spacer(1, 12))
-            
-            # Create table data
-            table_data = [list(self.results[0].keys())]  # Header row
-            
-            for item in self.results:
-                table_data.append([
-                    str(item.get('Sr No.', '')),
-                    str(item.get('Business Name', '')),
-                    str(item.get('Address', '')),
-                    str(item.get('Phone', '')),
-                    str(item.get('Website', '')),
-                    str(item.get('Rating', '')),
-                    str(item.get('Reviews', '')),
-                    str(item.get('Category', '')),
-                    str(item.get('Location', '')),
-                    str(item.get('Scraped Date', ''))
-                ])
-            
-            # Create table
-            table = Table(table_data)
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('FONTSIZE', (0, 1), (-1, -1), 8),
-            ]))
-            
-            elements.append(table)
-            doc.build(elements)
-            
-            logging.info(f"PDF saved to {filename}")
-            return True, f"PDF saved successfully to {filename}"
-            
-        except Exception as e:
-            logging.error(f"Failed to save PDF: {e}")
-            return False, f"Error saving PDF: {str(e)}"
-
-    def close_driver(self):
-        """Close the browser driver"""
-        if self.driver:
-            self.driver.quit()
-            self.driver = None
-            logging.info("Browser closed")
-
-class GoogleMapsExtractorGUI:
-    def __init__(self):
-        self.extractor = GoogleMapsExtractor()
-        self.setup_gui()
-        
-    def setup_gui(self):
-        """Setup the GUI interface"""
-        self.root = tk.Tk()
-        self.root.title("Google Maps Business Extractor")
-        self.root.geometry("800x600")
-        
-        # Set icon
-        try:
-            self.root.iconbitmap(resource_path('icon.ico'))
-        except:
-            pass
-        
-        # Create main frame
-        main_frame = ttk.Frame(self.root, padding="20")
-        main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        
-        # Configure grid weights
-        self.root.columnconfigure(0, weight=1)
-        self.root.rowconfigure(0, weight=1)
-        main_frame.columnconfigure(1, weight=1)
-        
-        # Title
-        title_label = ttk.Label(
-            main_frame,
-            text="Google Maps Business Extractor",
-            font=('Arial', 16, 'bold')
-        )
-        title_label.grid(row=0, column=0, columnspan=3, pady=(0, 20))
-        
-        # Keyword input
-        ttk.Label(main_frame, text="Business Type/Keyword:").grid(
-            row=1, column=0, sticky=tk.W, pady=5
-        )
-        self.keyword_var = tk.StringVar()
-        self.keyword_entry = ttk.Entry(
-            main_frame, textvariable=self.keyword_var, width=40
-        )
-        self.keyword_entry.grid(row=1, column=1, sticky=(tk.W, tk.E), pady=5)
-        
-        # Location input
-        ttk.Label(main_frame, text="City/Location:").grid(
-            row=2, column=0, sticky=tk.W, pady=5
-        )
-        self.location_var = tk.StringVar()
-        self.location_entry = ttk.Entry(
-            main_frame, textvariable=self.location_var, width=40
-        )
-        self.location_entry.grid(row=2, column=1, sticky=(tk.W, tk.E), pady=5)
-        
-        # Max results
-        ttk.Label(main_frame, text="Max Results:").grid(
-            row=3, column=0, sticky=tk.W, pady=5
-        )
-        self.max_results_var = tk.StringVar(value="50")
-        self.max_results_spinbox = ttk.Spinbox(
-            main_frame, from_=10, to=200, textvariable=self.max_results_var, width=10
-        )
-        self.max_results_spinbox.grid(row=3, column=1, sticky=tk.W, pady=5)
-        
-        # Buttons frame
-        button_frame = ttk.Frame(main_frame)
-        button_frame.grid(row=4, column=0, columnspan=3, pady=20)
-        
-        self.start_button = ttk.Button(
-            button_frame,
-            text="Start Extraction",
-            command=self.start_extraction,
-            width=20
-        )
-        self.start_button.pack(side=tk.LEFT, padx=5)
-        
-        self.stop_button = ttk.Button(
-            button_frame,
-            text="Stop",
-            command=self.stop_extraction,
-            state=tk.DISABLED,
-            width=20
-        )
-        self.stop_button.pack(side=tk.LEFT, padx=5)
-        
-        # Progress bar
-        self.progress_var = tk.DoubleVar()
-        self.progress_bar = ttk.Progressbar(
-            main_frame, length=300, variable=self.progress_var, mode='determinate'
-        )
-        self.progress_bar.grid(row=5, column=0, columnspan=3, pady=10, sticky=(tk.W, tk.E))
-        
-        # Status label
-        self.status_var = tk.StringVar(value="Ready to start...")
-        self.status_label = ttk.Label(
-            main_frame, textvariable=self.status_var, relief=tk.SUNKEN, padding=5
-        )
-        self.status_label.grid(row=6, column=0, columnspan=3, pady=10, sticky=(tk.W, tk.E))
-        
-        # Results text
-        ttk.Label(main_frame, text="Results:").grid(
-            row=7, column=0, sticky=tk.W, pady=(10, 5)
-        )
-        
-        self.results_text = tk.Text(main_frame, height=10, width=70)
-        self.results_text.grid(row=8, column=0, columnspan=3, pady=(0, 10), sticky=(tk.W, tk.E))
-        
-        # Scrollbar for results text
-        scrollbar = ttk.Scrollbar(main_frame, orient=tk.VERTICAL, command=self.results_text.yview)
-        scrollbar.grid(row=8, column=3, sticky=(tk.N, tk.S), pady=(0, 10))
-        self.results_text.configure(yscrollcommand=scrollbar.set)
-        
-        # Save buttons frame
-        save_frame = ttk.Frame(main_frame)
-        save_frame.grid(row=9, column=0, columnspan=3, pady=10)
-        
-        self.save_excel_btn = ttk.Button(
-            save_frame,
-            text="Save as Excel",
-            command=lambda: self.save_results('excel'),
-            state=tk.DISABLED,
-            width=15
-        )
-        self.save_excel_btn.pack(side=tk.LEFT, padx=5)
-        
-        self.save_pdf_btn = ttk.Button(
-            save_frame,
-            text="Save as PDF",
-            command=lambda: self.save_results('pdf'),
-            state=tk.DISABLED,
-            width=15
-        )
-        self.save_pdf_btn.pack(side=tk.LEFT, padx=5)
-        
-        # Exit button
-        ttk.Button(save_frame, text="Exit", command=self.root.quit, width=15).pack(side=tk.LEFT, padx=5)
-        
-        # Set focus to first entry
-        self.keyword_entry.focus()
-        
-        # Bind Enter key to start extraction
-        self.root.bind('<Return>', lambda event: self.start_extraction())
-        
-    def update_status(self, message):
-        """Update status label"""
-        self.status_var.set(message)
-        self.root.update_idletasks()
-        
-    def update_results_text(self, message):
-        """Update results text widget"""
-        self.results_text.insert(tk.END, message + "\n")
-        self.results_text.see(tk.END)
-        self.root.update_idletasks()
-        
-    def start_extraction(self):
-        """Start the extraction process in a separate thread"""
-        keyword = self.keyword_var.get().strip()
-        location = self.location_var.get().strip()
-        
-        if not keyword or not location:
-            messagebox.showerror("Error", "Please enter both keyword and location")
-            return
-        
-        try:
-            max_results = int(self.max_results_var.get())
-        except ValueError:
-            messagebox.showerror("Error", "Please enter a valid number for max results")
-            return
-        
-        # Disable start button, enable stop button
-        self.start_button.config(state=tk.DISABLED)
-        self.stop_button.config(state=tk.NORMAL)
-        self.save_excel_btn.config(state=tk.DISABLED)
-        self.save_pdf_btn.config(state=tk.DISABLED)
-        
-        # Clear previous results
-        self.extractor.results = []
-        self.extractor.total_businesses_scraped = 0
-        self.results_text.delete(1.0, tk.END)
-        
-        # Start extraction in separate thread
-        self.extraction_thread = threading.Thread(
-            target=self.run_extraction,
-            args=(keyword, location, max_results),
-            daemon=True
-        )
-        self.extraction_thread.start()
-        
-    def run_extraction(self, keyword, location, max_results):
-        """Run the extraction process"""
-        try:
-            self.update_status("Initializing Chrome browser...")
-            self.update_results_text(f"Keyword: {keyword}")
-            self.update_results_text(f"Location: {location}")
-            self.update_results_text(f"Max Results: {max_results}")
-            self.update_results_text("-" * 50)
-            
-            # Setup driver
-            if not self.extractor.setup_driver():
-                self.update_status("Failed to initialize browser")
-                self.enable_buttons()
-                return
-            
-            # Open Google Maps
-            self.update_status("Opening Google Maps...")
-            if not self.extractor.open_google_maps():
-                self.update_status("Failed to open Google Maps")
-                self.extractor.close_driver()
-                self.enable_buttons()
-                return
-            
-            # Search for businesses
-            self.update_status(f"Searching for {keyword} in {location}...")
-            if not self.extractor.search_businesses(keyword, location):
-                self.update_status("Search failed")
-                self.extractor.close_driver()
-                self.enable_buttons()
-                return
-            
-            # Scroll and load results
-            self.update_status("Loading more results...")
-            self.extractor.scroll_and_load(max_results)
-            
-            # Extract data
-            self.update_status("Extracting business data...")
-            self.extractor.extract_business_data()
-            
-            # Update UI with results
-            self.update_status(f"Extraction complete! Found {len(self.extractor.results)} businesses")
-            self.update_results_text(f"\nExtraction Complete!")
-            self.update_results_text(f"Total businesses found: {len(self.extractor.results)}")
-            
-            # Show sample data
-            if self.extractor.results:
-                self.update_results_text("\nSample Data (first 5 results):")
-                self.update_results_text("-" * 50)
-                for i, business in enumerate(self.extractor.results[:5]):
-                    self.update_results_text(f"{i+1}. {business.get('Business Name', 'N/A')}")
-                    self.update_results_text(f"   Rating: {business.get('Rating', 'N/A')}")
-                    self.update_results_text(f"   Address: {business.get('Address', 'N/A')[:50]}...")
-                    self.update_results_text("")
-            
-            # Enable save buttons
-            if self.extractor.results:
-                self.save_excel_btn.config(state=tk.NORMAL)
-                self.save_pdf_btn.config(state=tk.NORMAL)
-            
-            # Close driver
-            self.extractor.close_driver()
-            
-        except Exception as e:
-            self.update_status(f"Error: {str(e)}")
-            self.update_results_text(f"ERROR: {str(e)}")
-            logging.error(f"Extraction error: {e}")
-        finally:
-            self.enable_buttons()
-            
-    def stop_extraction(self):
-        """Stop the extraction process"""
-        self.update_status("Stopping extraction...")
-        self.update_results_text("\nExtraction stopped by user")
-        self.extractor.close_driver()
-        self.enable_buttons()
-        
-    def enable_buttons(self):
-        """Enable/disable buttons as appropriate"""
-        self.start_button.config(state=tk.NORMAL)
-        self.stop_button.config(state=tk.DISABLED)
-        self.root.update_idletasks()
-        
-    def save_results(self, file_type):
-        """Save results to file"""
-        if not self.extractor.results:
-            messagebox.showwarning("No Data", "No data to save")
-            return
-        
-        # Ask for file location
-        if file_type == 'excel':
-            file_ext = "xlsx"
-            file_types = [("Excel files", "*.xlsx"), ("All files", "*.*")]
-        else:
-            file_ext = "pdf"
-            file_types = [("PDF files", "*.pdf"), ("All files", "*.*")]
-        
-        filename = filedialog.asksaveasfilename(
-            defaultextension=f".{file_ext}",
-            filetypes=file_types,
-            initialfile=f"google_maps_{self.extractor.current_keyword}_{self.extractor.current_location}.{file_ext}"
-        )
-        
-        if filename:
-            self.update_status(f"Saving to {file_type.upper()}...")
-            
-            if file_type == 'excel':
-                success, message = self.extractor.save_to_excel(filename)
-            else:
-                success, message = self.extractor.save_to_pdf(filename)
-            
-            if success:
-                messagebox.showinfo("Success", message)
-                self.update_status(message)
-                self.update_results_text(f"\n{message}")
-            else:
-                messagebox.showerror("Error", message)
-                self.update_status(f"Save failed: {message}")
-                
-    def run(self):
-        """Run the GUI application"""
-        self.root.mainloop()
-
-def main():
-    """Main function to run the application"""
-    print("=" * 60)
-    print("GOOGLE MAPS BUSINESS EXTRACTOR")
-    print("=" * 60)
-    print("\nWebdriver-manager installed - No manual ChromeDriver needed!")
-    print("Starting GUI application...")
-    
-    app = GoogleMapsExtractorGUI()
-    app.run()
-
-if __name__ == "__main__":
-    # Check for required packages
-    required_packages = ['selenium', 'pandas', 'openpyxl', 'reportlab', 'webdriver-manager']
-    
-    print("Checking for required packages...")
-    for package in required_packages:
-        try:
-            __import__(package.replace('-', '_'))
-        except ImportError:
-            print(f"Please install {package} using: pip install {package}")
-    
-    main()
\ No newline at end of file
+import time
+import re
+import os
+import sys
+import threading
+import multiprocessing
+import argparse
+import csv
+import json
+import queue
+import subprocess
+import statistics
+import importlib.util
+import functools
+import math
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+import logging
+
+from gmaps.job_queue import (
+    JOB_HEARTBEAT_SECONDS, JOB_LEASE_SECONDS, JOB_QUEUE_PATH, JOB_QUEUE_PORT, JobQueue, JobQueueServer, RemoteJobQueue,
+    open_job_queue,
+)
+from gmaps.payloads import MAPS_URL, NetworkMeter, PayloadCapture, parse_maps_payload
+from gmaps.postprocess import DEFAULT_COUNTRY_CODE, parse_country_code, postprocess_records
+from gmaps.records import BusinessRecord, business_key, extract_place_id, parse_rating, parse_review_count
+from gmaps.scheduling import QUERY_RETRIES, RATE_LIMIT_PER_HOUR, SESSION_RATE_PER_HOUR, BlockedError, RequestScheduler
+from gmaps.sinks import (
+    EXPORT_FORMATS, CallbackSink, ExcelStreamWriter, ListSink, create_exporter, excel_sheet_name,
+    export_format_for,
+)
+from gmaps.storage import (
+    DEFAULT_STORE_PATH, QUERY_CACHE_PATH, QUERY_CACHE_TTL, RESULTS_DIR, CheckpointJournal, JournalSink, QueryCache,
+    ResultStore, StoreSink, query_variant,
+)
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+IMPLICIT_WAIT_SECONDS = 10
+CHECKPOINT_DIR = os.path.join(RESULTS_DIR, "checkpoints")
+METRICS_DIR = os.path.join(RESULTS_DIR, "metrics")
+
+# The GUI drains worker events this often, applying at most this many per
+# tick so a burst of results cannot stall the window; ETAs use the rate
+# over the last ETA_WINDOW_SECONDS
+GUI_POLL_MS = 50
+GUI_EVENTS_PER_TICK = 500
+ETA_WINDOW_SECONDS = 15
+# Stop asks the worker to wind down between steps; if a WebDriver call is
+# still blocking it after this long, the GUI quits the browser under it
+STOP_GRACE_SECONDS = 5
+
+# Columns shown in the PDF report, in order, with their widths in points.
+# The widths fill a landscape letter page inside 30pt margins.
+PDF_COLUMNS = [
+    'Sr No.', 'Business Name', 'Address', 'Phone', 'Website',
+    'Rating', 'Reviews', 'Category', 'Location', 'Scraped Date'
+]
+PDF_COLUMN_WIDTHS = [30, 120, 170, 70, 100, 35, 45, 55, 55, 52]
+PDF_MARGIN = 30
+PDF_ROWS_PER_CHUNK = 40
+PDF_FONT_SIZE = 7
+
+# The results feed stops after about this many places, however far it is scrolled
+FEED_RESULT_CAP = 120
+# Geographic tiling: a tile returning this share of the cap is split in four,
+# and a viewport-scoped search covers a map area about this many pixels wide
+TILE_DENSE_RATIO = 0.9
+TILE_VIEWPORT_PX = 900
+GEOCODE_URL = "https://nominatim.openstreetmap.org/search"
+# Nominatim's usage policy allows at most one request per second, from a
+# User-Agent that identifies the application
+GEOCODE_MIN_INTERVAL = 1.0
+GEOCODE_USER_AGENT = "google-maps-business-extractor (tiled search bounding boxes)"
+
+# Origin whose cookies, storage and caches a pooled session drops between searches
+MAPS_ORIGIN = "https://www.google.com"
+# Extraction modes: read feed cards from the DOM, or parse captured network payloads
+EXTRACTION_MODES = ('dom', 'network')
+DRIVER_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".google_maps_extractor", "drivers")
+
+# Selenium, pandas, reportlab, tkinter and webdriver-manager are imported on
+# first use so startup and the batch coordinator do not pay for modules they
+# never touch
+webdriver = ChromeService = By = Keys = WebDriverWait = EC = None
+TimeoutException = NoSuchElementException = None
+tk = ttk = messagebox = filedialog = None
+
+# Result card locators, shared by the per-element and bulk extraction paths
+CARD_XPATH = "//div[contains(@role, 'article') or contains(@class, 'section-result')]"
+CARD_FALLBACK_XPATH = "//a[contains(@href, 'maps/place')]/../.."
+NAME_XPATH = ".//div[contains(@role, 'heading')]//span | .//h3 | .//div[contains(@class, 'fontHeadlineSmall')]"
+RATING_XPATH = ".//span[contains(@aria-label, 'stars')] | .//span[@role='img']"
+REVIEWS_XPATH = ".//span[contains(text(), 'reviews') or contains(text(), 'review')]"
+ADDRESS_XPATH = ".//div[contains(text(), '·')]/following-sibling::div | .//div[contains(@class, 'fontBodyMedium')]"
+PLACE_LINK_XPATH = ".//a[contains(@href, 'maps/place')]"
+FEED_XPATH = "//div[@role='feed']"
+SHOW_MORE_XPATH = "//button[contains(., 'Show more results') or contains(., 'More results')]"
+
+PLACE_COUNT_JS = "return document.querySelectorAll(\"a[href*='maps/place']\").length;"
+
+# Installs a MutationObserver on the feed that keeps a deduplicated list of
+# place URLs and notices the end-of-list marker. Safe to call repeatedly; a
+# new feed element replaces the previous observer.
+FEED_OBSERVER_JS = """
+var feed = document.evaluate(arguments[0], document, null,
+    XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+if (!feed) {
+    return null;
+}
+var state = window.__gmapsFeed;
+if (state && state.feed === feed) {
+    return state.urls.length;
+}
+if (state && state.observer) {
+    // The feed was replaced (new search or re-render); stop watching the detached one
+    state.observer.disconnect();
+}
+state = {feed: feed, seen: {}, urls: [], ended: false};
+function record(link) {
+    var url = link.href.split('?')[0];
+    if (!state.seen[url]) {
+        state.seen[url] = true;
+        state.urls.push(url);
+    }
+}
+function scan(node) {
+    if (node.nodeType !== 1) {
+        return;
+    }
+    if (node.matches("a[href*='maps/place']")) {
+        record(node);
+    }
+    var links = node.querySelectorAll("a[href*='maps/place']");
+    for (var i = 0; i < links.length; i++) {
+        record(links[i]);
+    }
+    if (!state.ended && /end of the list/i.test(node.textContent || '')) {
+        state.ended = true;
+    }
+}
+scan(feed);
+state.observer = new MutationObserver(function (mutations) {
+    for (var i = 0; i < mutations.length; i++) {
+        var added = mutations[i].addedNodes;
+        for (var j = 0; j < added.length; j++) {
+            scan(added[j]);
+        }
+    }
+});
+state.observer.observe(feed, {childList: true, subtree: true});
+window.__gmapsFeed = state;
+return state.urls.length;
+"""
+
+# Reads the place detail panel; returns null until the panel has rendered
+PLACE_DETAILS_JS = """
+if (!document.querySelector('h1')) {
+    return null;
+}
+function label(selector, prefix) {
+    var el = document.querySelector(selector);
+    if (!el) {
+        return '';
+    }
+    var value = (el.getAttribute('aria-label') || el.innerText || '').trim();
+    return value.replace(prefix, '').trim();
+}
+var phone = document.querySelector("button[data-item-id^='phone:tel:']");
+var website = document.querySelector("a[data-item-id='authority']");
+var hours = document.querySelector("[aria-label*='Monday'], [aria-label*='Sunday']");
+var details = {
+    phone: phone ? phone.getAttribute('data-item-id').replace('phone:tel:', '') : '',
+    website: website ? website.href : '',
+    address: label("button[data-item-id='address']", /^Address:\\s*/),
+    plus_code: label("button[data-item-id='oloc']", /^Plus code:\\s*/),
+    hours: hours ? hours.getAttribute('aria-label').replace(/\\.?\\s*Hide open hours for the week\\.?$/, '').trim() : ''
+};
+// Wait for at least one contact field unless the panel is clearly done loading
+if (!details.phone && !details.website && !details.address && document.querySelector("[role='progressbar']")) {
+    return null;
+}
+return details;
+"""
+
+FEED_STATE_JS = """
+var state = window.__gmapsFeed;
+return state ? {count: state.urls.length, ended: state.ended} : null;
+"""
+
+FEED_URLS_JS = """
+var state = window.__gmapsFeed;
+return state ? state.urls.slice(arguments[0] || 0) : [];
+"""
+RESOURCE_COUNT_JS = "return performance.getEntriesByType('resource').length;"
+
+# True when no loading indicator is visible in the results pane
+SPINNER_GONE_JS = """
+var spinners = document.querySelectorAll("[role='progressbar'], .section-loading-spinner");
+for (var i = 0; i < spinners.length; i++) {
+    if (spinners[i].offsetParent !== null) {
+        return false;
+    }
+}
+return true;
+"""
+
+# Recognises Google's interstitials: 'captcha' for the "unusual traffic"
+# /sorry/ page or a reCAPTCHA, 'consent' for the cookie consent page
+BLOCK_CHECK_JS = """
+if (/\\/sorry\\//.test(location.pathname) || document.querySelector("iframe[src*='recaptcha'], #captcha-form")) {
+    return 'captcha';
+}
+var text = document.body ? document.body.innerText.slice(0, 5000) : '';
+if (/unusual traffic/i.test(text)) {
+    return 'captcha';
+}
+if (/^consent\\./.test(location.hostname) || document.querySelector("form[action*='consent.google']")) {
+    return 'consent';
+}
+return null;
+"""
+
+# Submits the consent form's first button ("Reject all"); false if there is none
+DISMISS_CONSENT_JS = """
+var button = document.querySelector("form[action*='consent.google'] button, form[action*='consent.google'] input[type='submit']");
+if (!button) {
+    return false;
+}
+button.click();
+return true;
+"""
+
+# Clicks the "Show more results" button if present, without an implicit wait
+CLICK_SHOW_MORE_JS = """
+var button = document.evaluate(arguments[0], document, null,
+    XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+if (!button) {
+    return false;
+}
+button.click();
+return true;
+"""
+
+# outerHTML of every result card, for recording benchmark fixtures
+RECORD_CARDS_JS = """
+var cards = document.evaluate(arguments[0], document, null,
+    XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+var html = [];
+for (var i = 0; i < cards.snapshotLength; i++) {
+    html.push(cards.snapshotItem(i).outerHTML);
+}
+return html;
+"""
+
+# Evaluates the same XPaths in the page and returns one record per card. With
+# arguments[1] set, cards already returned are skipped and new ones are marked.
+BULK_EXTRACT_JS = """
+var xp = arguments[0];
+var onlyNew = arguments[1];
+function first(context, path) {
+    return document.evaluate(path, context, null,
+        XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+}
+function all(path) {
+    var snapshot = document.evaluate(path, document, null,
+        XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    var nodes = [];
+    for (var i = 0; i < snapshot.snapshotLength; i++) {
+        nodes.push(snapshot.snapshotItem(i));
+    }
+    return nodes;
+}
+function text(el) {
+    return el ? (el.innerText || el.textContent || '').trim() : '';
+}
+var cards = all(xp.cards);
+if (!cards.length) {
+    cards = all(xp.fallback);
+}
+var records = [];
+cards.forEach(function (card) {
+    if (onlyNew && card.hasAttribute('data-gmaps-extracted')) {
+        return;
+    }
+    var rating = first(card, xp.rating);
+    var link = first(card, xp.link);
+    var record = {
+        name: text(first(card, xp.name)),
+        rating: rating ? (rating.getAttribute('aria-label') || '') : '',
+        reviews: text(first(card, xp.reviews)),
+        address: text(first(card, xp.address)),
+        url: link ? link.href : ''
+    };
+    // Cards still rendering have no name yet; leave them for the next pass
+    if (onlyNew && record.name) {
+        card.setAttribute('data-gmaps-extracted', '1');
+    }
+    records.push(record);
+});
+return records;
+"""
+
+class CancelToken:
+    """Cooperative stop request shared by the GUI and an extraction run
+
+    cancel() may be called from any thread. Waits, scrolling and extraction
+    loops check `cancelled` between steps and wind down, keeping what they
+    have extracted so far.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+# Returned by a wait's condition once the run is cancelled, to end the wait early
+_WAIT_CANCELLED = object()
+
+class WaitEngine:
+    """Condition-based waits that record how long each one actually took
+
+    With a cancel_token, every wait gives up (returning None) within one
+    poll interval of the run being cancelled.
+    """
+
+    def __init__(self, driver, timeout=10, poll_interval=0.25, cancel_token=None):
+        _load_selenium()
+        self.driver = driver
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.cancel_token = cancel_token
+        self.timings = []
+
+    def wait_for(self, name, condition, timeout=None, poll_interval=None):
+        """Poll condition(driver) until it is truthy
+
+        Returns the condition's value, or None if the timeout expired or
+        the run was cancelled.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        poll_interval = self.poll_interval if poll_interval is None else poll_interval
+        token = self.cancel_token
+
+        def until(driver):
+            if token is not None and token.cancelled:
+                return _WAIT_CANCELLED
+            return condition(driver)
+
+        start = time.perf_counter()
+        try:
+            value = WebDriverWait(self.driver, timeout, poll_frequency=poll_interval).until(until)
+            timed_out = False
+        except TimeoutException:
+            value = None
+            timed_out = True
+        if value is _WAIT_CANCELLED:
+            value = None
+        elapsed = time.perf_counter() - start
+
+        self.timings.append({'name': name, 'seconds': round(elapsed, 3), 'timed_out': timed_out})
+        logging.debug(f"Wait '{name}' took {elapsed:.2f}s{' (timed out)' if timed_out else ''}")
+        return value
+
+    def feed_present(self, timeout=None):
+        """Wait until the results feed container is in the DOM"""
+        return self.wait_for(
+            'feed_present', EC.presence_of_element_located((By.XPATH, FEED_XPATH)), timeout
+        )
+
+    def result_count_changed(self, previous, timeout=None):
+        """Wait until the feed's place count differs from previous or the list ends
+
+        Reads the feed observer's running count when it is installed and falls
+        back to counting place links. Returns {'count', 'ended'}, or None if
+        nothing changed before the timeout.
+        """
+        def changed(driver):
+            state = driver.execute_script(FEED_STATE_JS)
+            if state is None:
+                state = {'count': driver.execute_script(PLACE_COUNT_JS), 'ended': False}
+            if state['count'] != previous or state['ended']:
+                return state
+            return False
+
+        return self.wait_for('result_count_changed', changed, timeout)
+
+    def network_idle(self, quiet_period=0.5, timeout=None):
+        """Wait until no new resource requests start for quiet_period seconds"""
+        state = {'count': -1, 'since': time.perf_counter()}
+
+        def idle(driver):
+            count = driver.execute_script(RESOURCE_COUNT_JS)
+            now = time.perf_counter()
+            if count != state['count']:
+                state['count'] = count
+                state['since'] = now
+                return False
+            return now - state['since'] >= quiet_period
+
+        return self.wait_for('network_idle', idle, timeout)
+
+    def spinner_gone(self, timeout=None):
+        """Wait until no loading indicator is visible"""
+        return self.wait_for(
+            'spinner_gone', lambda driver: driver.execute_script(SPINNER_GONE_JS), timeout
+        )
+
+    def summary(self):
+        """Aggregate recorded timings per wait name"""
+        summary = {}
+        for timing in self.timings:
+            entry = summary.setdefault(
+                timing['name'], {'count': 0, 'total_seconds': 0.0, 'max_seconds': 0.0, 'timeouts': 0}
+            )
+            entry['count'] += 1
+            entry['total_seconds'] = round(entry['total_seconds'] + timing['seconds'], 3)
+            entry['max_seconds'] = max(entry['max_seconds'], timing['seconds'])
+            if timing['timed_out']:
+                entry['timeouts'] += 1
+        return summary
+
+def _load_selenium():
+    """Import Selenium on first use (its webdriver module is slow to import)"""
+    global webdriver, ChromeService, By, Keys, WebDriverWait, EC, TimeoutException, NoSuchElementException
+    if webdriver is None:
+        from selenium import webdriver as selenium_webdriver
+        from selenium.webdriver.chrome.service import Service
+        from selenium.webdriver.common.by import By as selenium_by
+        from selenium.webdriver.common.keys import Keys as selenium_keys
+        from selenium.webdriver.support.ui import WebDriverWait as selenium_wait
+        from selenium.webdriver.support import expected_conditions
+        from selenium.common import exceptions
+        ChromeService, By, Keys, WebDriverWait, EC = (
+            Service, selenium_by, selenium_keys, selenium_wait, expected_conditions
+        )
+        TimeoutException = exceptions.TimeoutException
+        NoSuchElementException = exceptions.NoSuchElementException
+        webdriver = selenium_webdriver
+
+def _load_gui_modules():
+    """Import tkinter on first use; headless paths never need it"""
+    global tk, ttk, messagebox, filedialog
+    if tk is None:
+        import tkinter
+        from tkinter import ttk as tkinter_ttk, messagebox as tkinter_messagebox, filedialog as tkinter_filedialog
+        tk, ttk, messagebox, filedialog = tkinter, tkinter_ttk, tkinter_messagebox, tkinter_filedialog
+
+def installed_chrome_version():
+    """Return the installed Chrome version string, or None if not found"""
+    if sys.platform == 'win32':
+        import winreg
+        for root in (winreg.HKEY_CURRENT_USER, winreg.HKEY_LOCAL_MACHINE):
+            try:
+                with winreg.OpenKey(root, r"Software\Google\Chrome\BLBeacon") as key:
+                    return winreg.QueryValueEx(key, "version")[0]
+            except OSError:
+                continue
+        return None
+
+    if sys.platform == 'darwin':
+        candidates = ["/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"]
+    else:
+        candidates = ["google-chrome", "google-chrome-stable", "chromium", "chromium-browser"]
+    for binary in candidates:
+        try:
+            output = subprocess.run(
+                [binary, "--version"], capture_output=True, text=True, timeout=10
+            ).stdout
+        except (OSError, subprocess.SubprocessError):
+            continue
+        match = re.search(r"\d+\.\d+\.\d+\.\d+", output)
+        if match:
+            return match.group(0)
+    return None
+
+_driver_path_lock = threading.Lock()
+_resolved_driver_path = None
+
+def resolve_chromedriver(cache_dir=DRIVER_CACHE_DIR):
+    """Return a chromedriver path, using the local cache when it is valid
+
+    The cache is keyed by the installed Chrome build (major.minor.build), so
+    a cache hit needs no network call. On a miss webdriver-manager downloads
+    the driver once and the result is recorded. Returns None when nothing can
+    be resolved, leaving it to Selenium Manager. CHROMEDRIVER_PATH overrides
+    everything.
+    """
+    global _resolved_driver_path
+
+    override = os.environ.get("CHROMEDRIVER_PATH")
+    if override:
+        return override
+
+    with _driver_path_lock:
+        if _resolved_driver_path and os.path.exists(_resolved_driver_path):
+            return _resolved_driver_path
+
+        version = installed_chrome_version()
+        build = ".".join(version.split(".")[:3]) if version else None
+        index_path = os.path.join(cache_dir, "index.json")
+        try:
+            with open(index_path, encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = {}
+
+        cached = index.get(build) if build else None
+        if cached and os.path.exists(cached):
+            logging.info(f"Using cached chromedriver for Chrome {build}")
+            _resolved_driver_path = cached
+            return cached
+
+        try:
+            from webdriver_manager.chrome import ChromeDriverManager
+            path = ChromeDriverManager().install()
+        except Exception as e:
+            logging.warning(f"webdriver-manager could not resolve chromedriver: {e}")
+            return None
+
+        if build:
+            index[build] = path
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                with open(index_path, 'w', encoding='utf-8') as f:
+                    json.dump(index, f, indent=2)
+            except OSError as e:
+                logging.warning(f"Could not update chromedriver cache: {e}")
+
+        _resolved_driver_path = path
+        return path
+
+# Requests the scraper never reads: imagery, map tiles, fonts and media
+LEAN_BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*.mp4", "*.webm", "*.mp3",
+    "*/maps/vt*", "*/kh/v=*", "*khms*.google.com*", "*/maps/photometa*",
+    "*googleusercontent.com/p/*", "*streetviewpixels*", "*fonts.gstatic.com*",
+]
+
+LEAN_CHROME_ARGS = [
+    "--headless=new",
+    "--window-size=1024,768",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-remote-fonts",
+    "--mute-audio",
+    "--blink-settings=imagesEnabled=false",
+]
+
+def create_chrome_driver(headless=False, lean=False, performance_log=False):
+    """Launch a Chrome session with webdriver-manager (NO MANUAL DOWNLOAD)
+
+    lean=True runs a small headless window that blocks images, media, fonts
+    and map tiles via preferences and DevTools URL blocking.
+    performance_log=True records DevTools network events for NetworkMeter
+    and PayloadCapture; Chrome buffers them until read, so only sessions
+    that drain the log should turn it on.
+    """
+    _load_selenium()
+    options = webdriver.ChromeOptions()
+    if lean:
+        for argument in LEAN_CHROME_ARGS:
+            options.add_argument(argument)
+        options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.managed_default_content_settings.media_stream": 2,
+            "profile.managed_default_content_settings.plugins": 2,
+        })
+    elif headless:
+        options.add_argument("--headless=new")
+        options.add_argument("--window-size=1366,900")
+    else:
+        options.add_argument("--start-maximized")
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option('useAutomationExtension', False)
+    if performance_log:
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+    # Cached chromedriver, downloaded by webdriver-manager on first use
+    driver_path = resolve_chromedriver()
+    service = ChromeService(driver_path) if driver_path else ChromeService()
+    driver = webdriver.Chrome(service=service, options=options)
+    driver.implicitly_wait(IMPLICIT_WAIT_SECONDS)
+
+    if lean:
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": LEAN_BLOCKED_URLS})
+        except Exception as e:
+            logging.warning(f"Could not enable request blocking: {e}")
+    return driver
+
+class RoundTripCounter:
+    """Count WebDriver commands sent to the browser
+
+    Every Selenium call (find_element, execute_script, get, element reads)
+    goes through driver.execute, which attach() wraps. Re-attaching a pooled
+    driver replaces the previous wrapper rather than stacking another.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.by_command = {}
+
+    def attach(self, driver):
+        original = getattr(driver, '_unwrapped_execute', None) or getattr(driver, 'execute', None)
+        if original is None:
+            return
+
+        def execute(command, params=None):
+            self.count += 1
+            self.by_command[command] = self.by_command.get(command, 0) + 1
+            return original(command, params)
+
+        driver._unwrapped_execute = original
+        driver.execute = execute
+
+class PhaseMetrics:
+    """Per-phase durations, WebDriver round trips and results, plus selector hit rates
+
+    round_trips() and results() return running totals; a phase records how
+    much each grew while it ran. Every phase is kept as a trace event and
+    aggregated by summary(). The data can be written as a JSON trace or a
+    Prometheus text file.
+    """
+
+    def __init__(self, round_trips=None, results=None):
+        self.round_trips = round_trips or (lambda: 0)
+        self.results = results or (lambda: 0)
+        self.started = datetime.now().isoformat(timespec='seconds')
+        self.events = []
+        self.selectors = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name):
+        """Time the body as one phase; yields the event so callers can mark failures"""
+        event = {'phase': name, 'start': time.time(), 'ok': True}
+        start = time.perf_counter()
+        round_trips = self.round_trips()
+        results = self.results()
+        try:
+            yield event
+        except BaseException:
+            event['ok'] = False
+            raise
+        finally:
+            event['seconds'] = round(time.perf_counter() - start, 4)
+            event['round_trips'] = self.round_trips() - round_trips
+            event['results'] = self.results() - results
+            with self._lock:
+                self.events.append(event)
+
+    def selector(self, name, hit):
+        """Count one lookup of a selector as a hit or a miss"""
+        with self._lock:
+            entry = self.selectors.setdefault(name, {'hits': 0, 'misses': 0})
+            entry['hits' if hit else 'misses'] += 1
+
+    def summary(self):
+        """Totals per phase and hit rates per selector"""
+        phases = {}
+        with self._lock:
+            events = list(self.events)
+            selectors = {name: dict(entry) for name, entry in self.selectors.items()}
+        for event in events:
+            entry = phases.setdefault(event['phase'], {
+                'count': 0, 'failures': 0, 'total_seconds': 0.0, 'max_seconds': 0.0,
+                'round_trips': 0, 'results': 0,
+            })
+            entry['count'] += 1
+            entry['failures'] += 0 if event['ok'] else 1
+            entry['total_seconds'] = round(entry['total_seconds'] + event['seconds'], 4)
+            entry['max_seconds'] = max(entry['max_seconds'], event['seconds'])
+            entry['round_trips'] += event['round_trips']
+            entry['results'] += event['results']
+        for entry in phases.values():
+            seconds = entry['total_seconds']
+            entry['results_per_second'] = round(entry['results'] / seconds, 2) if seconds else 0.0
+        for entry in selectors.values():
+            lookups = entry['hits'] + entry['misses']
+            entry['hit_rate'] = round(entry['hits'] / lookups, 3) if lookups else 0.0
+        return {'phases': phases, 'selectors': selectors}
+
+    def write_trace(self, path):
+        """Write every phase event plus the summary as JSON"""
+        with self._lock:
+            events = list(self.events)
+        trace = {'started': self.started, 'events': events, 'summary': self.summary()}
+        _write_atomic(path, json.dumps(trace, indent=2))
+
+    def prometheus_text(self):
+        """The summary in Prometheus text exposition format"""
+        summary = self.summary()
+        metrics = [
+            ('gmaps_phase_runs_total', 'counter', "Times each phase ran", 'phases', 'phase', 'count'),
+            ('gmaps_phase_failures_total', 'counter', "Phase runs that failed", 'phases', 'phase', 'failures'),
+            ('gmaps_phase_seconds_total', 'counter', "Wall time spent in each phase", 'phases', 'phase', 'total_seconds'),
+            ('gmaps_phase_round_trips_total', 'counter', "WebDriver commands sent during each phase", 'phases', 'phase', 'round_trips'),
+            ('gmaps_phase_results_total', 'counter', "Businesses extracted during each phase", 'phases', 'phase', 'results'),
+            ('gmaps_phase_results_per_second', 'gauge', "Businesses extracted per second of phase time", 'phases', 'phase', 'results_per_second'),
+            ('gmaps_selector_hits_total', 'counter', "Lookups where a selector matched", 'selectors', 'selector', 'hits'),
+            ('gmaps_selector_misses_total', 'counter', "Lookups where a selector found nothing", 'selectors', 'selector', 'misses'),
+        ]
+        lines = []
+        for metric, kind, help_text, group, label, key in metrics:
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {kind}")
+            for name, entry in sorted(summary[group].items()):
+                lines.append(f'{metric}{{{label}="{name}"}} {entry[key]}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        """Write the Prometheus text file, e.g. for node_exporter's textfile collector"""
+        _write_atomic(path, self.prometheus_text())
+
+    def report_lines(self):
+        """Human-readable summary table"""
+        summary = self.summary()
+        lines = [f"{'phase':<24}{'runs':>6}{'seconds':>10}{'max':>8}{'round trips':>13}{'results':>9}{'per sec':>9}"]
+        for name, entry in summary['phases'].items():
+            lines.append(
+                f"{name:<24}{entry['count']:>6}{entry['total_seconds']:>10.2f}{entry['max_seconds']:>8.2f}"
+                f"{entry['round_trips']:>13}{entry['results']:>9}{entry['results_per_second']:>9}"
+            )
+        lines.append("")
+        lines.append(f"{'selector':<24}{'hits':>8}{'misses':>8}{'hit rate':>10}")
+        for name, entry in summary['selectors'].items():
+            lines.append(f"{name:<24}{entry['hits']:>8}{entry['misses']:>8}{entry['hit_rate']:>10.1%}")
+        return lines
+
+def _write_atomic(path, text):
+    """Replace path with text without readers ever seeing a partial file"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    temp_path = path + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(temp_path, path)
+
+def instrumented(phase):
+    """Record a GoogleMapsExtractor method as a phase in self.metrics
+
+    Methods that report failure by returning False or (False, message)
+    count as failed runs.
+    """
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.metrics.phase(phase) as event:
+                result = method(self, *args, **kwargs)
+                if result is False or (isinstance(result, tuple) and result and result[0] is False):
+                    event['ok'] = False
+                return result
+        return wrapper
+    return decorate
+
+class DriverPool:
+    """Keeps warm Chrome sessions and lends them to successive searches
+
+    Sessions are handed out already sitting on the Maps home page. On return
+    a session is reset for the next search, or quit and replaced once it has
+    served max_uses searches or its memory grows past max_memory_mb.
+    """
+
+    def __init__(self, size=1, max_uses=25, max_memory_mb=2048, headless=False, lean=False, performance_log=False):
+        self.size = size
+        self.max_uses = max_uses
+        self.max_memory_mb = max_memory_mb
+        self.headless = headless
+        self.lean = lean
+        self.performance_log = performance_log
+        self._idle = []
+        self._uses = {}
+        self._created = 0
+        self._closed = False
+        self._available = threading.Condition()
+
+    def acquire(self, timeout=None):
+        """Borrow a session, starting a new one if the pool has room"""
+        with self._available:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Driver pool is closed")
+                if self._idle:
+                    return self._idle.pop()
+                if self._created < self.size:
+                    self._created += 1
+                    break
+                if not self._available.wait(timeout):
+                    raise TimeoutError("No browser session became available")
+
+        try:
+            driver = create_chrome_driver(self.headless, self.lean, self.performance_log)
+            driver.get(MAPS_URL)
+        except Exception:
+            with self._available:
+                self._created -= 1
+                self._available.notify()
+            raise
+
+        with self._available:
+            self._uses[driver] = 0
+        logging.info("Started a new pooled Chrome session")
+        return driver
+
+    def release(self, driver, discard=False):
+        """Return a session; it is reset for reuse or recycled"""
+        with self._available:
+            uses = self._uses.get(driver, 0) + 1
+            self._uses[driver] = uses
+
+        reason = None
+        if discard:
+            reason = "discarded by caller"
+        elif self._closed:
+            reason = "pool closed"
+        elif uses >= self.max_uses:
+            reason = f"served {uses} searches"
+        else:
+            memory_mb = self._memory_mb(driver)
+            if memory_mb > self.max_memory_mb:
+                reason = f"using {memory_mb:.0f} MB"
+            elif not self._reset(driver):
+                reason = "reset failed"
+
+        if reason:
+            logging.info(f"Recycling Chrome session ({reason})")
+            self._quit(driver)
+            with self._available:
+                self._created -= 1
+                self._available.notify()
+            return
+
+        with self._available:
+            self._idle.append(driver)
+            self._available.notify()
+
+    @contextmanager
+    def session(self, timeout=None):
+        """Context manager that borrows a session and always returns it"""
+        driver = self.acquire(timeout)
+        try:
+            yield driver
+        except Exception:
+            self.release(driver, discard=True)
+            raise
+        self.release(driver)
+
+    def close(self):
+        """Quit every idle session; busy sessions quit when released"""
+        with self._available:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._created -= len(idle)
+            self._available.notify_all()
+        for driver in idle:
+            self._quit(driver)
+
+    def _reset(self, driver):
+        """Close extra tabs, clear browsing state and go back to the Maps home page
+
+        Cookies, the HTTP cache and Google's local/session storage, IndexedDB
+        and service workers are all dropped, so each search starts like a new
+        profile. That includes the consent cookie: EU sessions see the consent
+        page again and check_blocked dismisses it.
+        """
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            driver.execute_script("try { sessionStorage.clear(); } catch (e) {}")
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+            driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": MAPS_ORIGIN, "storageTypes": "all"})
+            driver.get(MAPS_URL)
+            return True
+        except Exception as e:
+            logging.warning(f"Could not reset Chrome session: {e}")
+            return False
+
+    def _memory_mb(self, driver):
+        """Resident memory of the session's chromedriver and Chrome processes in MB
+
+        RSS is summed over chromedriver and every browser, renderer and GPU
+        process below it, so pages shared between them count more than once.
+        Without psutil this falls back to the page's used JS heap, which leaves
+        out the DOM, images, GPU and other processes and is only a lower bound.
+        """
+        try:
+            import psutil
+        except ImportError:
+            return self._heap_mb(driver)
+        try:
+            root = psutil.Process(driver.service.process.pid)
+            processes = [root] + root.children(recursive=True)
+        except Exception:
+            return self._heap_mb(driver)
+        total = 0
+        for process in processes:
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                pass
+        return total / (1024 * 1024)
+
+    def _heap_mb(self, driver):
+        try:
+            used = driver.execute_script(
+                "return performance.memory ? performance.memory.usedJSHeapSize : 0;"
+            )
+            return (used or 0) / (1024 * 1024)
+        except Exception:
+            return 0
+
+    def _quit(self, driver):
+        with self._available:
+            self._uses.pop(driver, None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+_lazy_table_chunk_class = None
+
+def _table_chunk_class():
+    """Flowable that builds its table only when reportlab lays it out
+
+    Defined on first use because reportlab is imported lazily.
+    """
+    global _lazy_table_chunk_class
+    if _lazy_table_chunk_class is None:
+        from reportlab.platypus import Flowable
+
+        class LazyTableChunk(Flowable):
+            def __init__(self, writer, records, start, end):
+                Flowable.__init__(self)
+                self.writer = writer
+                self.records = records
+                self.start = start
+                self.end = end
+                self._table = None
+
+            def _get_table(self):
+                if self._table is None:
+                    self._table = self.writer.build_table(self.records, self.start, self.end)
+                return self._table
+
+            def wrap(self, available_width, available_height):
+                return self._get_table().wrap(available_width, available_height)
+
+            def split(self, available_width, available_height):
+                parts = self._get_table().split(available_width, available_height)
+                if parts:
+                    self._table = None
+                    self.writer.advance(self.end - self.start)
+                return parts
+
+            def drawOn(self, canvas, x, y, _sW=0):
+                self._get_table().drawOn(canvas, x, y, _sW)
+                # Drop the cells once drawn so only one chunk is alive at a time
+                self._table = None
+                self.writer.advance(self.end - self.start)
+
+        _lazy_table_chunk_class = LazyTableChunk
+    return _lazy_table_chunk_class
+
+class PdfReportWriter:
+    """Render a landscape PDF report in fixed-size row chunks
+
+    Every chunk is its own table with the header repeated, fixed column
+    widths (so reportlab never measures cells to size columns) and wrapped
+    text in long cells. A chunk's cells are built only when it is laid out
+    and dropped once drawn, so memory stays flat as the row count grows.
+    progress(done, total) is called as chunks are placed.
+    """
+
+    def __init__(self, path, title_lines, columns=PDF_COLUMNS, column_widths=PDF_COLUMN_WIDTHS,
+                 rows_per_chunk=PDF_ROWS_PER_CHUNK, progress=None):
+        self.path = path
+        self.title_lines = title_lines
+        self.columns = columns
+        self.column_widths = column_widths
+        self.rows_per_chunk = rows_per_chunk
+        self.progress = progress
+        self.done = 0
+        self.total = 0
+
+    def _prepare_styles(self):
+        from reportlab.lib import colors
+        from reportlab.lib.styles import ParagraphStyle
+        from reportlab.pdfbase.pdfmetrics import stringWidth
+        from reportlab.platypus import TableStyle
+
+        self.string_width = stringWidth
+        self.cell_style = ParagraphStyle(
+            'ReportCell', fontName='Helvetica', fontSize=PDF_FONT_SIZE, leading=PDF_FONT_SIZE + 1.5
+        )
+        # Cell padding is 3pt either side
+        self.text_widths = [width - 6 for width in self.column_widths]
+        self.table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), PDF_FONT_SIZE),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+            ('TOPPADDING', (0, 0), (-1, -1), 2),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
+        ])
+
+    def build_table(self, records, start, end):
+        """Table for records[start:end] with the header row"""
+        from reportlab.platypus import Paragraph, Table
+        from xml.sax.saxutils import escape
+
+        rows = [list(self.columns)]
+        for record in records[start:end]:
+            row = []
+            for column, text_width in zip(self.columns, self.text_widths):
+                text = str(record.get(column, '') or '')
+                if column == 'Website':
+                    # The scheme only costs width; long URLs are the slowest cells to wrap
+                    text = re.sub(r'^https?://(www\.)?', '', text).rstrip('/')
+                # Text that fits on one line stays a plain string, which is far
+                # cheaper to lay out than a wrapping Paragraph
+                if self.string_width(text, 'Helvetica', PDF_FONT_SIZE) > text_width:
+                    row.append(Paragraph(escape(text), self.cell_style))
+                else:
+                    row.append(text)
+            rows.append(row)
+        table = Table(rows, colWidths=self.column_widths, repeatRows=1)
+        table.setStyle(self.table_style)
+        return table
+
+    def advance(self, rows):
+        self.done = min(self.total, self.done + rows)
+        if self.progress:
+            self.progress(self.done, self.total)
+
+    def build(self, records):
+        from reportlab.lib.pagesizes import landscape, letter
+        from reportlab.lib.styles import getSampleStyleSheet
+        from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
+
+        self._prepare_styles()
+        self.done = 0
+        self.total = len(records)
+
+        doc = SimpleDocTemplate(
+            self.path, pagesize=landscape(letter),
+            leftMargin=PDF_MARGIN, rightMargin=PDF_MARGIN, topMargin=PDF_MARGIN, bottomMargin=PDF_MARGIN
+        )
+        styles = getSampleStyleSheet()
+        elements = [Paragraph("<br/>".join(self.title_lines), styles['Heading2']), Spacer(1, 12)]
+
+        chunk_class = _table_chunk_class()
+        for start in range(0, self.total, self.rows_per_chunk):
+            elements.append(chunk_class(self, records, start, min(start + self.rows_per_chunk, self.total)))
+        doc.build(elements)
+
+_geocode_lock = threading.Lock()
+_geocode_last = 0.0
+
+@functools.lru_cache(maxsize=256)
+def geocode_bbox(location):
+    """(south, west, north, east) of a place name from OpenStreetMap's Nominatim
+
+    Lookups are cached for the life of the process and spaced at least
+    GEOCODE_MIN_INTERVAL apart, as the public server's usage policy asks.
+    Pass an explicit bounding box to avoid the lookup altogether.
+    """
+    global _geocode_last
+    from urllib.parse import urlencode
+    from urllib.request import Request, urlopen
+
+    url = f"{GEOCODE_URL}?{urlencode({'q': location, 'format': 'json', 'limit': 1})}"
+    request = Request(url, headers={'User-Agent': GEOCODE_USER_AGENT})
+    with _geocode_lock:
+        delay = _geocode_last + GEOCODE_MIN_INTERVAL - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        try:
+            with urlopen(request, timeout=15) as response:
+                matches = json.load(response)
+        finally:
+            _geocode_last = time.monotonic()
+    if not matches:
+        raise ValueError(f"Could not find a bounding box for {location!r}")
+    south, north, west, east = (float(value) for value in matches[0]['boundingbox'])
+    return south, west, north, east
+
+def parse_bbox(text):
+    """'south,west,north,east' -> tuple of floats"""
+    values = [float(value) for value in text.split(',')]
+    if len(values) != 4 or values[0] >= values[2] or values[1] >= values[3]:
+        raise ValueError("Bounding box must be south,west,north,east")
+    return tuple(values)
+
+def viewport_zoom(south, west, north, east, viewport_px=TILE_VIEWPORT_PX):
+    """Largest zoom level at which the box still fits in the viewport"""
+    span = max(east - west, (north - south) / max(math.cos(math.radians((north + south) / 2)), 0.01))
+    zoom = math.log2(360 * viewport_px / (256 * max(span, 1e-6)))
+    return max(3, min(21, int(zoom)))
+
+def viewport_search_url(keyword, latitude, longitude, zoom):
+    """Maps search URL scoped to the viewport around a point"""
+    from urllib.parse import quote_plus
+
+    return f"{MAPS_URL}/search/{quote_plus(keyword)}/@{latitude:.6f},{longitude:.6f},{zoom}z"
+
+class TiledSearch:
+    """Cover a location with viewport-scoped searches on an adaptive grid
+
+    The bounding box is split into rows x cols tiles. Tiles are searched in
+    parallel, one pooled session per worker thread, and a tile whose feed
+    comes back (nearly) full is split into four smaller tiles, up to
+    max_depth times. Results are merged by place ID. stats() reports, per
+    refinement depth, how many new places tiles found and how many were
+    duplicates, and how much of the area was fully listed, which shows
+    whether further tiles still pay off. Tile searches are paced by a
+    RequestScheduler, and a blocked tile is retried on a fresh session.
+    """
+
+    def __init__(self, keyword, location, bbox, pool, workers=2, rows=3, cols=3, max_depth=2,
+                 dense_ratio=TILE_DENSE_RATIO, extractor_options=None, scheduler=None):
+        self.keyword = keyword
+        self.location = location
+        self.bbox = bbox
+        self.pool = pool
+        self.workers = max(1, workers)
+        self.rows = rows
+        self.cols = cols
+        self.max_depth = max_depth
+        self.dense_threshold = int(FEED_RESULT_CAP * dense_ratio)
+        self.extractor_options = extractor_options or {}
+        self.scheduler = scheduler or RequestScheduler()
+        self.attempts = {}
+        self.places = {}
+        self.tiles = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def initial_tiles(self):
+        south, west, north, east = self.bbox
+        lat_step = (north - south) / self.rows
+        lng_step = (east - west) / self.cols
+        return [
+            (south + row * lat_step, west + col * lng_step,
+             south + (row + 1) * lat_step, west + (col + 1) * lng_step, 0)
+            for row in range(self.rows) for col in range(self.cols)
+        ]
+
+    @staticmethod
+    def split(tile):
+        south, west, north, east, depth = tile
+        mid_lat = (south + north) / 2
+        mid_lng = (west + east) / 2
+        return [
+            (south, west, mid_lat, mid_lng, depth + 1), (south, mid_lng, mid_lat, east, depth + 1),
+            (mid_lat, west, north, mid_lng, depth + 1), (mid_lat, mid_lng, north, east, depth + 1),
+        ]
+
+    def _search_tile(self, extractor, tile):
+        south, west, north, east, _ = tile
+        extractor.results = []
+        if not extractor.driver and not extractor.setup_driver():
+            raise RuntimeError("Failed to initialize browser")
+        if not extractor.search_viewport(
+            self.keyword, (south + north) / 2, (west + east) / 2,
+            viewport_zoom(south, west, north, east), self.location
+        ):
+            raise BlockedError(extractor.blocked) if extractor.blocked else RuntimeError("Viewport search failed")
+        extractor.stream_results(FEED_RESULT_CAP)
+        return extractor.results
+
+    def _pace(self, session, extractor):
+        """Block until the scheduler lets this session search another tile"""
+        while not (self._stop.is_set() or extractor.cancelled):
+            delay = self.scheduler.acquire(session)
+            if delay <= 0:
+                return
+            self._stop.wait(min(delay, 1.0))
+
+    def _worker(self, work, max_results, progress):
+        extractor = GoogleMapsExtractor(pool=self.pool, **self.extractor_options)
+        session = threading.get_ident()
+        while True:
+            tile = work.get()
+            if tile is None:
+                work.task_done()
+                break
+            try:
+                self._pace(session, extractor)
+                if self._stop.is_set() or extractor.cancelled:
+                    continue
+                failed = False
+                try:
+                    records = self._search_tile(extractor, tile)
+                except BlockedError as e:
+                    # Discarding the session gives the retry a fresh profile
+                    failed = True
+                    records = []
+                    self.scheduler.record_block(e.kind)
+                    self.scheduler.reset_session(session)
+                    with self._lock:
+                        attempts = self.attempts[tile] = self.attempts.get(tile, 0) + 1
+                    if self.scheduler.should_retry(attempts):
+                        work.put(tile)
+                        continue
+                except Exception as e:
+                    failed = True
+                    records = []
+                    logging.warning(f"Tile {tile[:4]} failed: {e}")
+                finally:
+                    extractor.close_driver(discard=failed)
+                if not failed:
+                    self.scheduler.record_success()
+
+                with self._lock:
+                    new = 0
+                    for record in records:
+                        place_id = record.place_id if isinstance(record, BusinessRecord) else extract_place_id(record.get('Place URL', ''))
+                        if place_id and place_id not in self.places:
+                            self.places[place_id] = record
+                            new += 1
+                    dense = len(records) >= self.dense_threshold
+                    self.tiles.append({'tile': tile, 'results': len(records), 'new': new, 'dense': dense, 'failed': failed})
+                    found = len(self.places)
+                    if found >= max_results:
+                        self._stop.set()
+                if dense and tile[4] < self.max_depth and not self._stop.is_set():
+                    for child in self.split(tile):
+                        work.put(child)
+                logging.info(f"Tile depth {tile[4]}: {len(records)} results, {new} new, {found} unique so far")
+                if progress:
+                    progress(found, len(self.tiles))
+            finally:
+                work.task_done()
+
+    def run(self, max_results=1000, progress=None):
+        """Search every tile and return the merged records, renumbered
+
+        progress(unique_places, tiles_done) is called after each tile.
+        """
+        work = queue.Queue()
+        for tile in self.initial_tiles():
+            work.put(tile)
+        threads = [
+            threading.Thread(target=self._worker, args=(work, max_results, progress), daemon=True)
+            for _ in range(self.workers)
+        ]
+        for thread in threads:
+            thread.start()
+        # Dense tiles queue their children before finishing, so join() waits for them too
+        work.join()
+        for _ in threads:
+            work.put(None)
+        for thread in threads:
+            thread.join()
+
+        records = list(self.places.values())[:max_results]
+        for serial, record in enumerate(records, 1):
+            record['Sr No.'] = serial
+        return records
+
+    def stats(self):
+        """Coverage and duplicate rates overall and per refinement depth"""
+        south, west, north, east = self.bbox
+        area = (north - south) * (east - west)
+        by_depth = {}
+        covered = 0.0
+        for entry in self.tiles:
+            tile_south, tile_west, tile_north, tile_east, depth = entry['tile']
+            level = by_depth.setdefault(depth, {'tiles': 0, 'results': 0, 'new': 0, 'dense': 0})
+            level['tiles'] += 1
+            level['results'] += entry['results']
+            level['new'] += entry['new']
+            level['dense'] += 1 if entry['dense'] else 0
+            if not entry['dense'] and not entry['failed']:
+                # The feed listed everything in this tile
+                covered += (tile_north - tile_south) * (tile_east - tile_west)
+        for level in by_depth.values():
+            level['duplicate_rate'] = round(1 - level['new'] / level['results'], 3) if level['results'] else 0.0
+            level['new_per_tile'] = round(level['new'] / level['tiles'], 1)
+        results = sum(entry['results'] for entry in self.tiles)
+        return {
+            'tiles': len(self.tiles),
+            'results': results,
+            'unique_places': len(self.places),
+            'duplicate_rate': round(1 - len(self.places) / results, 3) if results else 0.0,
+            'fully_listed_area': round(covered / area, 3) if area else 0.0,
+            'blocks': self.scheduler.stats['blocks'],
+            'by_depth': dict(sorted(by_depth.items())),
+        }
+
+class DetailEnricher:
+    """Visit place pages concurrently to fill in Phone, Website and other details
+
+    Each worker thread borrows one session from the pool and works through a
+    shared queue of place URLs, so at most `concurrency` pages load at once.
+    Results are merged back into the records by place ID; `done` counts the
+    places visited so far in the current run.
+    """
+
+    def __init__(self, pool, concurrency=4, place_timeout=15, poll_interval=0.25, cancel_token=None):
+        self.pool = pool
+        self.concurrency = max(1, concurrency)
+        self.place_timeout = place_timeout
+        self.poll_interval = poll_interval
+        self.cancel_token = cancel_token
+        self.done = 0
+
+    def _fetch(self, waits, url):
+        waits.driver.get(url)
+        return waits.wait_for(
+            'place_details', lambda driver: driver.execute_script(PLACE_DETAILS_JS)
+        )
+
+    def _worker(self, work, details, lock, progress, total):
+        try:
+            driver = self.pool.acquire()
+        except Exception as e:
+            logging.error(f"Enrichment worker could not get a browser: {e}")
+            return
+
+        failed = False
+        try:
+            driver.set_page_load_timeout(self.place_timeout)
+            waits = WaitEngine(driver, self.place_timeout, self.poll_interval, self.cancel_token)
+            while not (self.cancel_token and self.cancel_token.cancelled):
+                try:
+                    place_id, url = work.get_nowait()
+                except queue.Empty:
+                    break
+                try:
+                    result = self._fetch(waits, url)
+                except Exception as e:
+                    logging.warning(f"Could not read details for {url}: {e}")
+                    result = None
+                with lock:
+                    if result:
+                        details[place_id] = result
+                    self.done += 1
+                    done = self.done
+                if progress:
+                    progress(done, total)
+        except Exception as e:
+            failed = True
+            logging.error(f"Enrichment worker failed: {e}")
+        finally:
+            self.pool.release(driver, discard=failed)
+
+    def enrich(self, records, skip=None, progress=None):
+        """Fill detail fields into records in place; returns enrichment stats
+
+        skip(record) returning True leaves a record untouched (for example
+        because its details are still fresh). progress(done, total) is called
+        after each place.
+        """
+        targets = {}
+        for record in records:
+            url = record.get('Place URL')
+            if not url or (skip and skip(record)):
+                continue
+            targets.setdefault(extract_place_id(url), url)
+
+        work = queue.Queue()
+        for place_id, url in targets.items():
+            work.put((place_id, url))
+
+        details = {}
+        lock = threading.Lock()
+        self.done = 0
+        start = time.perf_counter()
+        threads = [
+            threading.Thread(
+                target=self._worker, args=(work, details, lock, progress, len(targets)), daemon=True
+            )
+            for _ in range(min(self.concurrency, len(targets)))
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        for record in records:
+            record.setdefault('Plus Code', '')
+            record.setdefault('Hours', '')
+            found = details.get(extract_place_id(record.get('Place URL', '')))
+            if not found:
+                continue
+            record['Phone'] = found['phone'] or record.get('Phone', '')
+            record['Website'] = found['website'] or record.get('Website', '')
+            record['Address'] = found['address'] or record.get('Address', '')
+            record['Plus Code'] = found['plus_code']
+            record['Hours'] = found['hours']
+
+        stats = {
+            'targets': len(targets),
+            'enriched': len(details),
+            'failed': len(targets) - len(details),
+            'seconds': round(elapsed, 2),
+            'places_per_minute': round(len(details) / (elapsed / 60), 1) if elapsed > 0 else 0.0,
+        }
+        logging.info(
+            f"Enriched {stats['enriched']}/{stats['targets']} places in {stats['seconds']}s "
+            f"({stats['places_per_minute']} places/min)"
+        )
+        return stats
+
+def resource_path(relative_path):
+    try:
+        base_path = sys._MEIPASS
+    except Exception:
+        base_path = os.path.abspath(".")
+    return os.path.join(base_path, relative_path)
+
+class GoogleMapsExtractor:
+    def __init__(self, wait_timeout=10, poll_interval=0.25, scroll_timeout=3, headless=False, pool=None,
+                 store=None, refresh_ttl=None, lean=False, checkpoint_dir=None, maps_url=MAPS_URL,
+                 extraction_mode='dom', payload_dir=None, cancel_token=None):
+        self.driver = None
+        self.maps_url = maps_url
+        self.pool = pool
+        self.store = store
+        self.refresh_ttl = refresh_ttl
+        self._maps_ready = False
+        self.waits = None
+        self.results = []
+        self.current_keyword = ""
+        self.current_location = ""
+        self.total_businesses_scraped = 0
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self.scroll_timeout = scroll_timeout
+        self.headless = headless
+        self.time_to_first_result = None
+        self.lean = lean
+        self.network = None
+        self.extraction_mode = extraction_mode
+        self.payload_dir = payload_dir
+        self.payloads = None
+        self.search_metrics = []
+        self._current_search = None
+        self._open_seconds = 0.0
+        self.checkpoint_dir = checkpoint_dir
+        self.cancel_token = cancel_token or CancelToken()
+        self.blocked = None
+        self.feed_depth = 0
+        self.round_trips = RoundTripCounter()
+        self.metrics = PhaseMetrics(
+            round_trips=lambda: self.round_trips.count, results=lambda: self.total_businesses_scraped
+        )
+        
+    @instrumented('setup_driver')
+    def setup_driver(self):
+        """Initialize Chrome driver, borrowing a warm session from the pool if set"""
+        try:
+            if self.pool:
+                if self.performance_log and not self.pool.performance_log:
+                    raise RuntimeError("This run reads network traffic, but the pool's sessions do not log it")
+                self.driver = self.pool.acquire()
+                self._maps_ready = True
+                logging.info("Borrowed Chrome session from pool")
+            else:
+                self.driver = create_chrome_driver(self.headless, self.lean, self.performance_log)
+                logging.info("Chrome driver initialized with webdriver-manager")
+            
+            self.waits = WaitEngine(self.driver, self.wait_timeout, self.poll_interval, self.cancel_token)
+            self.network = NetworkMeter(self.driver) if self.performance_log else None
+            if self.extraction_mode == 'network':
+                self.payloads = PayloadCapture(self.driver, self.network, self.payload_dir)
+            self.round_trips.attach(self.driver)
+            return True
+        except Exception as e:
+            logging.error(f"Failed to initialize driver: {e}")
+            return False
+
+    @property
+    def cancelled(self):
+        """True once the current run has been asked to stop"""
+        return self.cancel_token.cancelled
+
+    @property
+    def performance_log(self):
+        """Whether this run's sessions need Chrome's performance log
+
+        Lean runs meter their traffic to show what blocking saves, and
+        network extraction reads place payloads from it.
+        """
+        return self.lean or self.extraction_mode == 'network'
+
+    @instrumented('open_google_maps')
+    def open_google_maps(self):
+        """Open Google Maps in the browser"""
+        try:
+            # Pooled sessions are handed out already on the Maps home page
+            start = time.perf_counter()
+            if not self._maps_ready:
+                self.driver.get(self.maps_url)
+            self._maps_ready = False
+            self._open_seconds = time.perf_counter() - start
+            logging.info("Opened Google Maps")
+            self.blocked = None
+            for _ in range(2):
+                self.waits.wait_for('maps_loaded', EC.any_of(
+                    EC.presence_of_element_located((By.ID, "searchboxinput")),
+                    lambda driver: driver.execute_script(BLOCK_CHECK_JS)
+                ))
+                # A dismissed consent page leads on to Maps, so wait once more
+                if self.check_blocked() != 'dismissed':
+                    break
+            return not self.blocked
+        except Exception as e:
+            logging.error(f"Failed to open Google Maps: {e}")
+            return False
+
+    @instrumented('search_businesses')
+    def search_businesses(self, keyword, location):
+        """Search for businesses on Google Maps"""
+        if self.cancelled:
+            return False
+        try:
+            self.current_keyword = keyword
+            self.current_location = location
+            
+            # Find search box
+            search_box = self.waits.wait_for(
+                'search_box', EC.presence_of_element_located((By.ID, "searchboxinput"))
+            )
+            if search_box is None:
+                if not self.cancelled:
+                    logging.error("Search failed: the search box did not appear")
+                return False
+            search_box.clear()
+            if self.payloads:
+                self.payloads.reset()
+            
+            # Enter search query
+            search_query = f"{keyword} in {location}"
+            search_box.send_keys(search_query)
+            search_box.send_keys(Keys.RETURN)
+            
+            logging.info(f"Searching for: {search_query}")
+            self._await_search_results(search_query, time.perf_counter())
+            return True
+            
+        except Exception as e:
+            logging.error(f"Search failed: {e}")
+            return False
+
+    @instrumented('search_viewport')
+    def search_viewport(self, keyword, latitude, longitude, zoom, location=""):
+        """Search for keyword only within the map viewport centred on a point
+
+        Used for geographic tiles; the URL sets the viewport, so no "in
+        location" text is needed.
+        """
+        try:
+            self.current_keyword = keyword
+            self.current_location = location
+            search_query = f"{keyword} @{latitude:.5f},{longitude:.5f},{zoom}z"
+            if self.payloads:
+                self.payloads.reset()
+            start = time.perf_counter()
+            self.driver.get(viewport_search_url(keyword, latitude, longitude, zoom))
+            self._maps_ready = False
+            logging.info(f"Searching for: {search_query}")
+            self._await_search_results(search_query, start)
+            return True
+        except Exception as e:
+            logging.error(f"Viewport search failed: {e}")
+            return False
+
+    def check_blocked(self):
+        """Look for Google's CAPTCHA or consent interstitial on the current page
+
+        A consent page is dismissed ("Reject all") and 'dismissed' returned.
+        Otherwise the kind of page ('captcha' or 'consent') is stored in
+        self.blocked and returned, or None if Maps is showing.
+        """
+        try:
+            kind = self.driver.execute_script(BLOCK_CHECK_JS)
+            if kind == 'consent' and self.driver.execute_script(DISMISS_CONSENT_JS):
+                logging.info("Dismissed Google consent page")
+                self.waits.wait_for('consent_dismissed', lambda driver: not driver.execute_script(BLOCK_CHECK_JS))
+                return 'dismissed'
+        except Exception as e:
+            logging.debug(f"Block check failed: {e}")
+            return None
+        if kind:
+            logging.warning(f"Google showed a {kind} page instead of Maps")
+        self.blocked = kind
+        return kind
+
+    def _await_search_results(self, search_query, start):
+        """Wait for a submitted search to render and start its traffic metrics
+
+        Raises BlockedError if Google answers with a CAPTCHA or consent page.
+        """
+        open_traffic = self.network.drain() if self.network else None
+
+        # A list search renders the feed; a unique match opens the place page
+        for _ in range(2):
+            self.waits.wait_for('search_results', EC.any_of(
+                EC.presence_of_element_located((By.XPATH, FEED_XPATH)),
+                EC.url_contains('/maps/place/'),
+                lambda driver: driver.execute_script(BLOCK_CHECK_JS)
+            ))
+            blocked = self.check_blocked()
+            if blocked != 'dismissed':
+                break
+        if self.blocked:
+            raise BlockedError(self.blocked)
+        self.waits.spinner_gone()
+
+        self._current_search = {
+            'query': search_query,
+            'profile': 'lean' if self.lean else 'default',
+            'page_load_seconds': round(self._open_seconds + time.perf_counter() - start, 2),
+        }
+        if self.network:
+            traffic = self.network.drain()
+            for key in ('bytes', 'requests', 'blocked'):
+                self._current_search[key] = open_traffic[key] + traffic[key]
+        self.search_metrics.append(self._current_search)
+
+    def record_feed_fixture(self, path):
+        """Save the HTML of every card in the current feed as a JSON list
+
+        The file can be served by FeedFixtureServer to benchmark against
+        real markup offline.
+        """
+        cards = self.driver.execute_script(RECORD_CARDS_JS, CARD_XPATH) or []
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(cards, f)
+        logging.info(f"Recorded {len(cards)} cards to {path}")
+        return len(cards)
+
+    def install_feed_observer(self):
+        """Inject the in-page feed observer; returns the current place count"""
+        return self.driver.execute_script(FEED_OBSERVER_JS, FEED_XPATH)
+
+    def feed_state(self):
+        """Return the observer's {'count', 'ended'} in one cheap round trip"""
+        return self.driver.execute_script(FEED_STATE_JS) or {'count': 0, 'ended': False}
+
+    def feed_place_urls(self, start=0):
+        """Return deduplicated place URLs seen by the observer, from index start"""
+        return self.driver.execute_script(FEED_URLS_JS, start) or []
+
+    def _scroll_feed(self, results_pane, loaded_results):
+        """Scroll the feed once and wait for the observer to report new places
+
+        Returns the new feed state, or None if nothing more loaded.
+        """
+        self.driver.execute_script(
+            "arguments[0].scrollTop = arguments[0].scrollHeight", results_pane
+        )
+        new_state = self.waits.result_count_changed(loaded_results, self.scroll_timeout)
+        
+        # Check for "Show more" button
+        if new_state is None:
+            try:
+                if self.driver.execute_script(CLICK_SHOW_MORE_JS, SHOW_MORE_XPATH):
+                    new_state = self.waits.result_count_changed(loaded_results, self.scroll_timeout)
+            except Exception:
+                pass
+        return new_state
+
+    @instrumented('scroll_and_load')
+    def scroll_and_load(self, max_results=100):
+        """Scroll through results to load more businesses"""
+        try:
+            results_pane = self.waits.feed_present()
+            if results_pane is None:
+                if not self.cancelled:
+                    logging.error("Scrolling failed: the results feed did not appear")
+                return False
+            
+            self.install_feed_observer()
+            state = self.feed_state()
+            loaded_results = state['count']
+            scroll_attempts = 0
+            max_scroll_attempts = 20
+            
+            while loaded_results < max_results and not state['ended'] and scroll_attempts < max_scroll_attempts:
+                if self.cancelled:
+                    logging.info(f"Scrolling cancelled at {loaded_results} results")
+                    break
+                new_state = self._scroll_feed(results_pane, loaded_results)
+                if new_state is None:
+                    scroll_attempts += 1
+                    if scroll_attempts >= 3:
+                        break
+                    continue
+                
+                scroll_attempts = 0
+                state = new_state
+                loaded_results = state['count']
+                logging.info(f"Loaded {loaded_results} results so far...")
+            
+            if state['ended']:
+                logging.info("Reached the end of the results list")
+            return True
+            
+        except Exception as e:
+            logging.error(f"Scrolling failed: {e}")
+            return False
+
+    def _build_business_data(self, raw, serial=None):
+        """Map raw card fields onto the business_data schema"""
+        return BusinessRecord(
+            serial=serial if serial is not None else len(self.results) + 1,
+            name=(raw.get('name') or '').strip(),
+            address=(raw.get('address') or '').strip(),
+            rating=parse_rating(raw.get('rating') or ''),
+            reviews=parse_review_count(raw.get('reviews') or ''),
+            category=self.current_keyword,
+            location=self.current_location,
+            scraped_date=datetime.now().strftime("%Y-%m-%d"),
+            place_url=(raw.get('url') or '').split('?')[0]
+        )
+
+    def _build_payload_record(self, place, serial=None):
+        """Map a place parsed from a network payload onto the business_data schema"""
+        return BusinessRecord(
+            serial=serial if serial is not None else len(self.results) + 1,
+            name=place['name'],
+            address=place['address'],
+            phone=place['phone'],
+            website=place['website'],
+            rating=float(place['rating']) if isinstance(place['rating'], (int, float)) else None,
+            reviews=int(place['reviews']) if isinstance(place['reviews'], (int, float)) else None,
+            category=self.current_keyword,
+            location=self.current_location,
+            scraped_date=datetime.now().strftime("%Y-%m-%d"),
+            place_url=place['url'],
+            latitude=place['latitude'],
+            longitude=place['longitude'],
+        )
+
+    def _payload_places(self):
+        """Places from search responses captured since the last call, in network mode
+
+        None when there are none (e.g. results embedded in a page Chrome no
+        longer buffers), so the caller reads DOM cards instead; a payload that
+        cannot be parsed switches the extractor back to the DOM for good.
+        """
+        if self.payloads is None:
+            return None
+        try:
+            places = self.payloads.places()
+        except ValueError as e:
+            logging.warning(f"Could not parse Maps payloads, falling back to DOM extraction: {e}")
+            self.payloads = None
+            return None
+        self.metrics.selector('payload_places', bool(places))
+        return places or None
+
+    def _new_businesses(self):
+        """Businesses loaded since the previous pass, from payloads or DOM cards"""
+        places = self._payload_places()
+        if places:
+            return [self._build_payload_record(place) for place in places]
+        return [self._build_business_data(raw) for raw in self._extract_cards_bulk(only_new=True)]
+
+    def _find_business_cards(self):
+        """Find all business card elements in the results feed"""
+        business_cards = self.driver.find_elements(By.XPATH, CARD_XPATH)
+        self.metrics.selector('cards', bool(business_cards))
+        if not business_cards:
+            business_cards = self.driver.find_elements(By.XPATH, CARD_FALLBACK_XPATH)
+            self.metrics.selector('cards_fallback', bool(business_cards))
+        return business_cards
+
+    def _count_selector_hits(self, raw_records):
+        """Count which card fields each selector found"""
+        for raw in raw_records:
+            for field, value in raw.items():
+                self.metrics.selector(field, bool(value))
+
+    def _extract_card_fields(self, card):
+        """Read raw fields from one card, one WebDriver call per field"""
+        raw = {'name': '', 'rating': '', 'reviews': '', 'address': '', 'url': ''}
+        lookups = [
+            ('name', NAME_XPATH, None),
+            ('rating', RATING_XPATH, 'aria-label'),
+            ('reviews', REVIEWS_XPATH, None),
+            ('address', ADDRESS_XPATH, None),
+            ('url', PLACE_LINK_XPATH, 'href'),
+        ]
+        for field, xpath, attribute in lookups:
+            # find_elements returns [] on a miss instead of raising, and with
+            # the implicit wait disabled a missing field no longer stalls
+            elements = card.find_elements(By.XPATH, xpath)
+            if not elements:
+                continue
+            if attribute:
+                raw[field] = elements[0].get_attribute(attribute) or ''
+            else:
+                raw[field] = elements[0].text
+        return raw
+
+    def _extract_cards_bulk(self, only_new=False):
+        """Read every business card in a single execute_script round trip"""
+        records = self.driver.execute_script(BULK_EXTRACT_JS, {
+            'cards': CARD_XPATH,
+            'fallback': CARD_FALLBACK_XPATH,
+            'name': NAME_XPATH,
+            'rating': RATING_XPATH,
+            'reviews': REVIEWS_XPATH,
+            'address': ADDRESS_XPATH,
+            'link': PLACE_LINK_XPATH,
+        }, only_new)
+        self._count_selector_hits(records or [])
+        return records or []
+
+    def _extract_cards_per_element(self):
+        """Read every business card with per-field find_element calls"""
+        records = []
+        business_cards = self._find_business_cards()
+        logging.info(f"Found {len(business_cards)} business cards")
+
+        self.driver.implicitly_wait(0)
+        try:
+            for index, card in enumerate(business_cards):
+                if self.cancelled:
+                    break
+                try:
+                    records.append(self._extract_card_fields(card))
+                except Exception as e:
+                    logging.warning(f"Error extracting data from card {index}: {e}")
+        finally:
+            self.driver.implicitly_wait(IMPLICIT_WAIT_SECONDS)
+        self._count_selector_hits(records)
+        return records
+
+    def iter_businesses(self, max_results=100, seen=None, skip_to=0):
+        """Yield business_data dicts as cards load while the feed is scrolled
+
+        Each pass reads only cards not returned before, in one round trip (or,
+        in network mode, the places of newly captured search responses), and
+        records are deduplicated by place ID. Keys already in `seen` are
+        skipped, and with skip_to the feed is first scrolled to that many
+        results without reading cards, as when resuming from a checkpoint.
+        Stops between passes once the run is cancelled; raises RuntimeError
+        if the feed never appears.
+        """
+        seen = set() if seen is None else seen
+        if len(seen) >= max_results or self.cancelled:
+            return
+        results_pane = self.waits.feed_present()
+        if results_pane is None:
+            if self.cancelled:
+                return
+            raise RuntimeError("The results feed did not appear")
+        self.install_feed_observer()
+        
+        loaded_results = self.feed_state()['count']
+        scroll_attempts = 0
+        
+        if skip_to > loaded_results:
+            logging.info(f"Scrolling back to {skip_to} results before extracting")
+        while loaded_results < skip_to and scroll_attempts < 3 and not self.cancelled:
+            state = self._scroll_feed(results_pane, loaded_results)
+            if state is None:
+                scroll_attempts += 1
+                continue
+            scroll_attempts = 0
+            loaded_results = state['count']
+            if state['ended']:
+                break
+        scroll_attempts = 0
+        self.feed_depth = loaded_results
+        
+        while True:
+            for business in self._new_businesses():
+                key = business_key(business)
+                if not business['Business Name'] or key in seen:
+                    continue
+                business['Sr No.'] = len(seen) + 1
+                seen.add(key)
+                yield business
+                if len(seen) >= max_results:
+                    return
+            
+            if self.cancelled:
+                logging.info(f"Extraction cancelled after {len(seen)} results")
+                return
+            state = self._scroll_feed(results_pane, loaded_results)
+            if state is None:
+                scroll_attempts += 1
+                if scroll_attempts >= 3:
+                    return
+                continue
+            
+            scroll_attempts = 0
+            loaded_results = state['count']
+            self.feed_depth = loaded_results
+            logging.info(f"Loaded {loaded_results} results so far...")
+            if state['ended']:
+                # One more pass picks up the cards that came with the end marker
+                logging.info("Reached the end of the results list")
+                for business in self._new_businesses():
+                    key = business_key(business)
+                    if business['Business Name'] and key not in seen and len(seen) < max_results:
+                        business['Sr No.'] = len(seen) + 1
+                        seen.add(key)
+                        yield business
+                return
+
+    def open_checkpoint(self, keyword, location, max_results, resume=True):
+        """Checkpoint journal for a query in checkpoint_dir
+
+        With resume=True an unfinished earlier run of the query is picked up.
+        """
+        return CheckpointJournal.for_query(
+            self.checkpoint_dir or CHECKPOINT_DIR, keyword, location, max_results, resume
+        )
+
+    @instrumented('stream_results')
+    def stream_results(self, max_results=100, sinks=None, keep_results=True, checkpoint=None):
+        """Extract while scrolling and push each record to sinks right away
+
+        With keep_results=False nothing is held in self.results, so memory
+        stays flat however many records the run produces. With a checkpoint
+        journal, records are journaled as they arrive; records it recovered
+        from an interrupted run are replayed through the sinks (all but the
+        journal, which already has them) and their places are skipped. A
+        cancelled run keeps what it extracted and leaves its checkpoint
+        unfinished, so it can be resumed. Returns the number of records,
+        recovered ones included.
+        """
+        sinks = list(sinks or [])
+        if self.store:
+            sinks.insert(0, StoreSink(self.store))
+            run_id = self.store.begin_run(self.current_keyword, self.current_location)
+        if keep_results:
+            sinks.insert(0, ListSink(self.results))
+        
+        seen = set()
+        skip_to = 0
+        if checkpoint:
+            recovered = checkpoint.state['records']
+            for record in recovered:
+                for sink in sinks:
+                    sink.write(record)
+            self.total_businesses_scraped += len(recovered)
+            seen = {business_key(record) for record in recovered}
+            skip_to = checkpoint.state['depth']
+            sinks.append(JournalSink(checkpoint, lambda: self.feed_depth))
+        
+        count = len(seen)
+        completed = False
+        start = time.perf_counter()
+        self.time_to_first_result = None
+        try:
+            for business in self.iter_businesses(max_results, seen, skip_to):
+                if self.time_to_first_result is None:
+                    self.time_to_first_result = time.perf_counter() - start
+                    logging.info(f"First result after {self.time_to_first_result:.2f}s")
+                for sink in sinks:
+                    sink.write(business)
+                count += 1
+                self.total_businesses_scraped += 1
+            completed = not self.cancelled
+        finally:
+            for sink in sinks:
+                sink.close()
+            if checkpoint and completed:
+                checkpoint.finish(count)
+            elif checkpoint:
+                checkpoint.close()
+            if self.store:
+                self.store.finish_run(run_id, count)
+            self._finish_search_metrics()
+        
+        logging.info(f"Successfully extracted {count} businesses")
+        return count
+
+    def _finish_search_metrics(self):
+        """Add scrolling traffic to the current search's metrics and log them"""
+        metrics = self._current_search
+        if not metrics:
+            return
+        self._current_search = None
+        if not self.network:
+            logging.info(f"[{metrics['profile']}] {metrics['query']}: page load {metrics['page_load_seconds']:.2f}s")
+            return
+        traffic = self.network.drain()
+        for key in ('bytes', 'requests', 'blocked'):
+            metrics[key] += traffic[key]
+        logging.info(
+            f"[{metrics['profile']}] {metrics['query']}: {metrics['bytes'] / 1024:.0f} KB over "
+            f"{metrics['requests']} requests ({metrics['blocked']} blocked), "
+            f"page load {metrics['page_load_seconds']:.2f}s"
+        )
+
+    def needs_refresh(self, record):
+        """False if the store refreshed this place's details within refresh_ttl
+
+        Detail work for such places can be skipped.
+        """
+        if not self.store or not self.refresh_ttl:
+            return True
+        place_id = extract_place_id(record.get('Place URL', ''))
+        return not (place_id and self.store.is_fresh(place_id, self.refresh_ttl))
+
+    @instrumented('enrich_details')
+    def enrich_details(self, records=None, concurrency=4, place_timeout=15, pool=None, progress=None):
+        """Read Phone, Website, full address, plus code and hours from place pages
+
+        Uses the given pool, or a temporary headless pool of `concurrency`
+        sessions. Places refreshed within refresh_ttl are skipped. Returns the
+        enrichment stats, including places per minute.
+        """
+        records = self.results if records is None else records
+        own_pool = pool is None
+        if own_pool:
+            pool = DriverPool(size=concurrency, headless=True)
+        try:
+            enricher = DetailEnricher(pool, concurrency, place_timeout, self.poll_interval, self.cancel_token)
+            skip = lambda record: not self.needs_refresh(record)
+            stats = enricher.enrich(records, skip=skip, progress=progress)
+        finally:
+            if own_pool:
+                pool.close()
+
+        if self.store:
+            for record in records:
+                if record.get('Phone') or record.get('Website'):
+                    self.store.upsert(record, details=True)
+        return stats
+
+    @instrumented('extract_business_data')
+    def extract_business_data(self, bulk=True):
+        """Extract data from each business listing
+
+        With bulk=True every card is read in one execute_script call; the
+        per-element path is kept as a fallback if the script fails. In
+        network mode captured search responses are used when there are any.
+        Once the run is cancelled no further cards are read.
+        """
+        try:
+            # Wait for results to load
+            self.waits.feed_present()
+            self.waits.network_idle(timeout=self.scroll_timeout)
+
+            places = self._payload_places()
+            if places:
+                seen = set()
+                for place in places:
+                    business_data = self._build_payload_record(place)
+                    if business_data['Business Name'] and business_key(business_data) not in seen:
+                        seen.add(business_key(business_data))
+                        self.results.append(business_data)
+                        self.total_businesses_scraped += 1
+                logging.info(f"Successfully extracted {len(self.results)} businesses from network payloads")
+                self._finish_search_metrics()
+                return True
+
+            raw_records = None
+            if self.cancelled:
+                raw_records = []
+            elif bulk:
+                try:
+                    raw_records = self._extract_cards_bulk()
+                    logging.info(f"Found {len(raw_records)} business cards")
+                except Exception as e:
+                    logging.warning(f"Bulk extraction failed, falling back to per-card reads: {e}")
+
+            if raw_records is None:
+                raw_records = self._extract_cards_per_element()
+
+            for raw in raw_records:
+                business_data = self._build_business_data(raw)
+
+                # Only save if we have at least a business name
+                if business_data['Business Name']:
+                    self.results.append(business_data)
+                    self.total_businesses_scraped += 1
+
+            logging.info(f"Successfully extracted {len(self.results)} businesses")
+            self._finish_search_metrics()
+            return True
+
+        except Exception as e:
+            logging.error(f"Data extraction failed: {e}")
+            return False
+
+    @instrumented('save_excel')
+    def save_to_excel(self, filename, records=None, append=False):
+        """Save results (or the given records) to Excel file
+
+        Rows are streamed into a formatted sheet named after the keyword and
+        location; append=True adds that sheet to an existing workbook.
+        """
+        try:
+            records = self.results if records is None else records
+            if not records:
+                return False, "No data to save"
+            
+            writer = ExcelStreamWriter(
+                filename, excel_sheet_name(self.current_keyword, self.current_location), append=append
+            )
+            for record in records:
+                writer.write(record)
+            writer.close()
+            logging.info(f"Data saved to {filename}")
+            return True, f"Data saved successfully to {filename}"
+            
+        except Exception as e:
+            logging.error(f"Failed to save Excel: {e}")
+            return False, f"Error saving file: {str(e)}"
+
+    @instrumented('save_pdf')
+    def save_to_pdf(self, filename, records=None, progress=None):
+        """Save results (or the given records) to PDF file
+
+        progress(done, total) is called as rows are laid out.
+        """
+        try:
+            records = self.results if records is None else records
+            if not records:
+                return False, "No data to save"
+            
+            from xml.sax.saxutils import escape
+            
+            # Title
+            title_lines = [
+                "Google Maps Business Extraction Report",
+                f"Keyword: {escape(self.current_keyword)}",
+                f"Location: {escape(self.current_location)}",
+                f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+                f"Total Businesses: {len(records)}",
+            ]
+            PdfReportWriter(filename, title_lines, progress=progress).build(records)
+            
+            logging.info(f"PDF saved to {filename}")
+            return True, f"PDF saved successfully to {filename}"
+            
+        except Exception as e:
+            logging.error(f"Failed to save PDF: {e}")
+            return False, f"Error saving PDF: {str(e)}"
+
+    @instrumented('save_file')
+    def save_to_file(self, filename, file_format=None, records=None, append=False, compression=None):
+        """Save results (or the given records) in any of EXPORT_FORMATS
+
+        The format is guessed from the filename when not given. Returns
+        (success, message) like save_to_excel and save_to_pdf.
+        """
+        file_format = file_format or export_format_for(filename)
+        if compression is None and filename.lower().endswith('.gz'):
+            compression = 'gzip'
+        if file_format == 'pdf':
+            return self.save_to_pdf(filename, records)
+        try:
+            records = self.results if records is None else records
+            if not records:
+                return False, "No data to save"
+            
+            sink = create_exporter(
+                file_format, filename, excel_sheet_name(self.current_keyword, self.current_location),
+                append=append, compression=compression
+            )
+            try:
+                for record in records:
+                    sink.write(record)
+            finally:
+                sink.close()
+            logging.info(f"{file_format.upper()} data saved to {filename}")
+            return True, f"Data saved successfully to {filename}"
+            
+        except Exception as e:
+            logging.error(f"Failed to save {file_format}: {e}")
+            return False, f"Error saving file: {str(e)}"
+
+    def search_tiled(self, keyword, location, max_results=1000, bbox=None, workers=2, rows=3, cols=3,
+                     max_depth=2, progress=None, scheduler=None):
+        """Collect more than one feed's worth of places by tiling the area
+
+        bbox is (south, west, north, east); by default it is looked up from
+        the location name. Tiles run on a temporary headless pool of
+        `workers` sessions. Results replace self.results; returns the
+        tiling stats.
+        """
+        bbox = bbox or geocode_bbox(location)
+        pool = DriverPool(size=workers, headless=True, lean=self.lean, performance_log=self.performance_log)
+        try:
+            tiled = TiledSearch(
+                keyword, location, bbox, pool, workers, rows, cols, max_depth,
+                extractor_options={'wait_timeout': self.wait_timeout, 'poll_interval': self.poll_interval,
+                                   'scroll_timeout': self.scroll_timeout, 'lean': self.lean,
+                                   'extraction_mode': self.extraction_mode, 'payload_dir': self.payload_dir,
+                                   'cancel_token': self.cancel_token},
+                scheduler=scheduler
+            )
+            records = tiled.run(max_results, progress)
+        finally:
+            pool.close()
+
+        self.current_keyword = keyword
+        self.current_location = location
+        self.results = records
+        self.total_businesses_scraped = len(records)
+        if self.store:
+            for record in records:
+                self.store.upsert(record)
+        stats = tiled.stats()
+        logging.info(
+            f"Tiled search: {stats['tiles']} tiles, {stats['unique_places']} unique places, "
+            f"duplicate rate {stats['duplicate_rate']:.0%}, {stats['fully_listed_area']:.0%} of the area fully listed"
+        )
+        return stats
+
+    def postprocess(self, records=None, **options):
+        """Normalize, dedupe and filter results (or the given records) for export
+
+        Options go to postprocess_records. Returns the cleaned record dicts.
+        """
+        records = self.results if records is None else records
+        cleaned, stats = postprocess_records(records, **options)
+        logging.info(
+            f"Post-processed {stats['rows']} records: {stats['phones_e164']} E.164 phones, "
+            f"{stats['duplicates']} near-duplicates, {stats['kept']} kept"
+        )
+        return cleaned
+
+    def run_query(self, keyword, location, max_results=100):
+        """Run one search on the current driver and return its results
+
+        Raises RuntimeError if Maps cannot be opened or the search fails,
+        BlockedError if Google blocked it.
+        """
+        self.results = []
+        self.total_businesses_scraped = 0
+
+        if not self.open_google_maps():
+            raise BlockedError(self.blocked) if self.blocked else RuntimeError("Failed to open Google Maps")
+        if not self.search_businesses(keyword, location):
+            raise BlockedError(self.blocked) if self.blocked else RuntimeError("Search failed")
+        checkpoint = self.open_checkpoint(keyword, location, max_results) if self.checkpoint_dir else None
+        self.stream_results(max_results, checkpoint=checkpoint)
+        return self.results
+
+    def write_metrics(self, directory=METRICS_DIR, name="metrics"):
+        """Write the phase metrics as <name>.json (trace) and <name>.prom under directory"""
+        try:
+            self.metrics.write_trace(os.path.join(directory, f"{name}.json"))
+            self.metrics.write_prometheus(os.path.join(directory, f"{name}.prom"))
+        except OSError as e:
+            logging.error(f"Failed to write metrics: {e}")
+
+    def wait_summary(self):
+        """Return per-wait timing totals for the current session"""
+        return self.waits.summary() if self.waits else {}
+
+    def log_wait_summary(self):
+        """Log where wall-clock time went while waiting on the page"""
+        for name, entry in self.wait_summary().items():
+            logging.info(
+                f"Wait {name}: {entry['count']}x, total {entry['total_seconds']:.2f}s, "
+                f"max {entry['max_seconds']:.2f}s, timeouts {entry['timeouts']}"
+            )
+
+    def close_driver(self, discard=False):
+        """Close the browser driver, or hand it back to the pool"""
+        if self.driver:
+            if self.pool:
+                self.pool.release(self.driver, discard=discard)
+                logging.info("Browser session returned to pool")
+            else:
+                self.driver.quit()
+                logging.info("Browser closed")
+            self.driver = None
+            self._maps_ready = False
+
+    def abort_driver(self):
+        """Quit the browser from another thread to unblock a hung WebDriver call
+
+        Last resort for a stop that did not land in time; the worker still
+        runs its own close_driver(discard=True) once the call fails.
+        """
+        driver = self.driver
+        if driver:
+            logging.warning("Worker did not stop in time; quitting its browser")
+            threading.Thread(target=driver.quit, daemon=True).start()
+
+class UiEventQueue:
+    """Hand GUI updates from worker threads to the Tk main loop
+
+    Tk widgets may only be touched from the thread running mainloop, so
+    workers post() events here and the GUI drains them in batches from
+    root.after. Each event carries the time it was posted.
+    """
+
+    def __init__(self, max_batch=GUI_EVENTS_PER_TICK):
+        self.events = queue.SimpleQueue()
+        self.max_batch = max_batch
+
+    def post(self, kind, *args):
+        self.events.put((kind, time.perf_counter(), args))
+
+    def drain(self):
+        """Up to max_batch pending events, oldest first"""
+        batch = []
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(self.events.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+class ProgressEstimator:
+    """Rate and ETA of a run from (time, done) samples over a sliding window"""
+
+    def __init__(self, window=ETA_WINDOW_SECONDS):
+        self.window = window
+        self.samples = deque()
+
+    def reset(self):
+        self.samples.clear()
+
+    def update(self, done, total, stamp=None):
+        """Record progress; returns (items per second, seconds left or None)"""
+        stamp = time.perf_counter() if stamp is None else stamp
+        if self.samples and done < self.samples[-1][1]:
+            # A new phase started counting from zero
+            self.samples.clear()
+        self.samples.append((stamp, done))
+        while len(self.samples) > 2 and stamp - self.samples[0][0] > self.window:
+            self.samples.popleft()
+        first_stamp, first_done = self.samples[0]
+        rate = (done - first_done) / (stamp - first_stamp) if stamp > first_stamp else 0.0
+        eta = (total - done) / rate if rate > 0 and total and total > done else None
+        return rate, eta
+
+def format_eta(seconds):
+    """90 -> '1:30'; 3700 -> '1:01:40'"""
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+class GoogleMapsExtractorGUI:
+    def __init__(self):
+        _load_gui_modules()
+        
+        # One warm session is kept between searches and quit on exit
+        self.driver_pool = DriverPool(size=1)
+        self.store = ResultStore(DEFAULT_STORE_PATH)
+        self.cache = QueryCache()
+        self.extractor = GoogleMapsExtractor(pool=self.driver_pool, store=self.store, checkpoint_dir=CHECKPOINT_DIR)
+        self.ui_events = UiEventQueue()
+        self.cancel_token = CancelToken()
+        self.extraction_thread = None
+        self.progress = ProgressEstimator()
+        self.progress_total = 0
+        self.status_text = ""
+        self.setup_gui()
+        
+    def setup_gui(self):
+        """Setup the GUI interface"""
+        self.root = tk.Tk()
+        self.root.title("Google Maps Business Extractor")
+        self.root.geometry("800x660")
+        
+        # Set icon
+        try:
+            self.root.iconbitmap(resource_path('icon.ico'))
+        except:
+            pass
+        
+        # Create main frame
+        main_frame = ttk.Frame(self.root, padding="20")
+        main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
+        # Configure grid weights
+        self.root.columnconfigure(0, weight=1)
+        self.root.rowconfigure(0, weight=1)
+        main_frame.columnconfigure(1, weight=1)
+        
+        # Title
+        title_label = ttk.Label(
+            main_frame,
+            text="Google Maps Business Extractor",
+            font=('Arial', 16, 'bold')
+        )
+        title_label.grid(row=0, column=0, columnspan=3, pady=(0, 20))
+        
+        # Keyword input
+        ttk.Label(main_frame, text="Business Type/Keyword:").grid(
+            row=1, column=0, sticky=tk.W, pady=5
+        )
+        self.keyword_var = tk.StringVar()
+        self.keyword_entry = ttk.Entry(
+            main_frame, textvariable=self.keyword_var, width=40
+        )
+        self.keyword_entry.grid(row=1, column=1, sticky=(tk.W, tk.E), pady=5)
+        
+        # Location input
+        ttk.Label(main_frame, text="City/Location:").grid(
+            row=2, column=0, sticky=tk.W, pady=5
+        )
+        self.location_var = tk.StringVar()
+        self.location_entry = ttk.Entry(
+            main_frame, textvariable=self.location_var, width=40
+        )
+        self.location_entry.grid(row=2, column=1, sticky=(tk.W, tk.E), pady=5)
+        
+        # Max results
+        ttk.Label(main_frame, text="Max Results:").grid(
+            row=3, column=0, sticky=tk.W, pady=5
+        )
+        self.max_results_var = tk.StringVar(value="50")
+        self.max_results_spinbox = ttk.Spinbox(
+            main_frame, from_=10, to=5000, textvariable=self.max_results_var, width=10
+        )
+        self.max_results_spinbox.grid(row=3, column=1, sticky=tk.W, pady=5)
+        
+        # Tiling the area gets past the feed's ~120 result cap
+        tile_frame = ttk.Frame(main_frame)
+        tile_frame.grid(row=2, column=2, sticky=tk.W, pady=5)
+        self.tile_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            tile_frame, text=f"Tile above {FEED_RESULT_CAP} results, bbox s,w,n,e:", variable=self.tile_var
+        ).pack(side=tk.LEFT)
+        self.bbox_var = tk.StringVar()
+        ttk.Entry(tile_frame, textvariable=self.bbox_var, width=18).pack(side=tk.LEFT, padx=(5, 0))
+        
+        # Optional detail-page pass for phone, website and hours
+        self.enrich_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            main_frame, text="Fetch phone & website (slower)", variable=self.enrich_var
+        ).grid(row=3, column=2, sticky=tk.W, pady=5)
+        
+        # Buttons frame
+        button_frame = ttk.Frame(main_frame)
+        button_frame.grid(row=4, column=0, columnspan=3, pady=20)
+        
+        self.start_button = ttk.Button(
+            button_frame,
+            text="Start Extraction",
+            command=self.start_extraction,
+            width=20
+        )
+        self.start_button.pack(side=tk.LEFT, padx=5)
+        
+        self.stop_button = ttk.Button(
+            button_frame,
+            text="Stop",
+            command=self.stop_extraction,
+            state=tk.DISABLED,
+            width=20
+        )
+        self.stop_button.pack(side=tk.LEFT, padx=5)
+        
+        self.resume_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(
+            button_frame, text="Resume interrupted run", variable=self.resume_var
+        ).pack(side=tk.LEFT, padx=5)
+        
+        self.payload_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            button_frame, text="Read network payloads", variable=self.payload_var
+        ).pack(side=tk.LEFT, padx=5)
+        
+        # Repeat searches are answered from the query cache unless forced
+        self.refresh_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            button_frame, text="Force refresh", variable=self.refresh_var
+        ).pack(side=tk.LEFT, padx=5)
+        
+        ttk.Button(button_frame, text="Metrics", command=self.show_metrics, width=10).pack(side=tk.LEFT, padx=5)
+        
+        # Progress bar
+        self.progress_var = tk.DoubleVar()
+        self.progress_bar = ttk.Progressbar(
+            main_frame, length=300, variable=self.progress_var, mode='determinate'
+        )
+        self.progress_bar.grid(row=5, column=0, columnspan=3, pady=10, sticky=(tk.W, tk.E))
+        
+        # Status label
+        self.status_var = tk.StringVar(value="Ready to start...")
+        self.status_label = ttk.Label(
+            main_frame, textvariable=self.status_var, relief=tk.SUNKEN, padding=5
+        )
+        self.status_label.grid(row=6, column=0, columnspan=3, pady=10, sticky=(tk.W, tk.E))
+        
+        # Results text
+        ttk.Label(main_frame, text="Results:").grid(
+            row=7, column=0, sticky=tk.W, pady=(10, 5)
+        )
+        
+        self.results_text = tk.Text(main_frame, height=10, width=70)
+        self.results_text.grid(row=8, column=0, columnspan=3, pady=(0, 10), sticky=(tk.W, tk.E))
+        
+        # Scrollbar for results text
+        scrollbar = ttk.Scrollbar(main_frame, orient=tk.VERTICAL, command=self.results_text.yview)
+        scrollbar.grid(row=8, column=3, sticky=(tk.N, tk.S), pady=(0, 10))
+        self.results_text.configure(yscrollcommand=scrollbar.set)
+        
+        # Save buttons frame
+        save_frame = ttk.Frame(main_frame)
+        save_frame.grid(row=9, column=0, columnspan=3, pady=10)
+        
+        self.save_excel_btn = ttk.Button(
+            save_frame,
+            text="Save as Excel",
+            command=lambda: self.save_results('excel'),
+            state=tk.DISABLED,
+            width=15
+        )
+        self.save_excel_btn.pack(side=tk.LEFT, padx=5)
+        
+        self.save_pdf_btn = ttk.Button(
+            save_frame,
+            text="Save as PDF",
+            command=lambda: self.save_results('pdf'),
+            state=tk.DISABLED,
+            width=15
+        )
+        self.save_pdf_btn.pack(side=tk.LEFT, padx=5)
+        
+        # Streaming formats for downstream pipelines
+        self.export_format_var = tk.StringVar(value='jsonl')
+        ttk.Combobox(
+            save_frame, textvariable=self.export_format_var, values=['jsonl', 'csv', 'parquet'],
+            state='readonly', width=8
+        ).pack(side=tk.LEFT, padx=(5, 0))
+        self.save_as_btn = ttk.Button(
+            save_frame,
+            text="Save as...",
+            command=lambda: self.save_results(self.export_format_var.get()),
+            state=tk.DISABLED,
+            width=10
+        )
+        self.save_as_btn.pack(side=tk.LEFT, padx=5)
+        
+        self.append_excel_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            save_frame, text="Append to existing workbook", variable=self.append_excel_var
+        ).pack(side=tk.LEFT, padx=5)
+        
+        # Cleanup and filters applied before saving
+        filter_frame = ttk.Frame(main_frame)
+        filter_frame.grid(row=10, column=0, columnspan=3, pady=(0, 10))
+        ttk.Label(filter_frame, text="Min rating:").pack(side=tk.LEFT)
+        self.min_rating_var = tk.StringVar(value="0")
+        ttk.Spinbox(
+            filter_frame, from_=0, to=5, increment=0.5, textvariable=self.min_rating_var, width=5
+        ).pack(side=tk.LEFT, padx=(2, 10))
+        ttk.Label(filter_frame, text="Min reviews:").pack(side=tk.LEFT)
+        self.min_reviews_var = tk.StringVar(value="0")
+        ttk.Entry(filter_frame, textvariable=self.min_reviews_var, width=7).pack(side=tk.LEFT, padx=(2, 10))
+        self.has_website_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(filter_frame, text="Has website", variable=self.has_website_var).pack(side=tk.LEFT, padx=5)
+        self.drop_duplicates_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(
+            filter_frame, text="Drop near-duplicates", variable=self.drop_duplicates_var
+        ).pack(side=tk.LEFT, padx=5)
+        ttk.Label(filter_frame, text="Phone country code:").pack(side=tk.LEFT)
+        self.country_code_var = tk.StringVar(value=DEFAULT_COUNTRY_CODE)
+        ttk.Entry(filter_frame, textvariable=self.country_code_var, width=5).pack(side=tk.LEFT, padx=(2, 0))
+        
+        # Exit button
+        ttk.Button(save_frame, text="Exit", command=self.exit_app, width=15).pack(side=tk.LEFT, padx=5)
+        self.root.protocol("WM_DELETE_WINDOW", self.exit_app)
+        
+        # Set focus to first entry
+        self.keyword_entry.focus()
+        
+        # Bind Enter key to start extraction
+        self.root.bind('<Return>', lambda event: self.start_extraction())
+        self.root.after(GUI_POLL_MS, self._apply_ui_events)
+        
+    def update_status(self, message):
+        """Update status label (from any thread)"""
+        self.ui_events.post('status', message)
+        
+    def update_results_text(self, message):
+        """Append a line to the results pane (from any thread)"""
+        self.ui_events.post('line', message)
+        
+    def update_progress(self, done, total):
+        """Move the progress bar and ETA (from any thread)"""
+        self.ui_events.post('progress', done, total)
+        
+    def call_in_ui(self, function, *args):
+        """Run function on the Tk thread, in order with the other updates"""
+        self.ui_events.post('call', function, *args)
+        
+    def show_business(self, business):
+        """Append one extracted business to the results pane (from any thread)"""
+        self.ui_events.post('business', business)
+        
+    def _apply_ui_events(self):
+        """Tk thread: apply a batch of worker events, then check again shortly
+
+        Lines are inserted into the results pane as one chunk and only the
+        last status and progress of the batch are drawn. Progress without a
+        status of its own is shown after the last status message.
+        """
+        self.root.after(GUI_POLL_MS, self._apply_ui_events)
+        lines = []
+        status = progress = None
+        for kind, stamp, args in self.ui_events.drain():
+            if kind == 'line':
+                lines.append(args[0])
+            elif kind == 'business':
+                business = args[0]
+                lines.append(
+                    f"{business['Sr No.']}. {business.get('Business Name', 'N/A')}"
+                    f" - Rating: {business.get('Rating') or 'N/A'}"
+                )
+                status = f"Extracted {business['Sr No.']} businesses"
+                progress = (business['Sr No.'], self.progress_total)
+                rate, eta = self.progress.update(business['Sr No.'], self.progress_total, stamp)
+            elif kind == 'status':
+                status, progress = args[0], None
+                self.status_text = status
+            elif kind == 'progress':
+                progress = args
+                rate, eta = self.progress.update(args[0], args[1], stamp)
+            elif kind == 'call':
+                # Earlier lines go in first so the pane keeps the posting order
+                self._insert_lines(lines)
+                lines = []
+                args[0](*args[1:])
+        self._insert_lines(lines)
+        if progress:
+            done, total = progress
+            if total:
+                self.progress_var.set(min(100.0, done * 100 / total))
+            if status is None and total:
+                status = f"{self.status_text.rstrip('.')} {done}/{total}"
+            if status is not None and rate:
+                status += f" - {rate:.1f}/s"
+                if eta is not None:
+                    status += f", ETA {format_eta(eta)}"
+        if status is not None:
+            self.status_var.set(status)
+        
+    def _insert_lines(self, lines):
+        if lines:
+            self.results_text.insert(tk.END, "\n".join(lines) + "\n")
+            self.results_text.see(tk.END)
+        
+    def start_extraction(self):
+        """Start the extraction process in a separate thread"""
+        keyword = self.keyword_var.get().strip()
+        location = self.location_var.get().strip()
+        
+        if not keyword or not location:
+            messagebox.showerror("Error", "Please enter both keyword and location")
+            return
+        
+        try:
+            max_results = int(self.max_results_var.get())
+        except ValueError:
+            messagebox.showerror("Error", "Please enter a valid number for max results")
+            return
+        
+        # Disable start button, enable stop button
+        self.start_button.config(state=tk.DISABLED)
+        self.stop_button.config(state=tk.NORMAL)
+        self.save_excel_btn.config(state=tk.DISABLED)
+        self.save_pdf_btn.config(state=tk.DISABLED)
+        self.save_as_btn.config(state=tk.DISABLED)
+        
+        # Clear previous results
+        self.extractor.results = []
+        self.extractor.total_businesses_scraped = 0
+        self.results_text.delete(1.0, tk.END)
+        self.progress_var.set(0)
+        self.progress.reset()
+        self.progress_total = max_results
+        self.cancel_token = CancelToken()
+        self.extractor.cancel_token = self.cancel_token
+        
+        # Start extraction in separate thread
+        self.extraction_thread = threading.Thread(
+            target=self.run_extraction,
+            args=(keyword, location, max_results),
+            daemon=True
+        )
+        self.extraction_thread.start()
+        
+    def run_extraction(self, keyword, location, max_results):
+        """Run the extraction process"""
+        try:
+            self.update_status("Initializing Chrome browser...")
+            self.update_results_text(f"Keyword: {keyword}")
+            self.update_results_text(f"Location: {location}")
+            self.update_results_text(f"Max Results: {max_results}")
+            self.update_results_text("-" * 50)
+            self.extractor.extraction_mode = 'network' if self.payload_var.get() else 'dom'
+            if self.driver_pool.performance_log != self.extractor.performance_log:
+                # Chrome's logging is fixed at launch, so switching modes needs a new session
+                self.driver_pool.close()
+                self.driver_pool = DriverPool(size=1, performance_log=self.extractor.performance_log)
+                self.extractor.pool = self.driver_pool
+            
+            tiled = self.tile_var.get() and max_results > FEED_RESULT_CAP
+            variant = query_variant(tiled, self.extractor.extraction_mode, self.enrich_var.get())
+            cached = None if self.refresh_var.get() else self.cache.get(keyword, location, max_results, variant)
+            if cached:
+                found = self.show_cached(keyword, location, *cached)
+            elif tiled:
+                found = self.run_tiled_search(keyword, location, max_results)
+            else:
+                found = self.run_single_search(keyword, location, max_results)
+            if not found:
+                if self.cancel_token.cancelled:
+                    self.update_status("Extraction stopped")
+                return
+            
+            # Fill in phone/website from each place page
+            if self.enrich_var.get() and self.extractor.results and not self.cancel_token.cancelled and not cached:
+                self.update_status("Fetching phone numbers and websites...")
+                stats = self.extractor.enrich_details(progress=self.update_progress)
+                self.update_results_text(
+                    f"\nDetails fetched for {stats['enriched']}/{stats['targets']} places "
+                    f"({stats['places_per_minute']} places/min)"
+                )
+            
+            # A stopped run is incomplete, so it is not cached
+            if self.extractor.results and not self.cancel_token.cancelled and not cached:
+                self.cache.put(keyword, location, max_results, self.extractor.results, variant)
+            
+            # Update UI with results
+            if self.cancel_token.cancelled:
+                self.update_status(f"Extraction stopped - kept {len(self.extractor.results)} businesses")
+                self.update_results_text(
+                    f"\nExtraction stopped by user: {len(self.extractor.results)} businesses kept "
+                    f"(start again to resume)"
+                )
+            else:
+                self.update_status(f"Extraction complete! Found {len(self.extractor.results)} businesses")
+                self.update_results_text(f"\nExtraction Complete!")
+                self.update_results_text(f"Total businesses found: {len(self.extractor.results)}")
+            
+            # Enable save buttons
+            if self.extractor.results:
+                self.call_in_ui(self.enable_save_buttons)
+            
+            self.extractor.log_wait_summary()
+            self.extractor.write_metrics()
+            
+            # Close driver
+            self.extractor.close_driver()
+            
+        except Exception as e:
+            if self.cancel_token.cancelled:
+                # The browser was quit under a blocked call; what was extracted is kept
+                self.update_status(f"Extraction stopped - kept {len(self.extractor.results)} businesses")
+            else:
+                self.update_status(f"Error: {str(e)}")
+                self.update_results_text(f"ERROR: {str(e)}")
+                logging.error(f"Extraction error: {e}")
+            if self.extractor.results:
+                self.call_in_ui(self.enable_save_buttons)
+            self.extractor.close_driver(discard=True)
+        finally:
+            self.enable_buttons()
+            
+    def run_single_search(self, keyword, location, max_results):
+        """One text search, extracted while the feed scrolls; False if it could not start"""
+        # Setup driver
+        if not self.extractor.setup_driver():
+            self.update_status("Failed to initialize browser")
+            self.enable_buttons()
+            return False
+        
+        # Open Google Maps
+        self.update_status("Opening Google Maps...")
+        if not self.extractor.open_google_maps():
+            self.update_status("Failed to open Google Maps")
+            self.extractor.close_driver()
+            self.enable_buttons()
+            return False
+        
+        # Search for businesses
+        self.update_status(f"Searching for {keyword} in {location}...")
+        if not self.extractor.search_businesses(keyword, location):
+            self.update_status("Search failed")
+            self.extractor.close_driver()
+            self.enable_buttons()
+            return False
+        
+        # Records are journaled as they arrive, so Stop or a crash can be resumed
+        checkpoint = self.extractor.open_checkpoint(keyword, location, max_results, self.resume_var.get())
+        if checkpoint.resumed_count:
+            self.update_results_text(f"Resuming: {checkpoint.resumed_count} businesses recovered from checkpoint")
+        
+        # Extract while scrolling; recovered and new businesses are shown as they arrive
+        self.update_status("Loading and extracting business data...")
+        self.extractor.stream_results(
+            max_results, sinks=[CallbackSink(self.show_business)], checkpoint=checkpoint
+        )
+        return True
+        
+    def show_cached(self, keyword, location, records, age):
+        """Serve a search from the query cache without starting Chrome"""
+        self.extractor.current_keyword = keyword
+        self.extractor.current_location = location
+        self.extractor.results = records
+        self.extractor.total_businesses_scraped = len(records)
+        for business in records:
+            self.show_business(business)
+        stats = self.cache.stats
+        self.update_results_text(
+            f"\nServed from cache ({age / 60:.0f} min old); tick Force refresh to search again. "
+            f"Cache: {stats['hits']} hits, {stats['misses']} misses this session"
+        )
+        return True
+        
+    def run_tiled_search(self, keyword, location, max_results):
+        """Tile the location's area to collect more than one feed's worth of places"""
+        self.update_status(f"Tiling {location} for {keyword}...")
+        try:
+            bbox = parse_bbox(self.bbox_var.get()) if self.bbox_var.get().strip() else None
+        except ValueError as e:
+            self.update_status(str(e))
+            return False
+        stats = self.extractor.search_tiled(
+            keyword, location, max_results, bbox=bbox,
+            progress=lambda found, tiles: self.update_progress(found, max_results)
+        )
+        for business in self.extractor.results:
+            self.show_business(business)
+        self.update_results_text(
+            f"\n{stats['tiles']} tiles, duplicate rate {stats['duplicate_rate']:.0%}, "
+            f"{stats['fully_listed_area']:.0%} of the area fully listed"
+        )
+        for depth, level in stats['by_depth'].items():
+            self.update_results_text(
+                f"  depth {depth}: {level['tiles']} tiles, {level['new_per_tile']} new places/tile, "
+                f"{level['duplicate_rate']:.0%} duplicates"
+            )
+        return True
+        
+    def stop_extraction(self):
+        """Ask the worker to stop; it keeps its results and closes Chrome itself"""
+        self.update_status("Stopping extraction...")
+        self.stop_button.config(state=tk.DISABLED)
+        self.cancel_token.cancel()
+        self.root.after(int(STOP_GRACE_SECONDS * 1000), self._force_stop, self.extraction_thread)
+        
+    def _force_stop(self, thread):
+        """Unblock a worker still stuck in a WebDriver call after the grace period"""
+        if thread is not None and thread.is_alive() and thread is self.extraction_thread:
+            self.extractor.abort_driver()
+        
+    def enable_buttons(self):
+        """Enable/disable buttons as appropriate (from any thread)"""
+        self.call_in_ui(self._set_idle_buttons)
+        
+    def _set_idle_buttons(self):
+        self.start_button.config(state=tk.NORMAL)
+        self.stop_button.config(state=tk.DISABLED)
+        
+    def enable_save_buttons(self):
+        self.save_excel_btn.config(state=tk.NORMAL)
+        self.save_pdf_btn.config(state=tk.NORMAL)
+        self.save_as_btn.config(state=tk.NORMAL)
+        
+    def save_results(self, file_type):
+        """Save results to file"""
+        if not self.extractor.results:
+            messagebox.showwarning("No Data", "No data to save")
+            return
+        
+        try:
+            filters = {
+                'min_rating': float(self.min_rating_var.get() or 0) or None,
+                'min_reviews': int(self.min_reviews_var.get() or 0) or None,
+                'has_website': self.has_website_var.get(),
+                'drop_duplicates': self.drop_duplicates_var.get(),
+                'country_code': parse_country_code(self.country_code_var.get() or DEFAULT_COUNTRY_CODE),
+            }
+        except ValueError:
+            messagebox.showerror("Error", "Please enter numbers for the rating, review and country code filters")
+            return
+        
+        # Ask for file location
+        file_ext, label = EXPORT_FORMATS[file_type]
+        if file_type == 'parquet':
+            # A Parquet export is a folder of partitioned files
+            filename = filedialog.askdirectory(title=f"Choose a {label}", mustexist=False)
+        else:
+            file_types = [(label, f"*{file_ext}"), ("All files", "*.*")]
+            # Appending needs an existing workbook, so skip the overwrite prompt
+            ask = filedialog.askopenfilename if file_type == 'excel' and self.append_excel_var.get() else filedialog.asksaveasfilename
+            filename = ask(
+                defaultextension=file_ext,
+                filetypes=file_types,
+                initialfile=f"google_maps_{self.extractor.current_keyword}_{self.extractor.current_location}{file_ext}"
+            )
+        
+        if filename:
+            self.update_status(f"Saving to {file_type.upper()}...")
+            self.save_excel_btn.config(state=tk.DISABLED)
+            self.save_pdf_btn.config(state=tk.DISABLED)
+            self.save_as_btn.config(state=tk.DISABLED)
+            
+            # Write the file off the Tk thread so the window stays responsive
+            threading.Thread(
+                target=self._save_in_background,
+                args=(file_type, filename, self.append_excel_var.get(), filters),
+                daemon=True
+            ).start()
+            
+    def _save_in_background(self, file_type, filename, append, filters):
+        """Worker thread: clean up and write the file, then report back on the Tk thread"""
+        records = self.extractor.postprocess(**filters)
+        if not records:
+            success, message = False, "No businesses match the filters"
+        elif file_type == 'excel':
+            success, message = self.extractor.save_to_excel(filename, records, append=append)
+        elif file_type != 'pdf':
+            success, message = self.extractor.save_to_file(filename, file_type, records)
+        else:
+            success, message = self.extractor.save_to_pdf(filename, records, progress=self.update_progress)
+        self.extractor.write_metrics()
+        self.call_in_ui(self._save_finished, success, message)
+        
+    def _save_finished(self, success, message):
+        """Show the outcome of a background save"""
+        self.enable_save_buttons()
+        if success:
+            messagebox.showinfo("Success", message)
+            self.update_status(message)
+            self.update_results_text(f"\n{message}")
+        else:
+            messagebox.showerror("Error", message)
+            self.update_status(f"Save failed: {message}")
+                
+    def show_metrics(self):
+        """Show per-phase timings and selector hit rates in a window"""
+        window = tk.Toplevel(self.root)
+        window.title("Extraction metrics")
+        text = tk.Text(window, height=24, width=90, font=("Courier", 9))
+        text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        lines = self.extractor.metrics.report_lines()
+        text.insert(tk.END, "\n".join(lines) if self.extractor.metrics.events else "No phases recorded yet")
+        text.insert(tk.END, f"\n\nTrace and Prometheus files: {os.path.abspath(METRICS_DIR)}")
+        text.config(state=tk.DISABLED)
+        
+    def exit_app(self):
+        """Quit pooled browser sessions and close the window"""
+        self.driver_pool.close()
+        self.store.close()
+        self.cache.close()
+        self.root.quit()
+        
+    def run(self):
+        """Run the GUI application"""
+        self.root.mainloop()
+
+def load_queries(path, default_max_results=50):
+    """Read keyword/location queries from a CSV or JSONL file
+
+    CSV files need 'keyword' and 'location' columns; JSONL files need the
+    same keys. An optional 'max_results' overrides the default per query.
+    """
+    queries = []
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.lower().endswith(('.jsonl', '.ndjson')):
+            rows = (json.loads(line) for line in f if line.strip())
+        else:
+            rows = csv.DictReader(f)
+
+        for row in rows:
+            keyword = str(row.get('keyword') or '').strip()
+            location = str(row.get('location') or '').strip()
+            if not keyword or not location:
+                logging.warning(f"Skipping query without keyword/location: {row}")
+                continue
+            queries.append({
+                'keyword': keyword,
+                'location': location,
+                'max_results': int(row.get('max_results') or default_max_results),
+            })
+    return queries
+
+def _batch_worker(worker_id, task_queue, result_queue, extractor_options, pool_options):
+    """Worker process: own a pooled headless Chrome and run queries from task_queue"""
+    extractor_options = dict(extractor_options)
+    store_path = extractor_options.pop('store_path', None)
+    metrics_dir = extractor_options.pop('metrics_dir', None)
+    store = ResultStore(store_path) if store_path else None
+    enrich_sessions = extractor_options.pop('enrich_sessions', 0)
+    enrich_pool = DriverPool(size=enrich_sessions, headless=True, **pool_options) if enrich_sessions else None
+    extractor = GoogleMapsExtractor(headless=True, store=store, **extractor_options)
+    pool = extractor.pool = DriverPool(size=1, headless=True, performance_log=extractor.performance_log, **pool_options)
+
+    # Start Chrome up front so the coordinator only hands work to live workers
+    if not extractor.setup_driver():
+        result_queue.put(('driver_failed', worker_id, None))
+        return
+    result_queue.put(('ready', worker_id, None))
+
+    try:
+        while True:
+            task = task_queue.get()
+            if task is None:
+                break
+            index, query = task
+            start = time.perf_counter()
+            failed = False
+            try:
+                if not extractor.driver and not extractor.setup_driver():
+                    raise RuntimeError("Failed to initialize browser")
+                records = extractor.run_query(query['keyword'], query['location'], query['max_results'])
+                outcome = {'status': 'ok', 'results': records}
+                if enrich_pool:
+                    outcome['enrichment'] = extractor.enrich_details(
+                        records, concurrency=enrich_sessions, pool=enrich_pool
+                    )
+            except BlockedError as e:
+                # The session is discarded, so a retry gets a fresh profile
+                failed = True
+                outcome = {'status': 'blocked', 'block': e.kind, 'error': str(e), 'results': []}
+            except Exception as e:
+                failed = True
+                outcome = {'status': 'error', 'error': str(e), 'results': []}
+            finally:
+                extractor.close_driver(discard=failed)
+            outcome['index'] = index
+            outcome['seconds'] = round(time.perf_counter() - start, 2)
+            if metrics_dir:
+                extractor.write_metrics(metrics_dir, f"worker-{worker_id}")
+            result_queue.put(('finished', worker_id, outcome))
+    finally:
+        extractor.close_driver()
+        pool.close()
+        if enrich_pool:
+            enrich_pool.close()
+
+class BatchRunner:
+    """Spread queries over worker processes, each owning a headless Chrome
+
+    Queries are paced by a RequestScheduler: a worker only gets its next
+    query when the global and its own session's rate limits allow, and
+    blocked or failed queries go back in the queue for a fresh session.
+    With a QueryCache, cached queries are answered before any worker
+    starts (unless refresh=True) and finished ones are added to it.
+    """
+
+    def __init__(self, queries, output_path, workers=2, query_timeout=300, extractor_options=None,
+                 pool_options=None, record_sink=None, scheduler=None, cache=None, refresh=False):
+        self.queries = queries
+        self.output_path = output_path
+        # With a record sink, businesses go there and output_path only logs queries
+        self.record_sink = record_sink
+        self.workers = max(1, workers)
+        self.query_timeout = query_timeout
+        self.extractor_options = extractor_options or {}
+        self.pool_options = pool_options or {}
+        self.result_queue = multiprocessing.Queue()
+        self.processes = {}
+        self.task_queues = {}
+        self.busy = {}
+        self.starting = {}
+        self.next_worker_id = 0
+        self.scheduler = scheduler or RequestScheduler()
+        self.cache = cache
+        self.cache_variant = query_variant(
+            False, self.extractor_options.get('extraction_mode', 'dom'), bool(self.extractor_options.get('enrich_sessions'))
+        )
+        self.refresh = refresh
+        self.attempts = {}
+        self.stats = {'ok': 0, 'error': 0, 'timeout': 0, 'blocked': 0, 'businesses': 0}
+
+    def _spawn_worker(self):
+        worker_id = self.next_worker_id
+        self.next_worker_id += 1
+        task_queue = multiprocessing.Queue()
+        process = multiprocessing.Process(
+            target=_batch_worker,
+            args=(worker_id, task_queue, self.result_queue, self.extractor_options, self.pool_options),
+            daemon=True
+        )
+        process.start()
+        self.processes[worker_id] = process
+        self.task_queues[worker_id] = task_queue
+        self.starting[worker_id] = time.perf_counter()
+        self.scheduler.reset_session(worker_id)
+        return worker_id
+
+    def _retire_worker(self, worker_id, kill=False):
+        process = self.processes.pop(worker_id, None)
+        self.task_queues.pop(worker_id, None)
+        self.busy.pop(worker_id, None)
+        self.starting.pop(worker_id, None)
+        if process is not None and kill and process.is_alive():
+            process.terminate()
+            process.join(5)
+
+    def _write(self, out, index, outcome):
+        query = self.queries[index]
+        line = {
+            'keyword': query['keyword'],
+            'location': query['location'],
+            'max_results': query['max_results'],
+            'status': outcome['status'],
+            'seconds': outcome.get('seconds'),
+            'count': len(outcome.get('results', [])),
+            'error': outcome.get('error', ''),
+            'cached': outcome.get('cached', False),
+        }
+        if self.record_sink:
+            for record in outcome.get('results', []):
+                self.record_sink.write(record)
+        else:
+            line['results'] = [dict(record) for record in outcome.get('results', [])]
+        out.write(json.dumps(line, ensure_ascii=False) + "\n")
+        out.flush()
+
+        self.stats[outcome['status']] += 1
+        self.stats['businesses'] += line['count']
+        logging.info(
+            f"[{sum(self.stats[k] for k in ('ok', 'error', 'timeout', 'blocked'))}/{len(self.queries)}] "
+            f"{query['keyword']} in {query['location']}: {outcome['status']}, {line['count']} businesses"
+        )
+
+    def run(self):
+        """Run every query and return a throughput summary"""
+        pending = list(range(len(self.queries)))
+        idle = []
+        started = time.perf_counter()
+
+        with open(self.output_path, 'a', encoding='utf-8') as out:
+            if self.cache and not self.refresh:
+                for index in list(pending):
+                    query = self.queries[index]
+                    hit = self.cache.get(query['keyword'], query['location'], query['max_results'], self.cache_variant)
+                    if hit:
+                        pending.remove(index)
+                        self._write(out, index, {'status': 'ok', 'results': hit[0], 'seconds': 0.0, 'cached': True})
+
+            for _ in range(min(self.workers, len(pending))):
+                self._spawn_worker()
+
+            while pending or self.busy:
+                # Hand queued work to idle workers, as fast as the rate limits allow
+                wait = 1.0
+                idle = [worker_id for worker_id in idle if worker_id in self.processes]
+                while idle and pending:
+                    worker_id = None
+                    for candidate in reversed(idle):
+                        delay = self.scheduler.acquire(candidate)
+                        if delay <= 0:
+                            worker_id = candidate
+                            break
+                        wait = min(wait, delay)
+                    if worker_id is None:
+                        break
+                    idle.remove(worker_id)
+                    index = pending.pop(0)
+                    self.attempts[index] = self.attempts.get(index, 0) + 1
+                    self.busy[worker_id] = (index, time.perf_counter())
+                    self.task_queues[worker_id].put((index, self.queries[index]))
+
+                if not self.processes:
+                    for index in pending:
+                        self._write(out, index, {'status': 'error', 'error': 'No browser workers available'})
+                    pending = []
+                    break
+
+                try:
+                    kind, worker_id, outcome = self.result_queue.get(timeout=max(wait, 0.05))
+                except queue.Empty:
+                    kind = None
+
+                if kind == 'ready' and worker_id in self.starting:
+                    del self.starting[worker_id]
+                    idle.append(worker_id)
+                elif kind == 'driver_failed':
+                    logging.error(f"Worker {worker_id} could not start Chrome")
+                    self._retire_worker(worker_id)
+                elif kind == 'finished' and worker_id in self.busy:
+                    del self.busy[worker_id]
+                    index = outcome['index']
+                    if outcome['status'] == 'ok':
+                        self.scheduler.record_success()
+                        # As in the GUI, only runs that found businesses are cached
+                        if self.cache and outcome['results']:
+                            query = self.queries[index]
+                            self.cache.put(
+                                query['keyword'], query['location'], query['max_results'], outcome['results'],
+                                self.cache_variant
+                            )
+                    elif outcome['status'] == 'blocked':
+                        self.scheduler.record_block(outcome['block'])
+                        # The worker discarded its Chrome; the next query gets a fresh session
+                        self.scheduler.reset_session(worker_id)
+                    if outcome['status'] != 'ok' and self.scheduler.should_retry(self.attempts[index]):
+                        logging.warning(f"Query {index} {outcome['status']} ({outcome['error']}), retrying")
+                        pending.insert(0, index)
+                    else:
+                        self._write(out, index, outcome)
+                    idle.append(worker_id)
+
+                # Kill workers that overran their query or died mid-query
+                now = time.perf_counter()
+                for worker_id, since in list(self.starting.items()):
+                    if now - since > self.query_timeout or not self.processes[worker_id].is_alive():
+                        logging.error(f"Worker {worker_id} did not start, giving up on it")
+                        self._retire_worker(worker_id, kill=True)
+                for worker_id, (index, since) in list(self.busy.items()):
+                    process = self.processes[worker_id]
+                    if now - since > self.query_timeout:
+                        logging.warning(f"Query {index} exceeded {self.query_timeout}s, restarting worker {worker_id}")
+                        self._retire_worker(worker_id, kill=True)
+                        self._write(out, index, {'status': 'timeout', 'seconds': round(now - since, 2)})
+                    elif not process.is_alive():
+                        self._retire_worker(worker_id)
+                        self._write(out, index, {'status': 'error', 'error': 'Worker process exited'})
+                    else:
+                        continue
+                    if pending:
+                        self._spawn_worker()
+
+        for worker_id in list(self.task_queues):
+            self.task_queues[worker_id].put(None)
+        for worker_id in list(self.processes):
+            self.processes[worker_id].join(10)
+            self._retire_worker(worker_id, kill=True)
+        if self.record_sink:
+            self.record_sink.close()
+
+        return self._summary(time.perf_counter() - started)
+
+    def _summary(self, elapsed):
+        minutes = max(elapsed / 60, 1e-9)
+        completed = self.stats['ok'] + self.stats['error'] + self.stats['timeout'] + self.stats['blocked']
+        pacing = self.scheduler.summary()
+        return {
+            'queries': completed,
+            'ok': self.stats['ok'],
+            'errors': self.stats['error'],
+            'timeouts': self.stats['timeout'],
+            'blocked': self.stats['blocked'],
+            'blocks_seen': pacing['blocks'],
+            'retries': pacing['retries'],
+            'final_rate_per_hour': pacing['rate_per_hour'],
+            'businesses': self.stats['businesses'],
+            'elapsed_seconds': round(elapsed, 2),
+            'queries_per_minute': round(completed / minutes, 2),
+            'queries_per_hour': round(self.stats['ok'] / minutes * 60, 1),
+            'businesses_per_minute': round(self.stats['businesses'] / minutes, 2),
+            'cache_hits': self.cache.stats['hits'] if self.cache else 0,
+            'cache_misses': self.cache.stats['misses'] if self.cache else 0,
+        }
+
+def run_queue_worker(target, token=None, worker_name=None, extractor_options=None, pool_options=None,
+                     scheduler=None, idle_exit=None, heartbeat_seconds=JOB_HEARTBEAT_SECONDS):
+    """Lease and run jobs until the queue stays empty for idle_exit seconds (None: forever)
+
+    A thread heartbeats each leased job's lease while the worker waits for
+    its RequestScheduler to allow another query and while the query runs;
+    if the lease is lost (it expired and went to another worker) the run
+    is cancelled. Polling an empty queue does not use up the rate limit.
+    Returns the number of jobs this worker completed.
+    """
+    import socket
+
+    worker = worker_name or f"{socket.gethostname()}-{os.getpid()}"
+    job_queue = open_job_queue(target, token)
+    scheduler = scheduler or RequestScheduler()
+    extractor = GoogleMapsExtractor(headless=True, **(extractor_options or {}))
+    pool = extractor.pool = DriverPool(
+        size=1, headless=True, performance_log=extractor.performance_log, **(pool_options or {})
+    )
+    completed = 0
+    idle_since = time.monotonic()
+    try:
+        while True:
+            try:
+                job = job_queue.lease(worker)
+            except OSError as e:
+                logging.warning(f"[{worker}] Could not reach the queue: {e}")
+                job = None
+            if job is None:
+                if idle_exit is not None and time.monotonic() - idle_since >= idle_exit:
+                    break
+                time.sleep(min(5.0, heartbeat_seconds))
+                continue
+
+            logging.info(f"[{worker}] Job {job['id']}: {job['keyword']} in {job['location']} (attempt {job['attempt']})")
+            extractor.cancel_token = CancelToken()
+            finished = threading.Event()
+
+            def keep_lease(job_id=job['id'], cancel_token=extractor.cancel_token):
+                while not finished.wait(heartbeat_seconds):
+                    try:
+                        if not job_queue.heartbeat(job_id, worker):
+                            logging.warning(f"[{worker}] Lost the lease on job {job_id}; stopping it")
+                            cancel_token.cancel()
+                            return
+                    except OSError as e:
+                        logging.warning(f"[{worker}] Heartbeat failed: {e}")
+
+            threading.Thread(target=keep_lease, daemon=True).start()
+            failed = False
+            try:
+                while not extractor.cancelled:
+                    delay = scheduler.acquire(worker)
+                    if delay <= 0:
+                        break
+                    time.sleep(min(delay, 1.0))
+                if extractor.cancelled:
+                    continue
+                if not extractor.driver and not extractor.setup_driver():
+                    raise RuntimeError("Failed to initialize browser")
+                records = extractor.run_query(job['keyword'], job['location'], job['max_results'])
+                if not extractor.cancelled and job_queue.complete(job['id'], worker, records):
+                    completed += 1
+                    scheduler.record_success()
+                    logging.info(f"[{worker}] Job {job['id']} done: {len(records)} businesses")
+            except Exception as e:
+                # The session is discarded and the job goes back to the queue for a fresh one
+                failed = True
+                if isinstance(e, BlockedError):
+                    scheduler.record_block(e.kind)
+                    scheduler.reset_session(worker)
+                logging.error(f"[{worker}] Job {job['id']} failed: {e}")
+                try:
+                    job_queue.fail(job['id'], worker, e)
+                except OSError as report_error:
+                    logging.warning(f"[{worker}] Could not report the failure: {report_error}")
+            finally:
+                finished.set()
+                extractor.close_driver(discard=failed)
+                idle_since = time.monotonic()
+    finally:
+        extractor.close_driver()
+        pool.close()
+        job_queue.close()
+    return completed
+
+def _queue_worker_process(target, token, extractor_options, pool_options, rate_per_hour, idle_exit):
+    """Process entry point for the workers started by 'queue-worker --processes'"""
+    scheduler = RequestScheduler(rate_per_hour, rate_per_hour)
+    run_queue_worker(target, token, None, extractor_options, pool_options, scheduler, idle_exit)
+
+def run_batch_command(args):
+    """Entry point for the headless 'batch' command"""
+    queries = load_queries(args.queries, args.max_results)
+    if not queries:
+        print("No queries found in", args.queries)
+        return 1
+
+    print(f"Running {len(queries)} queries on {args.workers} headless workers...")
+    output = args.output
+    record_sink = None
+    if args.format != 'jsonl':
+        record_sink = create_exporter(args.format, args.output, append=True, compression=args.compression)
+        output = os.path.splitext(args.output)[0] + "_queries.jsonl"
+    extractor_options = {'enrich_sessions': args.enrich, 'lean': args.lean,
+                         'extraction_mode': args.extraction, 'payload_dir': args.record_payloads}
+    if args.store:
+        extractor_options.update({'store_path': args.store, 'refresh_ttl': args.refresh_ttl})
+    if args.checkpoint_dir:
+        extractor_options['checkpoint_dir'] = args.checkpoint_dir
+    if args.metrics_dir:
+        extractor_options['metrics_dir'] = args.metrics_dir
+    scheduler = RequestScheduler(args.rate_limit, args.session_rate, max_retries=args.retries)
+    cache = QueryCache(args.cache, args.cache_ttl) if args.cache_ttl > 0 else None
+    runner = BatchRunner(
+        queries, output, args.workers, args.timeout,
+        extractor_options=extractor_options,
+        pool_options={'max_uses': args.recycle_after, 'max_memory_mb': args.max_memory_mb, 'lean': args.lean},
+        record_sink=record_sink, scheduler=scheduler, cache=cache, refresh=args.refresh
+    )
+    try:
+        summary = runner.run()
+    finally:
+        if cache:
+            cache.close()
+
+    print("=" * 60)
+    print("BATCH SUMMARY")
+    print("=" * 60)
+    for key, value in summary.items():
+        print(f"{key.replace('_', ' ').title()}: {value}")
+    print(f"Results written to {args.output}")
+    if record_sink:
+        print(f"Per-query status written to {output}")
+    return 0 if summary['ok'] else 1
+
+def run_queue_command(args):
+    """Entry point for the queue-* commands of distributed mode"""
+    if args.command == 'queue-worker':
+        extractor_options = {'lean': args.lean, 'extraction_mode': args.extraction}
+        pool_options = {'max_uses': args.recycle_after, 'lean': args.lean}
+        if args.processes <= 1:
+            scheduler = RequestScheduler(args.rate_limit, args.rate_limit)
+            done = run_queue_worker(args.queue, args.token, args.name, extractor_options, pool_options,
+                                    scheduler, args.idle_exit)
+            print(f"Worker finished {done} jobs")
+            return 0
+        processes = [
+            multiprocessing.Process(
+                target=_queue_worker_process,
+                args=(args.queue, args.token, extractor_options, pool_options, args.rate_limit, args.idle_exit)
+            )
+            for _ in range(args.processes)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        return 0 if all(process.exitcode == 0 for process in processes) else 1
+
+    if args.command == 'queue-status' and args.queue.startswith(('http://', 'https://')):
+        status = RemoteJobQueue(args.queue, args.token).status()
+    else:
+        job_queue = JobQueue(args.queue, lease_seconds=getattr(args, 'lease', JOB_LEASE_SECONDS))
+        try:
+            if args.command == 'queue-add':
+                queries = load_queries(args.queries, args.max_results)
+                print(f"Queued {job_queue.add(queries)} jobs in {args.queue}")
+                return 0 if queries else 1
+            if args.command == 'queue-serve':
+                server = JobQueueServer(job_queue, args.host, args.port, args.token).start()
+                print(f"Coordinating {args.queue} at {server.url()} (Ctrl+C to stop)")
+                try:
+                    while True:
+                        time.sleep(JOB_HEARTBEAT_SECONDS)
+                        counts = job_queue.status()['jobs']
+                        logging.info(f"Jobs: {counts}")
+                except KeyboardInterrupt:
+                    pass
+                finally:
+                    server.stop()
+                return 0
+            if args.command == 'queue-export':
+                records = [BusinessRecord.from_dict(record) for record in job_queue.iter_results()]
+                if not records:
+                    print("No finished jobs in", args.queue)
+                    return 1
+                extractor = GoogleMapsExtractor()
+                extractor.current_keyword = "All"
+                extractor.current_location = "All"
+                success, message = extractor.save_to_file(args.output, records=records)
+                print(message)
+                return 0 if success else 1
+            status = job_queue.status()
+        finally:
+            job_queue.close()
+
+    counts = status['jobs']
+    print(f"Jobs: {counts['queued']} queued, {counts['leased']} leased, "
+          f"{counts['done']} done, {counts['failed']} failed; {status['businesses']} businesses")
+    for worker, lease in sorted(status['workers'].items()):
+        print(f"  {worker}: job {lease['job']}, last heartbeat {lease['heartbeat_age']}s ago, "
+              f"lease ends in {lease['lease_left']}s")
+    return 0
+
+STARTUP_MODULES = ['google_maps_scraper', 'selenium.webdriver.support.ui', 'pandas', 'reportlab.platypus', 'tkinter', 'webdriver_manager.chrome']
+
+def _time_import(module, runs):
+    """Median wall time of importing module in a fresh interpreter, in ms"""
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        )
+        if output.returncode != 0:
+            return None
+        samples.append(float(output.stdout.strip().splitlines()[-1]))
+    return round(statistics.median(samples) * 1000, 1)
+
+def run_startup_benchmark(runs=5, baseline_path=None, save_path=None, tolerance=0.2):
+    """Measure import and driver-resolution startup cost
+
+    Compares against a saved baseline when given and flags anything that got
+    slower by more than tolerance.
+    """
+    report = {'imports_ms': {}, 'resolve_chromedriver_ms': {}}
+    for module in STARTUP_MODULES:
+        report['imports_ms'][module] = _time_import(module, runs)
+
+    for label in ('first_call', 'cached_call'):
+        start = time.perf_counter()
+        resolve_chromedriver()
+        report['resolve_chromedriver_ms'][label] = round((time.perf_counter() - start) * 1000, 1)
+
+    print(f"Startup benchmark (median of {runs} runs)")
+    for group, values in report.items():
+        for name, ms in values.items():
+            print(f"  {group:<26} {name:<28} {ms if ms is not None else 'n/a'} ms")
+
+    regressions = []
+    if baseline_path and os.path.exists(baseline_path):
+        with open(baseline_path, encoding='utf-8') as f:
+            baseline = json.load(f)
+        for group, values in report.items():
+            for name, ms in values.items():
+                before = baseline.get(group, {}).get(name)
+                if ms is not None and before and ms > before * (1 + tolerance):
+                    regressions.append(f"{group}/{name}: {before} ms -> {ms} ms")
+        for line in regressions:
+            print("  REGRESSION", line)
+
+    if save_path:
+        with open(save_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    return report, regressions
+
+def run_tile_command(args):
+    """Entry point for the 'tile' command: one keyword over a tiled area"""
+    store = ResultStore(args.store) if args.store else None
+    extractor = GoogleMapsExtractor(
+        headless=True, lean=args.lean, store=store, extraction_mode=args.extraction, payload_dir=args.record_payloads
+    )
+    try:
+        bbox = parse_bbox(args.bbox) if args.bbox else None
+        rows, cols = (int(value) for value in args.grid.lower().split('x'))
+        stats = extractor.search_tiled(
+            args.keyword, args.location, args.max_results, bbox=bbox, workers=args.workers,
+            rows=rows, cols=cols, max_depth=args.max_depth,
+            scheduler=RequestScheduler(args.rate_limit, args.session_rate)
+        )
+    finally:
+        if store:
+            store.close()
+
+    print("=" * 60)
+    print("TILING SUMMARY")
+    print("=" * 60)
+    print(f"Tiles searched: {stats['tiles']}")
+    print(f"Unique places: {stats['unique_places']} of {stats['results']} results "
+          f"(duplicate rate {stats['duplicate_rate']:.0%})")
+    print(f"Area fully listed: {stats['fully_listed_area']:.0%}")
+    print(f"Blocks by Google: {stats['blocks']}")
+    for depth, level in stats['by_depth'].items():
+        print(f"  depth {depth}: {level['tiles']} tiles, {level['dense']} dense, "
+              f"{level['new_per_tile']} new places/tile, {level['duplicate_rate']:.0%} duplicates")
+
+    success, message = extractor.save_to_file(args.output)
+    print(message)
+    return 0 if success else 1
+
+def run_parse_payloads_command(args):
+    """Entry point for 'parse-payloads': check recorded Maps responses offline
+
+    Every file (or every file in a folder) is parsed as a captured response
+    body; with --output the places are exported as records. Fails if any
+    file cannot be decoded or, with --require-places, holds no places.
+    """
+    paths = []
+    for path in args.paths:
+        if os.path.isdir(path):
+            paths.extend(sorted(os.path.join(path, name) for name in os.listdir(path)))
+        else:
+            paths.append(path)
+
+    extractor = GoogleMapsExtractor()
+    extractor.current_keyword = args.keyword
+    extractor.current_location = args.location
+    failures = 0
+    seen = set()
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            body = f.read()
+        try:
+            places = parse_maps_payload(body)
+        except ValueError as e:
+            print(f"{path}: could not decode ({e})")
+            failures += 1
+            continue
+        with_phone = sum(1 for place in places if place['phone'])
+        with_website = sum(1 for place in places if place['website'])
+        print(f"{path}: {len(places)} places, {with_phone} with phone, {with_website} with website")
+        if not places and args.require_places:
+            failures += 1
+        for place in places:
+            business = extractor._build_payload_record(place)
+            if business_key(business) not in seen:
+                seen.add(business_key(business))
+                extractor.results.append(business)
+
+    print(f"{len(extractor.results)} unique places from {len(paths)} files, {failures} failed")
+    if args.output and extractor.results:
+        success, message = extractor.save_to_file(args.output)
+        print(message)
+        failures += 0 if success else 1
+    return 1 if failures or not paths else 0
+
+def run_export_command(args):
+    """Entry point for the 'export' command: dump records from the result store"""
+    store = ResultStore(args.store)
+    try:
+        if args.new_since_last_run:
+            records = store.new_since_last_run(args.keyword, args.location)
+        else:
+            records = list(store.iter_records(args.keyword, args.location, since=args.since))
+    finally:
+        store.close()
+
+    if not records:
+        print("No matching records in", args.store)
+        return 1
+
+    extractor = GoogleMapsExtractor()
+    extractor.current_keyword = args.keyword or "All"
+    extractor.current_location = args.location or "All"
+    if args.clean or args.min_rating or args.min_reviews or args.has_website or args.drop_duplicates or args.sort_by:
+        records = extractor.postprocess(
+            records, country_code=args.country_code, min_rating=args.min_rating, min_reviews=args.min_reviews,
+            has_website=args.has_website, drop_duplicates=args.drop_duplicates, sort_by=args.sort_by,
+            descending=args.sort_by != 'Business Name'
+        )
+    success, message = extractor.save_to_file(args.output, args.format, records, compression=args.compression)
+    print(message)
+    return 0 if success else 1
+
+def synthetic_records(count, keyword="gym", location="Delhi"):
+    """Generate realistic-looking business records for benchmarks"""
+    scraped_date = datetime.now().strftime("%Y-%m-%d")
+    for index in range(count):
+        yield {
+            'Sr No.': index + 1,
+            'Business Name': f"Business {index} {keyword.title()} Centre",
+            'Address': f"{index % 500} Main Road, Sector {index % 60}, {location} 1100{index % 100:02d}",
+            'Phone': f"+91 98{index % 100000000:08d}",
+            'Website': f"https://business{index}.example.com/",
+            'Rating': f"{3 + (index % 20) / 10:.1f}",
+            'Reviews': f"({(index * 37) % 5000:,})",
+            'Category': keyword,
+            'Location': location,
+            'Scraped Date': scraped_date,
+            'Place URL': f"https://www.google.com/maps/place/Business+{index}/data=!4m2!3m1!19sChIJbench{index:08d}",
+        }
+
+def _peak_memory_mb():
+    """Peak RSS of this process in MB, or None where it cannot be read"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+def _bench_excel_case(method, rows, path):
+    """Run one Excel export case and print its timing as JSON (child process)"""
+    start = time.perf_counter()
+    if method == 'dataframe':
+        import pandas as pd
+
+        records = list(synthetic_records(rows))
+        pd.DataFrame(records).to_excel(path, index=False)
+    else:
+        writer = ExcelStreamWriter(path, excel_sheet_name("gym", "Delhi"))
+        for record in synthetic_records(rows):
+            writer.write(record)
+        writer.close()
+    print(json.dumps({
+        'seconds': round(time.perf_counter() - start, 2),
+        'peak_rss_mb': _peak_memory_mb(),
+    }))
+
+def run_excel_benchmark(sizes=(1000, 10000, 100000), output_dir=None):
+    """Compare the DataFrame export with the streaming writer
+
+    Each case runs in a fresh interpreter so peak RSS is not shared between
+    cases.
+    """
+    import tempfile
+
+    output_dir = output_dir or tempfile.mkdtemp(prefix="excel_bench_")
+    module_dir = os.path.dirname(os.path.abspath(__file__))
+    report = []
+    print(f"{'rows':>8} {'method':<10} {'seconds':>8} {'peak RSS MB':>12}")
+    for rows in sizes:
+        for method in ('dataframe', 'streaming'):
+            path = os.path.join(output_dir, f"{method}_{rows}.xlsx")
+            code = (
+                "import google_maps_scraper as g; "
+                f"g._bench_excel_case({method!r}, {rows}, {path!r})"
+            )
+            output = subprocess.run(
+                [sys.executable, "-c", code], capture_output=True, text=True, cwd=module_dir
+            )
+            if output.returncode != 0:
+                print(f"{rows:>8} {method:<10} failed: {output.stderr.strip()[-200:]}")
+                continue
+            result = json.loads(output.stdout.strip().splitlines()[-1])
+            result.update({'rows': rows, 'method': method})
+            report.append(result)
+            print(f"{rows:>8} {method:<10} {result['seconds']:>8} {str(result['peak_rss_mb']):>12}")
+    return report
+
+# A local stand-in for the Maps results page: a search box, a role='feed'
+# container that loads cards from the fixture server as it is scrolled, a
+# "Show more results" button every few batches, a loading spinner and the
+# end-of-list marker. __CONFIG__ is replaced with the page's settings.
+FIXTURE_PAGE_HTML = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Maps feed fixture</title>
+<style>
+#feed { height: 600px; width: 420px; overflow-y: auto; }
+div[role='article'] { height: 96px; border-bottom: 1px solid #ddd; }
+#spinner { display: none; }
+</style></head>
+<body>
+<input id="searchboxinput" type="text">
+<div id="pane"></div>
+<script>
+var cfg = __CONFIG__;
+var feed = null, spinner = null, button = null;
+var loaded = 0, sinceButton = 0, loading = false;
+
+function loadMore() {
+    if (loading || loaded >= cfg.total || button.style.display === 'block') {
+        return;
+    }
+    loading = true;
+    spinner.style.display = 'block';
+    var limit = Math.min(cfg.batch, cfg.total - loaded);
+    fetch('/cards?offset=' + loaded + '&limit=' + limit).then(function (response) {
+        return response.json();
+    }).then(function (cards) {
+        setTimeout(function () {
+            var holder = document.createElement('div');
+            holder.innerHTML = cards.join('');
+            while (holder.firstChild) {
+                feed.insertBefore(holder.firstChild, spinner);
+            }
+            loaded += cards.length;
+            sinceButton += cards.length;
+            loading = false;
+            spinner.style.display = 'none';
+            if (loaded >= cfg.total || cards.length === 0) {
+                var end = document.createElement('div');
+                end.textContent = "You've reached the end of the list.";
+                feed.appendChild(end);
+            } else if (cfg.showMoreEvery && sinceButton >= cfg.showMoreEvery) {
+                button.style.display = 'block';
+            }
+        }, cfg.latency);
+    });
+}
+
+function search() {
+    var pane = document.getElementById('pane');
+    pane.innerHTML = '<div role="feed" id="feed"><div role="progressbar" id="spinner">Loading</div></div>'
+        + '<button id="more" style="display:none">Show more results</button>';
+    feed = document.getElementById('feed');
+    spinner = document.getElementById('spinner');
+    button = document.getElementById('more');
+    feed.addEventListener('scroll', function () {
+        if (feed.scrollTop + feed.clientHeight >= feed.scrollHeight - 50) {
+            loadMore();
+        }
+    });
+    button.addEventListener('click', function () {
+        button.style.display = 'none';
+        sinceButton = 0;
+        loadMore();
+    });
+    loadMore();
+}
+
+document.getElementById('searchboxinput').addEventListener('keydown', function (event) {
+    if (event.key === 'Enter') {
+        search();
+    }
+});
+</script>
+</body></html>
+"""
+
+def fixture_card_html(index):
+    """Synthetic result card using the markup the card XPaths expect"""
+    return (
+        f'<div role="article">'
+        f'<a href="/maps/place/Fixture+Place+{index}/data=!4m7!3m6!1s0x0:0x{index:x}'
+        f'!8m2!3d28.6{index % 1000:03d}!4d77.2{index % 997:03d}!19sChIJfixture{index:08d}"></a>'
+        f'<div role="heading"><span>Fixture Place {index}</span></div>'
+        f'<span role="img" aria-label="{3 + (index % 20) / 10:.1f} stars"></span>'
+        f'<span>({(index * 37) % 5000:,} reviews)</span>'
+        f'<div>Gym · </div><div>{index % 500} Fixture Road, Sector {index % 60}, Delhi 1100{index % 100:02d}</div>'
+        f'</div>'
+    )
+
+class FeedFixtureServer:
+    """Serve a Maps-like results feed from a local HTTP server
+
+    /maps?total=N&batch=B&latency=MS&show_more_every=K returns the fixture
+    page and /cards?offset=&limit= its cards, generated synthetically or
+    taken from recorded card HTML (a JSON list, see record_feed_fixture).
+    """
+
+    def __init__(self, recorded=None, host="127.0.0.1", port=0):
+        self.recorded = recorded
+        self.host = host
+        self.port = port
+        self._server = None
+
+    def cards(self, offset, limit):
+        if self.recorded is not None:
+            return self.recorded[offset:offset + limit]
+        return [fixture_card_html(index) for index in range(offset, offset + limit)]
+
+    def start(self):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        from urllib.parse import parse_qs, urlparse
+
+        fixture = self
+
+        class FixtureHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                params = {key: int(values[0]) for key, values in parse_qs(url.query).items()}
+                if url.path == '/maps':
+                    total = params.get('total', 100)
+                    if fixture.recorded is not None:
+                        total = min(total, len(fixture.recorded))
+                    config = {
+                        'total': total,
+                        'batch': params.get('batch', 20),
+                        'latency': params.get('latency', 100),
+                        'showMoreEvery': params.get('show_more_every', 0),
+                    }
+                    body = FIXTURE_PAGE_HTML.replace('__CONFIG__', json.dumps(config))
+                    content_type = 'text/html; charset=utf-8'
+                elif url.path == '/cards':
+                    body = json.dumps(fixture.cards(params.get('offset', 0), params.get('limit', 20)))
+                    content_type = 'application/json'
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), FixtureHandler)
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def url(self, total, batch=20, latency=100, show_more_every=0):
+        return (
+            f"http://{self.host}:{self.port}/maps?total={total}&batch={batch}"
+            f"&latency={latency}&show_more_every={show_more_every}"
+        )
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+def _bench_feed_case(server, size, latency, output_dir, headless=True):
+    """Extract `size` cards from the fixture end to end, then time each export"""
+    url = server.url(size, latency=latency, show_more_every=max(60, size // 4))
+    extractor = GoogleMapsExtractor(headless=headless, scroll_timeout=max(3, latency / 250), maps_url=url)
+    if not extractor.setup_driver():
+        raise RuntimeError("Failed to start Chrome")
+    try:
+        if not extractor.open_google_maps() or not extractor.search_businesses("gym", "Fixture"):
+            raise RuntimeError("Fixture page did not load")
+        start = time.perf_counter()
+        count = extractor.stream_results(size)
+        seconds = time.perf_counter() - start
+        scrolls = extractor.wait_summary().get('result_count_changed', {})
+        round_trips = extractor.metrics.summary()['phases'].get('stream_results', {}).get('round_trips', 0)
+    finally:
+        extractor.close_driver()
+
+    exports = {}
+    for file_format, name in (('excel', 'feed.xlsx'), ('pdf', 'feed.pdf'), ('csv', 'feed.csv'), ('jsonl', 'feed.jsonl')):
+        path = os.path.join(output_dir, f"{size}_{name}")
+        export_start = time.perf_counter()
+        extractor.save_to_file(path, file_format)
+        exports[file_format] = round(time.perf_counter() - export_start, 3)
+
+    return {
+        'cards': count,
+        'seconds': round(seconds, 2),
+        'cards_per_second': round(count / seconds, 1) if seconds else 0.0,
+        'scroll_latency_ms': round(scrolls['total_seconds'] / scrolls['count'] * 1000, 1) if scrolls.get('count') else None,
+        'round_trips': round_trips,
+        'export_seconds': exports,
+    }
+
+def run_feed_benchmark(sizes=(100, 500, 1000), latency=100, recorded_path=None, baseline_path=None,
+                       save_path=None, tolerance=0.2, headless=True):
+    """Benchmark end-to-end extraction against the local feed fixture
+
+    Drives GoogleMapsExtractor in Chrome at each feed size and reports
+    cards/sec, mean scroll latency and export times. Compares against a
+    saved baseline when given and flags anything more than tolerance worse.
+    """
+    import tempfile
+
+    recorded = None
+    if recorded_path:
+        with open(recorded_path, encoding='utf-8') as f:
+            recorded = json.load(f)
+    server = FeedFixtureServer(recorded).start()
+    output_dir = tempfile.mkdtemp(prefix="feed_bench_")
+    report = {}
+    try:
+        for size in sizes:
+            report[str(size)] = _bench_feed_case(server, size, latency, output_dir, headless)
+    finally:
+        server.stop()
+
+    print(f"Feed benchmark ({'recorded' if recorded else 'synthetic'} cards, {latency} ms load latency)")
+    print(f"{'size':>6} {'cards':>6} {'cards/s':>8} {'scroll ms':>10} {'trips':>6}  exports (s)")
+    for size, result in report.items():
+        exports = ", ".join(f"{name} {seconds}" for name, seconds in result['export_seconds'].items())
+        print(f"{size:>6} {result['cards']:>6} {result['cards_per_second']:>8} "
+              f"{str(result['scroll_latency_ms']):>10} {result['round_trips']:>6}  {exports}")
+
+    regressions = []
+    if baseline_path and os.path.exists(baseline_path):
+        with open(baseline_path, encoding='utf-8') as f:
+            baseline = json.load(f)
+        for size, result in report.items():
+            before = baseline.get(size)
+            if not before:
+                continue
+            if before.get('cards_per_second') and result['cards_per_second'] < before['cards_per_second'] * (1 - tolerance):
+                regressions.append(f"{size}/cards_per_second: {before['cards_per_second']} -> {result['cards_per_second']}")
+            checks = [('scroll_latency_ms', result['scroll_latency_ms'], before.get('scroll_latency_ms'))]
+            checks += [(f"export_seconds/{name}", seconds, before.get('export_seconds', {}).get(name))
+                       for name, seconds in result['export_seconds'].items()]
+            for name, now, then in checks:
+                if now is not None and then and now > then * (1 + tolerance):
+                    regressions.append(f"{size}/{name}: {then} -> {now}")
+        for line in regressions:
+            print("  REGRESSION", line)
+
+    if save_path:
+        with open(save_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    return report, regressions
+
+def _deep_size(objects):
+    """Bytes held by a list of records, counting each distinct object once"""
+    seen = set()
+    total = 0
+    stack = [objects]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple)):
+            stack.extend(obj)
+        elif isinstance(obj, BusinessRecord):
+            stack.extend(getattr(obj, name) for name in BusinessRecord.__slots__)
+    return total
+
+def run_record_benchmark(count=100000):
+    """Compare the memory held by record dicts and BusinessRecord objects
+
+    The dicts are built the way extraction used to build them, with a fresh
+    date string per record and Rating/Reviews kept as text.
+    """
+    dicts = []
+    for record in synthetic_records(count):
+        record['Scraped Date'] = datetime.now().strftime("%Y-%m-%d")
+        dicts.append(record)
+    start = time.perf_counter()
+    records = [BusinessRecord.from_dict(record) for record in dicts]
+    convert_seconds = time.perf_counter() - start
+
+    dict_mb = _deep_size(dicts) / (1024 * 1024)
+    record_mb = _deep_size(records) / (1024 * 1024)
+    report = {
+        'records': count,
+        'dict_mb': round(dict_mb, 1),
+        'business_record_mb': round(record_mb, 1),
+        'saved_percent': round((1 - record_mb / dict_mb) * 100, 1),
+        'bytes_per_dict': round(dict_mb * 1024 * 1024 / count),
+        'bytes_per_record': round(record_mb * 1024 * 1024 / count),
+        'from_dict_seconds': round(convert_seconds, 2),
+    }
+    print(f"{count} records")
+    print(f"  list of dicts    {report['dict_mb']:>8} MB  ({report['bytes_per_dict']} bytes each)")
+    print(f"  BusinessRecord   {report['business_record_mb']:>8} MB  ({report['bytes_per_record']} bytes each)")
+    print(f"  saved            {report['saved_percent']:>8} %   (conversion took {report['from_dict_seconds']}s)")
+    return report
+
+def build_arg_parser():
+    """Command line options; with no command the GUI is started"""
+    parser = argparse.ArgumentParser(description="Google Maps Business Extractor")
+    subparsers = parser.add_subparsers(dest='command')
+
+    batch = subparsers.add_parser('batch', help="Run many queries headless from a CSV/JSONL file")
+    batch.add_argument('queries', help="CSV or JSONL file with keyword and location columns")
+    batch.add_argument('-o', '--output', default='batch_results.jsonl', help="File (or Parquet folder) results are appended to")
+    batch.add_argument('-f', '--format', default='jsonl', choices=['jsonl', 'csv', 'parquet'],
+                       help="jsonl writes one line per query; csv/parquet write one row per business")
+    batch.add_argument('--compression', help="'gzip' for jsonl/csv, or a Parquet codec (snappy, zstd, gzip)")
+    batch.add_argument('-w', '--workers', type=int, default=2, help="Number of Chrome worker processes")
+    batch.add_argument('-t', '--timeout', type=float, default=300, help="Per-query timeout in seconds")
+    batch.add_argument('-m', '--max-results', type=int, default=50, help="Default max results per query")
+    batch.add_argument('--recycle-after', type=int, default=25, help="Restart a worker's Chrome after this many queries")
+    batch.add_argument('--max-memory-mb', type=float, default=2048, help="Restart a worker's Chrome past this much memory (RSS with psutil, else JS heap)")
+    batch.add_argument('--store', help="SQLite result store to upsert every business into")
+    batch.add_argument('--refresh-ttl', type=float, help="Skip detail work for places refreshed within this many seconds")
+    batch.add_argument('--lean', action='store_true',
+                       help="Block images, fonts, media and map tiles in a small headless window")
+    batch.add_argument('--enrich', type=int, default=0, metavar='N',
+                       help="Read phone/website from place pages using N extra sessions per worker")
+    batch.add_argument('--metrics-dir', metavar='DIR',
+                       help="Write per-worker phase metrics here as JSON traces and Prometheus .prom files")
+    batch.add_argument('--cache', default=QUERY_CACHE_PATH, help="Query cache database")
+    batch.add_argument('--cache-ttl', type=float, default=QUERY_CACHE_TTL, metavar='SECONDS',
+                       help="Serve queries finished within this long from the cache; 0 disables it")
+    batch.add_argument('--refresh', action='store_true', help="Run every query even if it is cached")
+    batch.add_argument('--rate-limit', type=float, default=RATE_LIMIT_PER_HOUR, metavar='N',
+                       help="Queries per hour across all workers; halved on each block, then recovers")
+    batch.add_argument('--session-rate', type=float, default=SESSION_RATE_PER_HOUR, metavar='N',
+                       help="Queries per hour for each browser session")
+    batch.add_argument('--retries', type=int, default=QUERY_RETRIES,
+                       help="Times a blocked or failed query is retried on a fresh session")
+    batch.add_argument('--extraction', default='dom', choices=EXTRACTION_MODES,
+                       help="Read results from feed cards (dom) or captured search responses (network)")
+    batch.add_argument('--record-payloads', metavar='DIR', help="Save captured Maps responses here (network mode)")
+    batch.add_argument('--checkpoint-dir', metavar='DIR',
+                       help="Journal each query here; rerunning resumes queries that did not finish")
+
+    tile = subparsers.add_parser('tile', help="Tile a location's area to get past the feed's result cap")
+    tile.add_argument('keyword', help="What to search for, e.g. gym")
+    tile.add_argument('location', help="Area to cover, e.g. Delhi")
+    tile.add_argument('-o', '--output', default='tiled_results.xlsx', help="Output file (.xlsx, .csv, .jsonl, ...)")
+    tile.add_argument('-m', '--max-results', type=int, default=1000, help="Stop once this many unique places are found")
+    tile.add_argument('-w', '--workers', type=int, default=2, help="Tiles searched in parallel")
+    tile.add_argument('--bbox', help="south,west,north,east instead of looking the location up")
+    tile.add_argument('--grid', default="3x3", help="Initial tiles as ROWSxCOLS")
+    tile.add_argument('--max-depth', type=int, default=2, help="Times a dense tile may be split in four")
+    tile.add_argument('--lean', action='store_true', help="Block images, fonts, media and map tiles")
+    tile.add_argument('--store', help="SQLite result store to upsert every business into")
+    tile.add_argument('--rate-limit', type=float, default=RATE_LIMIT_PER_HOUR, metavar='N',
+                      help="Tile searches per hour across all workers; halved on each block, then recovers")
+    tile.add_argument('--session-rate', type=float, default=SESSION_RATE_PER_HOUR, metavar='N',
+                      help="Tile searches per hour for each browser session")
+    tile.add_argument('--extraction', default='dom', choices=EXTRACTION_MODES,
+                      help="Read results from feed cards (dom) or captured search responses (network)")
+    tile.add_argument('--record-payloads', metavar='DIR', help="Save captured Maps responses here (network mode)")
+
+    payloads = subparsers.add_parser('parse-payloads', help="Parse recorded Maps responses into records, offline")
+    payloads.add_argument('paths', nargs='+', help="Recorded response files or folders of them")
+    payloads.add_argument('-o', '--output', help="Export the parsed places to this file")
+    payloads.add_argument('--keyword', default='', help="Category to record the places under")
+    payloads.add_argument('--location', default='', help="Location to record the places under")
+    payloads.add_argument('--require-places', action='store_true', help="Fail for files without any places")
+
+    export = subparsers.add_parser('export', help="Export records from the SQLite result store")
+    export.add_argument('output', help="Output file (.xlsx, .pdf, .jsonl, .csv) or Parquet folder")
+    export.add_argument('-f', '--format', choices=list(EXPORT_FORMATS),
+                        help="Output format; guessed from the output name by default")
+    export.add_argument('--compression', help="'gzip' for jsonl/csv, or a Parquet codec (snappy, zstd, gzip)")
+    export.add_argument('--store', default=DEFAULT_STORE_PATH, help="SQLite result store")
+    export.add_argument('--keyword', help="Only this keyword")
+    export.add_argument('--location', help="Only this location")
+    export.add_argument('--since', help="Only places first seen at or after this ISO timestamp")
+    export.add_argument('--new-since-last-run', action='store_true', help="Only places new since the previous run")
+    export.add_argument('--clean', action='store_true',
+                        help="Numeric rating/reviews, E.164 phones, tidy addresses and a 'Duplicate Of' column")
+    export.add_argument('--country-code', type=parse_country_code, default=DEFAULT_COUNTRY_CODE,
+                        help=f"Calling code for phones written without one, e.g. 1 or 44 (default {DEFAULT_COUNTRY_CODE})")
+    export.add_argument('--min-rating', type=float, help="Only places rated at least this (implies --clean)")
+    export.add_argument('--min-reviews', type=int, help="Only places with at least this many reviews (implies --clean)")
+    export.add_argument('--has-website', action='store_true', help="Only places with a website (implies --clean)")
+    export.add_argument('--drop-duplicates', action='store_true', help="Leave out near-duplicate listings (implies --clean)")
+    export.add_argument('--sort-by', choices=['Rating', 'Reviews', 'Business Name'],
+                        help="Sort descending by this column (implies --clean)")
+
+    queue_add = subparsers.add_parser('queue-add', help="Add queries to a distributed job queue")
+    queue_add.add_argument('queries', help="CSV or JSONL file with keyword and location columns")
+    queue_add.add_argument('--queue', default=JOB_QUEUE_PATH, help="Job queue database")
+    queue_add.add_argument('-m', '--max-results', type=int, default=50, help="Default max results per query")
+
+    queue_serve = subparsers.add_parser('queue-serve', help="Serve a job queue over HTTP to workers on other machines")
+    queue_serve.add_argument('--queue', default=JOB_QUEUE_PATH, help="Job queue database")
+    queue_serve.add_argument('--host', default="127.0.0.1", help="Interface to listen on; 0.0.0.0 for other machines")
+    queue_serve.add_argument('--port', type=int, default=JOB_QUEUE_PORT, help="Port to listen on")
+    queue_serve.add_argument('--token', help="Shared secret workers must send")
+    queue_serve.add_argument('--lease', type=float, default=JOB_LEASE_SECONDS,
+                             help="Seconds a job stays leased without a heartbeat")
+
+    queue_worker = subparsers.add_parser('queue-worker', help="Run jobs from a queue file or coordinator URL")
+    queue_worker.add_argument('--queue', default=JOB_QUEUE_PATH,
+                              help="Job queue database shared with the other workers, or a queue-serve URL")
+    queue_worker.add_argument('--token', help="Shared secret of the coordinator")
+    queue_worker.add_argument('--name', help="Worker name shown in queue-status (default host-pid)")
+    queue_worker.add_argument('-p', '--processes', type=int, default=1, help="Worker processes to run on this machine")
+    queue_worker.add_argument('--idle-exit', type=float, metavar='SECONDS',
+                              help="Stop once the queue has been empty this long (default: keep polling)")
+    queue_worker.add_argument('--rate-limit', type=float, default=SESSION_RATE_PER_HOUR, metavar='N',
+                              help="Queries per hour for each worker process; halved on each block, then recovers")
+    queue_worker.add_argument('--recycle-after', type=int, default=25, help="Restart Chrome after this many queries")
+    queue_worker.add_argument('--lean', action='store_true', help="Block images, fonts, media and map tiles")
+    queue_worker.add_argument('--extraction', default='dom', choices=EXTRACTION_MODES,
+                              help="Read results from feed cards (dom) or captured search responses (network)")
+
+    queue_status = subparsers.add_parser('queue-status', help="Show job counts and worker heartbeats")
+    queue_status.add_argument('--queue', default=JOB_QUEUE_PATH, help="Job queue database or queue-serve URL")
+    queue_status.add_argument('--token', help="Shared secret of the coordinator")
+
+    queue_export = subparsers.add_parser('queue-export', help="Export the businesses of every finished job")
+    queue_export.add_argument('output', help="Output file (.xlsx, .pdf, .jsonl, .csv) or Parquet folder")
+    queue_export.add_argument('--queue', default=JOB_QUEUE_PATH, help="Job queue database")
+
+    bench = subparsers.add_parser('bench-startup', help="Measure import and driver-resolution startup time")
+    bench.add_argument('--runs', type=int, default=5, help="Fresh interpreters per measurement")
+    bench.add_argument('--baseline', help="JSON report to compare against")
+    bench.add_argument('--save', help="Write this run's report to a JSON file")
+
+    bench_excel = subparsers.add_parser('bench-excel', help="Compare DataFrame and streaming Excel export")
+    bench_excel.add_argument('--rows', default="1000,10000,100000", help="Comma-separated row counts")
+    bench_excel.add_argument('--output-dir', help="Where to write the benchmark workbooks")
+
+    bench_records = subparsers.add_parser('bench-records', help="Compare record dicts with BusinessRecord memory")
+    bench_records.add_argument('--count', type=int, default=100000, help="Number of records to build")
+
+    bench_feed = subparsers.add_parser('bench-feed', help="Benchmark extraction against a local Maps-like fixture")
+    bench_feed.add_argument('--sizes', default="100,500,1000", help="Comma-separated feed sizes")
+    bench_feed.add_argument('--latency', type=int, default=100, help="Milliseconds the fixture takes per batch")
+    bench_feed.add_argument('--recorded', help="JSON list of recorded card HTML to serve instead of synthetic cards")
+    bench_feed.add_argument('--baseline', help="JSON report to compare against")
+    bench_feed.add_argument('--save', help="Write this run's report to a JSON file")
+    bench_feed.add_argument('--show-browser', action='store_true', help="Run Chrome with a window")
+
+    return parser
+
+def main(argv=None):
+    """Main function to run the application"""
+    args = build_arg_parser().parse_args(argv)
+    if args.command == 'batch':
+        return run_batch_command(args)
+    if args.command == 'export':
+        return run_export_command(args)
+    if args.command == 'tile':
+        return run_tile_command(args)
+    if args.command == 'parse-payloads':
+        return run_parse_payloads_command(args)
+    if args.command and args.command.startswith('queue-'):
+        return run_queue_command(args)
+    if args.command == 'bench-startup':
+        _, regressions = run_startup_benchmark(args.runs, args.baseline, args.save)
+        return 1 if regressions else 0
+    if args.command == 'bench-excel':
+        run_excel_benchmark([int(rows) for rows in args.rows.split(',')], args.output_dir)
+        return 0
+    if args.command == 'bench-records':
+        run_record_benchmark(args.count)
+        return 0
+    if args.command == 'bench-feed':
+        _, regressions = run_feed_benchmark(
+            [int(size) for size in args.sizes.split(',')], args.latency, args.recorded,
+            args.baseline, args.save, headless=not args.show_browser
+        )
+        return 1 if regressions else 0
+
+    print("=" * 60)
+    print("GOOGLE MAPS BUSINESS EXTRACTOR")
+    print("=" * 60)
+    print("\nWebdriver-manager installed - No manual ChromeDriver needed!")
+    print("Starting GUI application...")
+    
+    app = GoogleMapsExtractorGUI()
+    app.run()
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    
+    # Check for required packages
+    required_packages = ['selenium', 'pandas', 'openpyxl', 'reportlab', 'webdriver-manager']
+    
+    print("Checking for required packages...")
+    for package in required_packages:
+        # find_spec checks availability without paying for the import
+        if importlib.util.find_spec(package.replace('-', '_')) is None:
+            print(f"Please install {package} using: pip install {package}")
+    
+    sys.exit(main())
\ No newline at end of file
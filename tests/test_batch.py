@@ -0,0 +1,86 @@
+import json
+import os
+import time
+
+import pytest
+
+import google_maps_scraper as scraper
+from gmaps import scheduling
+from google_maps_scraper import BatchRunner, BusinessRecord, QueryCache, RequestScheduler, load_queries
+
+
+def fake_run_query(self, keyword, location, max_results):
+    """Search stub run inside the worker processes"""
+    if keyword == 'slow':
+        time.sleep(30)
+    if keyword == 'bad':
+        raise RuntimeError("Search failed")
+    if keyword == 'blocked':
+        raise scraper.BlockedError('captcha')
+    if keyword == 'flaky':
+        # Fails on the first attempt only; the marker file survives the worker restart
+        marker = os.path.join(location, 'flaky_seen')
+        if not os.path.exists(marker):
+            open(marker, 'w').close()
+            raise RuntimeError("Transient failure")
+    return [BusinessRecord(serial=i, name=f"{keyword} {i}") for i in range(1, 4)]
+
+
+@pytest.fixture
+def stub_workers(monkeypatch):
+    monkeypatch.setattr(scraper.GoogleMapsExtractor, 'setup_driver', lambda self: True)
+    monkeypatch.setattr(scraper.GoogleMapsExtractor, 'close_driver', lambda self, discard=False: None)
+    monkeypatch.setattr(scraper.GoogleMapsExtractor, 'run_query', fake_run_query)
+    monkeypatch.setattr(scheduling, 'BLOCK_BACKOFF_SECONDS', 0.01)
+
+
+def run_batch(tmp_path, keywords, cache=None, retries=1, timeout=60):
+    queries = [{'keyword': keyword, 'location': str(tmp_path), 'max_results': 3} for keyword in keywords]
+    output = tmp_path / "out.jsonl"
+    runner = BatchRunner(queries, str(output), workers=2, query_timeout=timeout,
+                         scheduler=RequestScheduler(1e6, 1e6, max_retries=retries), cache=cache)
+    summary = runner.run()
+    with open(output, encoding='utf-8') as f:
+        lines = {line['keyword']: line for line in map(json.loads, f)}
+    return summary, lines
+
+
+def test_failed_queries_are_retried(tmp_path, stub_workers):
+    summary, lines = run_batch(tmp_path, ['gym', 'flaky', 'bad', 'blocked'])
+    assert {keyword: line['status'] for keyword, line in lines.items()} == {
+        'gym': 'ok', 'flaky': 'ok', 'bad': 'error', 'blocked': 'blocked'
+    }
+    assert lines['flaky']['count'] == 3
+    assert (summary['ok'], summary['errors'], summary['blocked']) == (2, 1, 1)
+    # flaky, bad and blocked were each retried once
+    assert summary['retries'] == 3
+    assert summary['blocks_seen'] == 2
+
+
+def test_overrunning_query_times_out_without_blocking_others(tmp_path, stub_workers):
+    summary, lines = run_batch(tmp_path, ['slow', 'gym', 'cafe'], timeout=2)
+    assert lines['slow']['status'] == 'timeout'
+    assert lines['gym']['status'] == lines['cafe']['status'] == 'ok'
+    assert summary['timeouts'] == 1
+
+
+def test_cached_queries_are_skipped(tmp_path, stub_workers):
+    cache = QueryCache(str(tmp_path / "cache.db"))
+    try:
+        cache.put('gym', str(tmp_path), 3, [BusinessRecord(name="cached gym")])
+        summary, lines = run_batch(tmp_path, ['gym', 'cafe'], cache=cache)
+    finally:
+        cache.close()
+    assert lines['gym']['cached'] is True
+    assert [record['Business Name'] for record in lines['gym']['results']] == ["cached gym"]
+    assert lines['cafe']['cached'] is False
+    assert (summary['cache_hits'], summary['cache_misses']) == (1, 1)
+
+
+def test_load_queries_skips_incomplete_rows(tmp_path):
+    path = tmp_path / "queries.csv"
+    path.write_text("keyword,location,max_results\ngym,Delhi,\ncafe,,10\n,Pune,5\nspa,Goa,7\n", encoding='utf-8')
+    assert load_queries(str(path), 50) == [
+        {'keyword': 'gym', 'location': 'Delhi', 'max_results': 50},
+        {'keyword': 'spa', 'location': 'Goa', 'max_results': 7},
+    ]
@@ -0,0 +1,107 @@
+import json
+
+from gmaps.records import BusinessRecord
+from gmaps.sinks import CallbackSink
+from gmaps.storage import CheckpointJournal, ResultStore
+from google_maps_scraper import GoogleMapsExtractor
+
+
+def make_records(start, count):
+    return [
+        BusinessRecord.from_dict({'Business Name': f"Gym {i}", 'Address': f"{i} Main Road",
+                                  'Place URL': f"https://www.google.com/maps/place/gym{i}/data=!1s0x{i:x}:0x{i:x}"})
+        for i in range(start, start + count)
+    ]
+
+
+def test_resume_after_torn_tail(tmp_path):
+    path = tmp_path / "gym_delhi.jsonl"
+    journal = CheckpointJournal(str(path), "gym", "Delhi", 100)
+    journal.checkpoint(make_records(0, 20), depth=20)
+    journal.close()
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"type": "rec')
+
+    journal = CheckpointJournal(str(path), "gym", "Delhi", 100)
+    assert journal.resumed_count == 20
+    journal.checkpoint(make_records(20, 2), depth=22)
+    journal.close()
+
+    with open(path, encoding='utf-8') as f:
+        entries = [json.loads(line) for line in f]
+    assert [entry['type'] for entry in entries] == ['start', 'records', 'records']
+
+    journal = CheckpointJournal(str(path), "gym", "Delhi", 100)
+    assert journal.resumed_count == 22
+    assert journal.state['depth'] == 22
+    journal.close()
+
+
+def test_unterminated_last_line_is_dropped(tmp_path):
+    path = tmp_path / "gym_delhi.jsonl"
+    journal = CheckpointJournal(str(path), "gym", "Delhi", 100)
+    journal.checkpoint(make_records(0, 5), depth=5)
+    journal.close()
+    # A crash right before the newline leaves valid JSON without its terminator
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps({'type': 'records', 'depth': 6, 'place_ids': [], 'records': []}))
+
+    journal = CheckpointJournal(str(path), "gym", "Delhi", 100)
+    journal.checkpoint(make_records(5, 1), depth=6)
+    journal.close()
+    journal = CheckpointJournal(str(path), "gym", "Delhi", 100)
+    assert journal.resumed_count == 6
+    journal.close()
+
+
+def test_different_limit_starts_over(tmp_path):
+    path = tmp_path / "gym_delhi.jsonl"
+    journal = CheckpointJournal(str(path), "gym", "Delhi", 100)
+    journal.checkpoint(make_records(0, 10), depth=10)
+    journal.close()
+
+    journal = CheckpointJournal(str(path), "gym", "Delhi", 50)
+    assert journal.resumed_count == 0
+    journal.close()
+    with open(path, encoding='utf-8') as f:
+        assert json.loads(f.readline())['query']['max_results'] == 50
+
+
+def test_finished_journal_starts_over(tmp_path):
+    path = tmp_path / "gym_delhi.jsonl"
+    journal = CheckpointJournal(str(path), "gym", "Delhi", 100)
+    journal.checkpoint(make_records(0, 10), depth=10)
+    journal.finish(10)
+
+    journal = CheckpointJournal(str(path), "gym", "Delhi", 100)
+    assert journal.resumed_count == 0
+    journal.close()
+
+
+def test_recovered_records_are_replayed_through_the_sinks(tmp_path, monkeypatch):
+    path = tmp_path / "gym_delhi.jsonl"
+    journal = CheckpointJournal(str(path), "gym", "Delhi", 100)
+    journal.checkpoint(make_records(0, 3), depth=3)
+    journal.close()
+
+    fresh = make_records(3, 2)
+    monkeypatch.setattr(GoogleMapsExtractor, 'iter_businesses',
+                        lambda self, max_results=100, seen=None, skip_to=0: iter(fresh))
+    store = ResultStore(str(tmp_path / "results.db"))
+    extractor = GoogleMapsExtractor(store=store)
+    shown = []
+    journal = CheckpointJournal(str(path), "gym", "Delhi", 100)
+    count = extractor.stream_results(100, sinks=[CallbackSink(shown.append)], checkpoint=journal)
+
+    names = [f"Gym {i}" for i in range(5)]
+    assert count == 5
+    assert extractor.total_businesses_scraped == 5
+    assert [record['Business Name'] for record in shown] == names
+    assert [record['Business Name'] for record in extractor.results] == names
+    assert sorted(record['Business Name'] for record in store.iter_records()) == names
+    store.close()
+
+    # The journal is not sent its own records again
+    with open(path, encoding='utf-8') as f:
+        entries = [json.loads(line) for line in f]
+    assert sum(len(entry.get('records', [])) for entry in entries) == 5
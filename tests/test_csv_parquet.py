@@ -0,0 +1,97 @@
+import csv
+import gzip
+import os
+
+import pytest
+
+from gmaps.records import BusinessRecord
+from gmaps.sinks import CsvSink, JsonlSink, ParquetSink, create_exporter, export_format_for
+
+
+def make_records():
+    return [
+        BusinessRecord(serial=1, name="Iron Gym", rating=4.5, reviews=1234, category='gym',
+                       location='Delhi', scraped_date='2024-05-01'),
+        BusinessRecord(serial=2, name="Yoga Hub", category='yoga', location='Delhi', scraped_date='2024-05-01'),
+    ]
+
+
+def read_csv(path, opener=open):
+    with opener(path, 'rt', encoding='utf-8', newline='') as f:
+        return list(csv.reader(f))
+
+
+def write_all(sink, records):
+    for record in records:
+        sink.write(record)
+    sink.close()
+
+
+def test_csv_sink_writes_header_and_rows(tmp_path):
+    path = str(tmp_path / "out.csv")
+    write_all(CsvSink(path, columns=['Business Name', 'Rating', 'Reviews'], batch_size=1), make_records())
+    assert read_csv(path) == [
+        ['Business Name', 'Rating', 'Reviews'],
+        ['Iron Gym', '4.5', '(1,234)'],
+        ['Yoga Hub', '', ''],
+    ]
+
+
+def test_csv_sink_append_writes_the_header_once(tmp_path):
+    path = str(tmp_path / "out.csv")
+    records = make_records()
+    write_all(CsvSink(path), records[:1])
+    write_all(CsvSink(path, append=True), records[1:])
+    rows = read_csv(path)
+    assert rows[0][:2] == ['Sr No.', 'Business Name']
+    assert [row[1] for row in rows[1:]] == ["Iron Gym", "Yoga Hub"]
+
+
+def test_csv_sink_gzip(tmp_path):
+    path = str(tmp_path / "out.csv.gz")
+    write_all(CsvSink(path, compression='gzip'), make_records())
+    assert len(read_csv(path, gzip.open)) == 3
+
+
+def test_parquet_sink_partitions_and_types(tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    root = str(tmp_path / "dataset")
+    sink = ParquetSink(root, batch_size=1)
+    write_all(sink, make_records())
+    assert (sink.rows, sink.batches) == (2, 2)
+    assert os.path.isdir(os.path.join(root, "keyword=gym", "location=Delhi", "scrape_date=2024-05-01"))
+
+    table = pq.read_table(root).sort_by('Sr No.')
+    assert str(table.schema.field('Rating').type) == 'double'
+    assert str(table.schema.field('Reviews').type) == 'int64'
+    assert table.column('Business Name').to_pylist() == ["Iron Gym", "Yoga Hub"]
+    assert table.column('Rating').to_pylist() == [4.5, None]
+    assert table.column('Reviews').to_pylist() == [1234, None]
+
+
+def test_parquet_exports_add_files_instead_of_overwriting(tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    root = str(tmp_path / "dataset")
+    first = ParquetSink(root)
+    write_all(first, make_records())
+    second = ParquetSink(root)
+    second.file_prefix += "-second"
+    write_all(second, make_records())
+    assert pq.read_table(root).num_rows == 4
+
+
+def test_export_format_and_exporter_follow_the_path(tmp_path):
+    assert export_format_for("out.csv.gz") == 'csv'
+    assert export_format_for("out.ndjson") == 'jsonl'
+    assert export_format_for("out.parquet") == 'parquet'
+    assert export_format_for("report.PDF") == 'pdf'
+    assert export_format_for("out.xlsx") == 'excel'
+
+    sink = create_exporter('csv', str(tmp_path / "out.csv.gz"), compression='gzip')
+    assert isinstance(sink, CsvSink)
+    sink.close()
+    sink = create_exporter('jsonl', str(tmp_path / "out.jsonl"))
+    assert isinstance(sink, JsonlSink)
+    sink.close()
+    with pytest.raises(ValueError):
+        create_exporter('xml', str(tmp_path / "out.xml"))
@@ -0,0 +1,179 @@
+import pytest
+
+import google_maps_scraper as scraper
+from google_maps_scraper import DriverPool
+
+
+class FakeSwitch:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        self.driver.current = handle
+
+
+class FakeDriver:
+    """Stands in for a Chrome session; records what the pool does to it"""
+
+    def __init__(self, heap_bytes=0):
+        self.heap_bytes = heap_bytes
+        self.window_handles = ['main']
+        self.switch_to = FakeSwitch(self)
+        self.visits = []
+        self.scripts = []
+        self.cdp = []
+        self.quit_called = False
+
+    def get(self, url):
+        self.visits.append(url)
+
+    def execute_script(self, script, *args):
+        self.scripts.append(script)
+        if 'usedJSHeapSize' in script:
+            return self.heap_bytes
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdp.append((cmd, params))
+        return {}
+
+    def close(self):
+        self.window_handles.remove(self.current)
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture
+def started(monkeypatch):
+    drivers = []
+
+    def fake_create(headless=False, lean=False, performance_log=False):
+        driver = FakeDriver()
+        driver.performance_log = performance_log
+        drivers.append(driver)
+        return driver
+
+    monkeypatch.setattr(scraper, 'create_chrome_driver', fake_create)
+    return drivers
+
+
+def test_session_is_reset_and_reused(started):
+    pool = DriverPool(size=1, max_uses=5)
+    driver = pool.acquire()
+    driver.window_handles.append('popup')
+    pool.release(driver)
+
+    assert pool.acquire() is driver
+    assert len(started) == 1
+    assert driver.window_handles == ['main']
+    assert [cmd for cmd, _ in driver.cdp] == [
+        'Network.clearBrowserCookies', 'Network.clearBrowserCache', 'Storage.clearDataForOrigin'
+    ]
+    assert driver.cdp[-1][1] == {'origin': scraper.MAPS_ORIGIN, 'storageTypes': 'all'}
+    assert driver.visits == [scraper.MAPS_URL, scraper.MAPS_URL]
+
+
+def test_session_is_recycled_after_max_uses(started):
+    pool = DriverPool(size=1, max_uses=2)
+    first = pool.acquire()
+    pool.release(first)
+    assert pool.acquire() is first
+    pool.release(first)
+
+    assert first.quit_called
+    second = pool.acquire()
+    assert second is not first
+    assert len(started) == 2
+    assert pool._uses == {second: 0}
+
+
+def test_session_is_recycled_past_memory_limit(started, monkeypatch):
+    pool = DriverPool(size=1, max_memory_mb=100)
+    driver = pool.acquire()
+    monkeypatch.setattr(pool, '_memory_mb', lambda driver: 150)
+    pool.release(driver)
+    assert driver.quit_called
+
+
+def test_memory_falls_back_to_js_heap(started):
+    # The fake has no chromedriver service, so RSS cannot be read
+    driver = FakeDriver(heap_bytes=300 * 1024 * 1024)
+    assert DriverPool()._memory_mb(driver) == 300
+
+
+def test_discard_and_close_free_their_slots(started):
+    pool = DriverPool(size=2)
+    first = pool.acquire()
+    second = pool.acquire()
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.01)
+
+    pool.release(first, discard=True)
+    assert first.quit_called
+    assert pool._created == 1
+    third = pool.acquire(timeout=0.01)
+
+    pool.release(third)
+    pool.close()
+    assert third.quit_called
+    assert pool._created == 1
+    pool.release(second)
+    assert second.quit_called
+    assert pool._created == 0
+    assert pool._uses == {}
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+
+
+def test_failed_start_gives_the_slot_back(monkeypatch):
+    def failing_create(headless=False, lean=False, performance_log=False):
+        raise RuntimeError("Chrome did not start")
+
+    monkeypatch.setattr(scraper, 'create_chrome_driver', failing_create)
+    pool = DriverPool(size=1)
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+    assert pool._created == 0
+
+
+def test_pool_starts_sessions_with_the_performance_log_it_was_asked_for(started):
+    DriverPool().acquire()
+    DriverPool(performance_log=True).acquire()
+    assert [driver.performance_log for driver in started] == [False, True]
+
+
+@pytest.mark.parametrize('options, expected', [
+    ({}, False), ({'lean': True}, True), ({'extraction_mode': 'network'}, True),
+])
+def test_extractor_asks_for_the_log_only_when_it_reads_it(options, expected):
+    assert scraper.GoogleMapsExtractor(**options).performance_log is expected
+
+
+def test_network_run_refuses_a_pool_without_the_log(started):
+    extractor = scraper.GoogleMapsExtractor(pool=DriverPool(), extraction_mode='network')
+    assert extractor.setup_driver() is False
+    assert started == []
+
+    extractor = scraper.GoogleMapsExtractor(pool=DriverPool(performance_log=True), extraction_mode='network')
+    assert extractor.setup_driver() is True
+    assert extractor.network is not None and extractor.payloads is not None
+
+
+def test_chrome_logs_performance_only_on_request(monkeypatch):
+    scraper._load_selenium()
+    launched = []
+
+    class FakeChrome(FakeDriver):
+        def __init__(self, service=None, options=None):
+            super().__init__()
+            launched.append(options.to_capabilities())
+
+        def implicitly_wait(self, seconds):
+            pass
+
+    monkeypatch.setattr(scraper, 'resolve_chromedriver', lambda: None)
+    monkeypatch.setattr(scraper.webdriver, 'Chrome', FakeChrome)
+    scraper.create_chrome_driver(headless=True)
+    scraper.create_chrome_driver(headless=True, performance_log=True)
+    assert 'goog:loggingPrefs' not in launched[0]
+    assert launched[1]['goog:loggingPrefs'] == {'performance': 'ALL'}
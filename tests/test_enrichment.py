@@ -0,0 +1,41 @@
+from google_maps_scraper import BusinessRecord, DetailEnricher
+
+
+class FakeDriver:
+    def set_page_load_timeout(self, seconds):
+        pass
+
+
+class FakePool:
+    def acquire(self):
+        return FakeDriver()
+
+    def release(self, driver, discard=False):
+        pass
+
+
+def place(index):
+    return BusinessRecord(serial=index, name=f"Gym {index}",
+                          place_url=f"https://www.google.com/maps/place/Gym+{index}/data=!1s0x{index:x}:0x{index:x}")
+
+
+def test_progress_counter_is_kept_out_of_details():
+    records = [place(index) for index in range(1, 11)]
+
+    class Enricher(DetailEnricher):
+        def _fetch(self, waits, url):
+            if url.endswith('0x3:0x3'):
+                raise RuntimeError("page did not load")
+            return {'phone': '011 1234', 'website': 'https://gym.example.com/', 'address': '',
+                    'plus_code': 'J6X2+QR', 'hours': 'Open 24 hours'}
+
+    progress = []
+    enricher = Enricher(FakePool(), concurrency=3)
+    stats = enricher.enrich(records, progress=lambda done, total: progress.append((done, total)))
+
+    assert stats == {**stats, 'targets': 10, 'enriched': 9, 'failed': 1}
+    assert enricher.done == 10
+    assert sorted(progress) == [(done, 10) for done in range(1, 11)]
+    assert records[0]['Phone'] == '011 1234'
+    assert records[2]['Phone'] == ''
+    assert records[2]['Hours'] == ''
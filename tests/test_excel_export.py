@@ -0,0 +1,66 @@
+from openpyxl import load_workbook
+
+from gmaps.sinks import ExcelStreamWriter
+
+
+def records(*names):
+    return [{'Sr No.': i, 'Business Name': name, 'Rating': 4.0} for i, name in enumerate(names, 1)]
+
+
+def write(path, rows, **options):
+    writer = ExcelStreamWriter(str(path), **options)
+    for row in rows:
+        writer.write(row)
+    writer.close()
+    return writer
+
+
+def sheet_rows(path):
+    workbook = load_workbook(path, read_only=True)
+    try:
+        return {sheet.title: [list(row) for row in sheet.iter_rows(values_only=True)] for sheet in workbook.worksheets}
+    finally:
+        workbook.close()
+
+
+def test_streams_rows_under_a_header(tmp_path):
+    path = tmp_path / "out.xlsx"
+    writer = write(path, records("Iron Gym", "Flex Gym"))
+    assert writer.rows == 2
+    assert sheet_rows(path) == {'Results': [
+        ['Sr No.', 'Business Name', 'Rating'],
+        [1, 'Iron Gym', 4],
+        [2, 'Flex Gym', 4],
+    ]}
+    assert not (tmp_path / "out.xlsx.tmp").exists()
+
+
+def test_append_adds_rows_to_the_existing_sheet(tmp_path):
+    path = tmp_path / "out.xlsx"
+    write(path, records("Iron Gym"))
+    write(path, records("Flex Gym"), append=True)
+    assert [row[1] for row in sheet_rows(path)['Results']] == ['Business Name', 'Iron Gym', 'Flex Gym']
+
+
+def test_append_keeps_other_sheets_and_their_columns(tmp_path):
+    path = tmp_path / "out.xlsx"
+    write(path, records("Iron Gym"), sheet_name="gym")
+    write(path, [{'Business Name': "Yoga Hub", 'Phone': "+91 1"}], sheet_name="yoga", append=True)
+    # Rows appended to an existing sheet follow that sheet's header order
+    write(path, [{'Rating': 3.5, 'Business Name': "Pulse Gym", 'Sr No.': 2}], sheet_name="gym", append=True)
+
+    sheets = sheet_rows(path)
+    assert list(sheets) == ['gym', 'yoga']
+    assert sheets['gym'] == [
+        ['Sr No.', 'Business Name', 'Rating'],
+        [1, 'Iron Gym', 4],
+        [2, 'Pulse Gym', 3.5],
+    ]
+    assert sheets['yoga'] == [['Business Name', 'Phone'], ['Yoga Hub', '+91 1']]
+
+
+def test_without_append_the_workbook_is_replaced(tmp_path):
+    path = tmp_path / "out.xlsx"
+    write(path, records("Iron Gym"), sheet_name="gym")
+    write(path, records("Flex Gym"))
+    assert list(sheet_rows(path)) == ['Results']
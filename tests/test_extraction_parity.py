@@ -0,0 +1,104 @@
+import json
+import os
+import re
+import time
+
+import pytest
+
+import google_maps_scraper as scraper
+from google_maps_scraper import PLACE_COUNT_JS, FeedFixtureServer, GoogleMapsExtractor
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'feed_cards.json')
+
+
+@pytest.fixture(scope='module')
+def fixture_feed():
+    """Headless Chrome with the recorded cards loaded in the fixture feed"""
+    with open(FIXTURE, encoding='utf-8') as f:
+        cards = json.load(f)
+    server = FeedFixtureServer(cards).start()
+    extractor = GoogleMapsExtractor(headless=True, maps_url=server.url(len(cards), batch=len(cards), latency=0))
+    try:
+        if not extractor.setup_driver():
+            # CI sets GMAPS_REQUIRE_CHROME so parity is always checked there
+            if os.environ.get('GMAPS_REQUIRE_CHROME'):
+                pytest.fail("Chrome is required but could not be started")
+            pytest.skip("Chrome is not available")
+        if not extractor.open_google_maps() or not extractor.search_businesses("gym", "Fixture"):
+            pytest.fail("Fixture page did not load")
+        deadline = time.monotonic() + 10
+        while extractor.driver.execute_script(PLACE_COUNT_JS) < len(cards):
+            assert time.monotonic() < deadline, "Fixture cards did not render"
+            time.sleep(0.1)
+        yield extractor, cards
+    finally:
+        extractor.close_driver()
+        server.stop()
+
+
+def test_bulk_and_per_element_read_the_same_records(fixture_feed):
+    extractor, cards = fixture_feed
+    bulk = extractor._extract_cards_bulk()
+    per_element = extractor._extract_cards_per_element()
+    assert len(bulk) == len(per_element) == len(cards)
+
+    for serial, (fast, slow) in enumerate(zip(bulk, per_element), start=1):
+        assert dict(extractor._build_business_data(fast, serial)) == dict(extractor._build_business_data(slow, serial))
+
+
+def test_fixture_fields_are_read(fixture_feed):
+    extractor, _ = fixture_feed
+    records = [extractor._build_business_data(raw, serial) for serial, raw in enumerate(extractor._extract_cards_bulk(), 1)]
+    first = records[0]
+    assert first['Business Name'] == "Gold's Gym Connaught Place"
+    assert first.rating == 4.5
+    assert first.reviews == 1234
+    assert first['Place URL'].startswith("https://www.google.com/maps/place/Gold%27s+Gym/")
+    assert records[1].rating is None and records[1].reviews is None
+    assert records[2].rating == 4.5
+    assert records[4]['Address'] == ''
+
+
+class RecordingCard:
+    """Card element that records the XPath asked for each field"""
+
+    def __init__(self):
+        self.queries = []
+
+    def find_elements(self, by, xpath):
+        self.queries.append(xpath)
+        return []
+
+
+class RecordingDriver:
+    def __init__(self, cards):
+        self.cards = cards
+        self.scripts = []
+
+    def find_elements(self, by, xpath):
+        return self.cards
+
+    def implicitly_wait(self, seconds):
+        pass
+
+    def execute_script(self, script, *args):
+        self.scripts.append((script, args))
+        return []
+
+
+def test_both_paths_use_the_same_selectors_offline():
+    scraper._load_selenium()
+    card = RecordingCard()
+    extractor = GoogleMapsExtractor()
+    extractor.driver = RecordingDriver([card])
+
+    raw = extractor._extract_cards_per_element()[0]
+    extractor._extract_cards_bulk()
+    script, (xpaths, only_new) = extractor.driver.scripts[0]
+    assert script == scraper.BULK_EXTRACT_JS
+
+    # Per-element asks for the fields in record order, bulk gets the same XPath per field
+    assert card.queries == [xpaths[field] for field in ('name', 'rating', 'reviews', 'address', 'link')]
+    # The bulk record literal carries exactly the per-element fields
+    literal = re.search(r"var record = \{(.*?)\};", script, re.DOTALL).group(1)
+    assert re.findall(r"^\s*(\w+):", literal, re.MULTILINE) == list(raw)
@@ -0,0 +1,90 @@
+import time
+
+import pytest
+
+import google_maps_scraper as scraper
+from gmaps.job_queue import JOB_MAX_ATTEMPTS, JobQueue, JobQueueServer, RemoteJobQueue
+from gmaps.records import BusinessRecord
+from gmaps.scheduling import RequestScheduler
+
+QUERIES = [{'keyword': 'gym', 'location': 'Delhi', 'max_results': 20},
+           {'keyword': 'cafe', 'location': 'Pune', 'max_results': 20}]
+
+
+@pytest.fixture
+def job_queue(tmp_path):
+    job_queue = JobQueue(str(tmp_path / "jobs.db"), lease_seconds=0.2)
+    job_queue.add(QUERIES)
+    yield job_queue
+    job_queue.close()
+
+
+@pytest.fixture
+def stub_browser(monkeypatch):
+    """Searches that return one record per keyword without starting Chrome"""
+    monkeypatch.setattr(scraper.GoogleMapsExtractor, 'setup_driver', lambda self: True)
+    monkeypatch.setattr(scraper.GoogleMapsExtractor, 'close_driver', lambda self, discard=False: None)
+    monkeypatch.setattr(scraper.GoogleMapsExtractor, 'run_query',
+                        lambda self, keyword, location, max_results: [BusinessRecord(name=f"{keyword} {location}")])
+
+
+def test_lease_complete_and_export(job_queue):
+    job = job_queue.lease('a')
+    assert (job['keyword'], job['attempt']) == ('gym', 1)
+    assert job_queue.lease('b')['keyword'] == 'cafe'
+    assert job_queue.lease('c') is None
+    assert job_queue.complete(job['id'], 'a', [BusinessRecord(name="Gym 1")])
+    assert job_queue.status()['jobs'] == {'queued': 0, 'leased': 1, 'done': 1, 'failed': 0}
+    assert [record['Business Name'] for record in job_queue.iter_results()] == ["Gym 1"]
+
+
+def test_expired_lease_is_requeued(job_queue):
+    job = job_queue.lease('crashed')
+    time.sleep(0.3)
+    assert job_queue.requeue_expired() == 1
+    assert job_queue.complete(job['id'], 'crashed', []) is False
+    again = job_queue.lease('b')
+    assert (again['id'], again['attempt']) == (job['id'], 2)
+
+
+def test_failed_job_is_retried_then_given_up(job_queue):
+    for attempt in range(1, JOB_MAX_ATTEMPTS + 1):
+        job = job_queue.lease('a')
+        assert (job['keyword'], job['attempt']) == ('gym', attempt)
+        assert job_queue.fail(job['id'], 'a', "Search failed")
+    assert job_queue.status()['jobs']['failed'] == 1
+    assert job_queue.lease('a')['keyword'] == 'cafe'
+
+
+def test_http_coordinator_requires_token(job_queue):
+    server = JobQueueServer(job_queue, port=0, token='s3cret').start()
+    try:
+        with pytest.raises(OSError):
+            RemoteJobQueue(server.url()).lease('a')
+        remote = RemoteJobQueue(server.url(), 's3cret')
+        job = remote.lease('a')
+        assert remote.heartbeat(job['id'], 'a')
+        assert remote.complete(job['id'], 'a', [BusinessRecord(name="Gym 1")])
+        assert remote.status()['jobs']['done'] == 1
+    finally:
+        server.stop()
+
+
+def test_idle_worker_does_not_spend_rate_tokens(tmp_path, stub_browser):
+    scheduler = RequestScheduler(3600, 3600)
+    path = str(tmp_path / "empty.db")
+    JobQueue(path).close()
+    assert scraper.run_queue_worker(path, scheduler=scheduler, idle_exit=0.2, heartbeat_seconds=0.05) == 0
+    assert scheduler.stats['started'] == 0
+
+
+def test_worker_holds_lease_while_paced(job_queue, stub_browser):
+    # One query per second after the first, longer than the 0.2s lease
+    scheduler = RequestScheduler(3600, 3600, burst=1, session_burst=1)
+    start = time.monotonic()
+    done = scraper.run_queue_worker(job_queue.path, scheduler=scheduler, idle_exit=0, heartbeat_seconds=0.05)
+    assert done == 2
+    assert time.monotonic() - start >= 0.9
+    assert scheduler.stats['started'] == 2
+    rows = job_queue.conn.execute("SELECT attempts FROM jobs").fetchall()
+    assert [row['attempts'] for row in rows] == [1, 1]
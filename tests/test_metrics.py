@@ -0,0 +1,95 @@
+import json
+import re
+
+import pytest
+
+from google_maps_scraper import PhaseMetrics
+
+SAMPLE_LINE = re.compile(r'^(gmaps_[a-z_]+)\{(phase|selector)="([\w.-]+)"\} (-?\d+(?:\.\d+)?)$')
+
+
+class Counter:
+    def __init__(self):
+        self.value = 0
+
+    def __call__(self):
+        return self.value
+
+
+def sample_metrics():
+    trips, found = Counter(), Counter()
+    metrics = PhaseMetrics(round_trips=trips, results=found)
+    with metrics.phase('scroll'):
+        trips.value += 5
+        found.value += 20
+    with metrics.phase('scroll'):
+        trips.value += 3
+    with pytest.raises(RuntimeError):
+        with metrics.phase('search'):
+            trips.value += 1
+            raise RuntimeError("no feed")
+    metrics.selector('name', True)
+    metrics.selector('name', True)
+    metrics.selector('rating', False)
+    return metrics
+
+
+def test_phases_count_round_trips_results_and_failures():
+    summary = sample_metrics().summary()
+    scroll = summary['phases']['scroll']
+    assert (scroll['count'], scroll['failures'], scroll['round_trips'], scroll['results']) == (2, 0, 8, 20)
+    search = summary['phases']['search']
+    assert (search['count'], search['failures'], search['round_trips']) == (1, 1, 1)
+    assert summary['selectors']['name'] == {'hits': 2, 'misses': 0, 'hit_rate': 1.0}
+    assert summary['selectors']['rating']['hit_rate'] == 0.0
+
+
+def test_prometheus_text_format():
+    text = sample_metrics().prometheus_text()
+    assert text.endswith("\n")
+
+    samples = {}
+    declared = {}
+    for line in text.splitlines():
+        if line.startswith("# HELP "):
+            name, help_text = line[7:].split(" ", 1)
+            assert help_text
+        elif line.startswith("# TYPE "):
+            name, kind = line[7:].split(" ")
+            assert kind in ('counter', 'gauge')
+            declared[name] = kind
+        else:
+            match = SAMPLE_LINE.match(line)
+            assert match, line
+            metric, _, label, value = match.groups()
+            # Every sample follows its metric's TYPE line
+            assert metric in declared
+            samples[(metric, label)] = float(value)
+
+    assert all(name.endswith('_total') for name, kind in declared.items() if kind == 'counter')
+    assert samples[('gmaps_phase_runs_total', 'scroll')] == 2
+    assert samples[('gmaps_phase_failures_total', 'search')] == 1
+    assert samples[('gmaps_phase_round_trips_total', 'scroll')] == 8
+    assert samples[('gmaps_phase_results_total', 'scroll')] == 20
+    assert samples[('gmaps_selector_hits_total', 'name')] == 2
+    assert samples[('gmaps_selector_misses_total', 'rating')] == 1
+
+
+def test_prometheus_text_without_samples():
+    text = PhaseMetrics().prometheus_text()
+    assert all(line.startswith("#") for line in text.splitlines())
+
+
+def test_trace_and_prometheus_files(tmp_path):
+    metrics = sample_metrics()
+    trace_path = str(tmp_path / "metrics" / "trace.json")
+    prom_path = str(tmp_path / "metrics" / "scraper.prom")
+    metrics.write_trace(trace_path)
+    metrics.write_prometheus(prom_path)
+
+    with open(trace_path, encoding='utf-8') as f:
+        trace = json.load(f)
+    assert [event['phase'] for event in trace['events']] == ['scroll', 'scroll', 'search']
+    assert trace['summary']['phases']['search']['failures'] == 1
+    with open(prom_path, encoding='utf-8') as f:
+        assert f.read() == metrics.prometheus_text()
@@ -0,0 +1,133 @@
+import base64
+import json
+import os
+
+import pytest
+
+from gmaps.payloads import NetworkMeter, PayloadCapture, parse_maps_payload
+from gmaps.records import extract_place_id
+from google_maps_scraper import GoogleMapsExtractor
+
+PAYLOADS = os.path.join(os.path.dirname(__file__), 'fixtures', 'payloads')
+
+
+def load(name):
+    with open(os.path.join(PAYLOADS, name), encoding='utf-8') as f:
+        return f.read()
+
+
+@pytest.mark.parametrize('name', ['search_guarded.txt', 'search_wrapped.txt'])
+def test_search_response(name):
+    places = parse_maps_payload(load(name))
+    assert [place['name'] for place in places] == ["Gold's Gym", "Anytime Fitness", "Iron Paradise"]
+
+    gym = places[0]
+    assert gym['address'] == "N-12, Connaught Place, New Delhi 110001"
+    assert gym['phone'] == "011 4150 1234"
+    assert gym['website'] == "https://goldsgym.in/delhi"
+    assert (gym['rating'], gym['reviews']) == (4.5, 1234)
+    assert (gym['latitude'], gym['longitude']) == (28.6315, 77.2167)
+    assert gym['url'].endswith("!1s0x390cfd3:0x8f2e1!8m2!3d28.6315000!4d77.2167000!19sChIJgolds00001")
+    assert extract_place_id(gym['url']) == "ChIJgolds00001"
+
+
+def test_missing_fields_fall_back():
+    fitness, paradise = parse_maps_payload(load('search_guarded.txt'))[1:]
+    # Address from its parts when the formatted address is missing
+    assert fitness['address'] == "Hauz Khas Village, New Delhi 110016"
+    assert (fitness['phone'], fitness['website'], fitness['rating'], fitness['reviews']) == ('', '', None, None)
+    assert paradise['website'] == "https://ironparadise.example.com/"
+    assert '!19s' not in paradise['url']
+
+
+def test_place_page_initialization_state():
+    places = parse_maps_payload(load('place_page.html'))
+    assert len(places) == 1
+    place = places[0]
+    assert place['name'] == "Salle de Sport Étoile"
+    assert place['address'] == "12 Av. de Wagram, 75008 Paris"
+    assert (place['rating'], place['reviews']) == (4.2, 87)
+    assert "/place/Salle+de+Sport+%C3%89toile/" in place['url']
+
+
+def test_payload_record():
+    extractor = GoogleMapsExtractor()
+    extractor.current_keyword = "gym"
+    extractor.current_location = "Delhi"
+    record = extractor._build_payload_record(parse_maps_payload(load('search_wrapped.txt'))[0], serial=1)
+    assert record['Business Name'] == "Gold's Gym"
+    assert record['Rating'] == "4.5"
+    assert record['Reviews'] == "(1,234)"
+    assert record['Latitude'] == 28.6315
+    assert record.place_id == "ChIJgolds00001"
+
+
+@pytest.mark.parametrize('body', ['<html><body>No state here</body></html>', '42', '[]'])
+def test_bodies_without_places(body):
+    assert parse_maps_payload(body) == []
+
+
+@pytest.mark.parametrize('body', ['', 'garbage', ")]}'\n[[1,2", '{"c": 0}', '{"c": 0, "d": [1]}'])
+def test_garbage_raises_value_error(body):
+    with pytest.raises(ValueError):
+        parse_maps_payload(body)
+
+
+class DevToolsDriver:
+    """Driver whose performance log and response bodies are scripted"""
+
+    def __init__(self, bodies):
+        self.bodies = bodies
+        self.log = []
+
+    def respond(self, request_id, url, size=1000):
+        for method, params in (
+            ('Network.responseReceived', {'requestId': request_id, 'response': {'url': url}}),
+            ('Network.loadingFinished', {'requestId': request_id, 'encodedDataLength': size}),
+        ):
+            self.log.append({'message': json.dumps({'message': {'method': method, 'params': params}})})
+
+    def get_log(self, kind):
+        entries, self.log = self.log, []
+        return entries
+
+    def execute_cdp_cmd(self, command, params):
+        body = self.bodies[params['requestId']]
+        if body is None:
+            raise RuntimeError("No resource with given identifier found")
+        if isinstance(body, bytes):
+            return {'body': base64.b64encode(body).decode('ascii'), 'base64Encoded': True}
+        return {'body': body, 'base64Encoded': False}
+
+
+def test_capture_reads_matching_responses(tmp_path):
+    driver = DevToolsDriver({
+        '1': load('search_guarded.txt'),
+        '2': "body.not { a: payload }",
+        '3': load('place_page.html').encode('utf-8'),
+        '4': None,
+    })
+    meter = NetworkMeter(driver)
+    capture = PayloadCapture(driver, meter, record_dir=str(tmp_path))
+
+    driver.respond('1', "https://www.google.com/search?tbm=map&authuser=0&q=gym")
+    driver.respond('2', "https://www.google.com/maps/_/js/main.css")
+    driver.respond('3', "https://www.google.com/maps/place/Salle+de+Sport/@48.87,2.29,17z")
+    driver.respond('4', "https://www.google.com/maps/preview/place?authuser=0&pb=!1m2")
+    places = capture.places()
+
+    assert [place['name'] for place in places] == [
+        "Gold's Gym", "Anytime Fitness", "Iron Paradise", "Salle de Sport Étoile"
+    ]
+    assert capture.responses == 2
+    assert len(os.listdir(tmp_path)) == 2
+    assert meter.drain()['requests'] == 4
+    assert capture.places() == []
+
+
+def test_capture_reset_drops_earlier_responses():
+    driver = DevToolsDriver({'1': load('search_guarded.txt')})
+    capture = PayloadCapture(driver, NetworkMeter(driver))
+    driver.respond('1', "https://www.google.com/search?tbm=map&q=gym")
+    capture.reset()
+    assert capture.places() == []
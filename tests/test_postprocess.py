@@ -0,0 +1,85 @@
+import pandas as pd
+import pytest
+
+from gmaps.postprocess import _match_key, flag_duplicates, normalize_records, parse_country_code, postprocess_records
+
+
+def listing(serial, name, address, phone='', url=''):
+    return {'Sr No.': serial, 'Business Name': name, 'Address': address, 'Phone': phone, 'Website': '',
+            'Rating': '', 'Reviews': '', 'Place URL': url}
+
+
+def duplicates(records):
+    return flag_duplicates(normalize_records(records))['Duplicate Of'].tolist()
+
+
+def test_chain_branches_sharing_a_phone_are_kept():
+    records = [
+        listing(1, "Gold's Gym", "N-12, Connaught Place, New Delhi 110001", "1800 266 0000"),
+        listing(2, "Gold's Gym", "Plot 4, Sector 7, Rohini, Delhi 110085", "1800 266 0000"),
+        listing(3, "Gold's Gym", "Hauz Khas Village, New Delhi 110016", "1800 266 0000"),
+    ]
+    assert duplicates(records) == ['', '', '']
+
+
+def test_phone_and_address_match_is_a_duplicate():
+    records = [
+        listing(1, "Gold's Gym", "N-12, Connaught Place, New Delhi 110001", "098110 22334"),
+        listing(2, "Golds Gym CP", "N-12 Connaught Place,  New Delhi 110001", "+91 98110 22334"),
+    ]
+    assert duplicates(records) == ['', 1]
+
+
+def test_phone_and_name_match_without_address_is_a_duplicate():
+    records = [
+        listing(1, "Iron Paradise", "Plot 4, Sector 7, Rohini", "+91 98110 22334"),
+        listing(2, "Iron Paradise", "", "098110 22334"),
+        listing(3, "Iron Paradise", "Sector 9, Rohini", "+91 98110 22334"),
+    ]
+    assert duplicates(records) == ['', 1, '']
+
+
+def test_place_id_alone_is_a_duplicate():
+    url = "https://www.google.com/maps/place/Gym/data=!4m5!3m4!1s0x1:0x2!19sChIJsame0001"
+    records = [listing(1, "Gym One", "A Road", url=url), listing(2, "Another Name", "B Road", url=url)]
+    assert duplicates(records) == ['', 1]
+
+
+def test_e164_count_matches_normalization():
+    records = [listing(1, "A", "", "098110 22334"), listing(2, "B", "", "+44 20 7946 0958"),
+               listing(3, "C", "", "12345"), listing(4, "D", "", "+0 123 456 789")]
+    _, stats = postprocess_records(records)
+    assert stats['phones_e164'] == 2
+
+
+def test_feature_id_urls_match_like_the_result_store():
+    first = "https://www.google.com/maps/place/Gym/data=!4m6!3m5!1s0x390cfd5b:0x3bf1!8m2!3d28.6!4d77.2"
+    second = "https://www.google.com/maps/place/Gym+CP/data=!3m1!1s0x390CFD5B:0x3BF1?hl=en"
+    records = [listing(1, "Gym One", "A Road", url=first), listing(2, "Another Name", "B Road", url=second)]
+    assert duplicates(records) == ['', 1]
+
+
+def test_listings_without_place_urls_match_on_name_and_address():
+    records = [
+        listing(1, "Flex Gym", "12 Mall Road, Delhi"),
+        listing(2, "Flex Gym", "12 Mall Road, Delhi"),
+        listing(3, "Flex Gym", "40 Ring Road, Delhi"),
+    ]
+    assert duplicates(records) == ['', 1, '']
+
+
+def test_match_key_expands_whole_word_abbreviations():
+    keys = _match_key(pd.Series(["Opp. City Mkt, Main Rd.", "  Street-Rd  bldg ", "Mkt2 rdx"]))
+    assert keys.tolist() == ["opposite city market main road", "street road building", "mkt2 rdx"]
+
+
+def test_country_code_is_used_for_national_numbers():
+    records = [listing(1, "A", "", "0207 946 0958"), listing(2, "B", "", "98110 22334")]
+    cleaned, _ = postprocess_records(records, country_code=parse_country_code("+44"))
+    assert [record['Phone'] for record in cleaned] == ["+442079460958", "+449811022334"]
+
+
+@pytest.mark.parametrize('text', ["", "0", "abc", "1234"])
+def test_bad_country_codes_are_rejected(text):
+    with pytest.raises(ValueError):
+        parse_country_code(text)
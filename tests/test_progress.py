@@ -0,0 +1,127 @@
+import pytest
+
+import google_maps_scraper as scraper
+from google_maps_scraper import GoogleMapsExtractorGUI, ProgressEstimator, UiEventQueue, format_eta
+
+
+@pytest.mark.parametrize('seconds, text', [(0, '0:00'), (59.6, '1:00'), (90, '1:30'), (3700, '1:01:40')])
+def test_format_eta(seconds, text):
+    assert format_eta(seconds) == text
+
+
+def test_rate_and_eta_from_samples():
+    estimator = ProgressEstimator(window=10)
+    assert estimator.update(0, 100, stamp=0.0) == (0.0, None)
+    rate, eta = estimator.update(20, 100, stamp=4.0)
+    assert rate == 5.0
+    assert eta == 16.0
+    # Done or no total means no ETA
+    assert estimator.update(100, 100, stamp=20.0)[1] is None
+    assert estimator.update(100, 0, stamp=21.0)[1] is None
+
+
+def test_rate_follows_the_sliding_window():
+    estimator = ProgressEstimator(window=10)
+    estimator.update(0, 1000, stamp=0.0)
+    estimator.update(100, 1000, stamp=10.0)
+    # The run slowed to 1/s; samples older than the window stop counting
+    rate, _ = estimator.update(110, 1000, stamp=20.0)
+    assert rate == 1.0
+
+
+def test_counting_from_zero_again_starts_a_new_estimate():
+    estimator = ProgressEstimator()
+    estimator.update(0, 50, stamp=0.0)
+    estimator.update(50, 50, stamp=10.0)
+    assert estimator.update(2, 10, stamp=11.0) == (0.0, None)
+    assert estimator.update(6, 10, stamp=12.0) == (4.0, 1.0)
+
+
+def test_queue_drains_in_batches_oldest_first():
+    events = UiEventQueue(max_batch=3)
+    for i in range(5):
+        events.post('line', f"line {i}")
+    first = events.drain()
+    assert [args for _, _, args in first] == [("line 0",), ("line 1",), ("line 2",)]
+    assert all(kind == 'line' for kind, _, _ in first)
+    assert first[0][1] <= first[-1][1]
+    assert len(events.drain()) == 2
+    assert events.drain() == []
+
+
+class FakeVar:
+    def __init__(self):
+        self.values = []
+
+    def set(self, value):
+        self.values.append(value)
+
+
+class FakeText:
+    def __init__(self):
+        self.inserts = []
+
+    def insert(self, index, text):
+        self.inserts.append(text)
+
+    def see(self, index):
+        pass
+
+
+class FakeRoot:
+    def after(self, delay, callback):
+        pass
+
+
+@pytest.fixture
+def gui():
+    pytest.importorskip('tkinter')
+    scraper._load_gui_modules()
+    gui = GoogleMapsExtractorGUI.__new__(GoogleMapsExtractorGUI)
+    gui.root = FakeRoot()
+    gui.ui_events = UiEventQueue()
+    gui.progress = ProgressEstimator()
+    gui.progress_total = 40
+    gui.status_text = ""
+    gui.results_text = FakeText()
+    gui.progress_var = FakeVar()
+    gui.status_var = FakeVar()
+    return gui
+
+
+def test_a_batch_of_events_is_drawn_once(gui):
+    gui.update_status("Searching...")
+    gui.update_results_text("Started")
+    for serial in range(1, 11):
+        gui.show_business({'Sr No.': serial, 'Business Name': f"Gym {serial}", 'Rating': "4.5"})
+    gui._apply_ui_events()
+
+    # Eleven lines in one insert, and only the last status and progress drawn
+    assert len(gui.results_text.inserts) == 1
+    lines = gui.results_text.inserts[0].splitlines()
+    assert lines[0] == "Started"
+    assert lines[-1] == "10. Gym 10 - Rating: 4.5"
+    assert len(lines) == 11
+    assert gui.progress_var.values == [25.0]
+    assert len(gui.status_var.values) == 1
+    assert gui.status_var.values[0].startswith("Extracted 10 businesses")
+
+
+def test_progress_is_shown_after_the_last_status(gui):
+    gui.update_status("Fetching details...")
+    gui._apply_ui_events()
+    gui.update_progress(3, 12)
+    gui._apply_ui_events()
+    assert gui.status_var.values == ["Fetching details...", "Fetching details 3/12"]
+    assert gui.progress_var.values == [25.0]
+
+
+def test_calls_run_in_order_with_lines(gui):
+    seen = []
+    gui.update_results_text("before")
+    gui.call_in_ui(lambda: seen.append(list(gui.results_text.inserts)))
+    gui.update_results_text("after")
+    gui._apply_ui_events()
+    assert seen == [["before\n"]]
+    assert gui.results_text.inserts == ["before\n", "after\n"]
+    assert gui.status_var.values == []
@@ -0,0 +1,79 @@
+import sqlite3
+
+from gmaps.records import BusinessRecord
+from gmaps.storage import QueryCache, query_variant
+
+
+def make_records(count):
+    return [BusinessRecord(serial=i, name=f"Gym {i}") for i in range(1, count + 1)]
+
+
+def test_empty_run_is_not_cached(tmp_path):
+    cache = QueryCache(str(tmp_path / "cache.db"))
+    try:
+        assert cache.put("gym", "Delhi", 50, []) is False
+        assert cache.get("gym", "Delhi", 50) is None
+        assert cache.get("gym", "Delhi", 10) is None
+    finally:
+        cache.close()
+
+
+def test_larger_run_serves_smaller_requests(tmp_path):
+    cache = QueryCache(str(tmp_path / "cache.db"))
+    try:
+        assert cache.put("Gym ", "delhi", 50, make_records(50))
+        records, age = cache.get("gym", "Delhi", 20)
+        assert [record['Business Name'] for record in records] == [f"Gym {i}" for i in range(1, 21)]
+        assert age >= 0
+        assert cache.get("gym", "Delhi", 100) is None
+    finally:
+        cache.close()
+
+
+def test_short_run_only_serves_up_to_its_limit(tmp_path):
+    cache = QueryCache(str(tmp_path / "cache.db"))
+    try:
+        # A single feed capped at about 120 results must not answer a bigger request
+        cache.put("gym", "Delhi", 500, make_records(120))
+        records, _ = cache.get("gym", "Delhi", 500)
+        assert len(records) == 120
+        assert cache.get("gym", "Delhi", 2000) is None
+    finally:
+        cache.close()
+
+
+def test_variants_are_cached_apart(tmp_path):
+    cache = QueryCache(str(tmp_path / "cache.db"))
+    try:
+        cache.put("gym", "Delhi", 500, make_records(120), query_variant(tiled=False))
+        assert cache.get("gym", "Delhi", 500, query_variant(tiled=True)) is None
+        assert cache.get("gym", "Delhi", 100, query_variant(extraction_mode='network')) is None
+        assert cache.get("gym", "Delhi", 100, query_variant(enriched=True)) is None
+        assert cache.get("gym", "Delhi", 100, query_variant()) is not None
+    finally:
+        cache.close()
+
+
+def test_old_cache_without_variants_is_dropped(tmp_path):
+    path = str(tmp_path / "cache.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE queries (keyword TEXT, location TEXT, max_results INTEGER, count INTEGER, "
+                 "records BLOB, size INTEGER, created REAL, last_used REAL)")
+    conn.commit()
+    conn.close()
+    cache = QueryCache(path)
+    try:
+        cache.put("gym", "Delhi", 50, make_records(5))
+        assert len(cache.get("gym", "Delhi", 50)[0]) == 5
+    finally:
+        cache.close()
+
+
+def test_expired_entries_are_missed(tmp_path):
+    cache = QueryCache(str(tmp_path / "cache.db"), ttl=-1)
+    try:
+        cache.put("gym", "Delhi", 50, make_records(5))
+        assert cache.get("gym", "Delhi", 5) is None
+        assert cache.stats['misses'] == 1
+    finally:
+        cache.close()
@@ -0,0 +1,58 @@
+import pytest
+
+from gmaps.postprocess import normalize_records
+from gmaps.records import BusinessRecord, parse_rating, parse_review_count
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('4.5 stars', 4.5),
+    ('4.5 stars 1,234 Reviews', 4.5),
+    ('Rated 4,5 étoiles', 4.5),
+    ('4,0 estrellas', 4.0),
+    ('5', 5.0),
+    ('nan', None),
+    ('inf', None),
+    ('', None),
+    ('No reviews', None),
+])
+def test_parse_rating(text, expected):
+    assert parse_rating(text) == expected
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('(1,234)', 1234),
+    ('(12)', 12),
+    ('1 234 avis', 1234),
+    ('(1.234)', 1234),
+    ('1,234 reviews · 5 photos', 1234),
+    ('', None),
+])
+def test_parse_review_count(text, expected):
+    assert parse_review_count(text) == expected
+
+
+def test_record_reads_labels_through_setitem():
+    record = BusinessRecord.from_dict({'Rating': 'Rated 4,5 étoiles', 'Reviews': '(1,234)'})
+    assert record.rating == 4.5
+    assert record.reviews == 1234
+    assert record['Rating'] == '4.5'
+    assert record['Reviews'] == '(1,234)'
+
+
+def test_unset_required_field_reads_empty():
+    record = BusinessRecord(name='Gym')
+    record['Phone'] = None
+    record['Hours'] = None
+    data = dict(record)
+    assert data['Phone'] == ''
+    assert 'Hours' not in data
+    assert len(record) == len(data)
+
+
+def test_normalize_matches_parsers():
+    frame = normalize_records([
+        {'Rating': '4.5 stars 1,234 Reviews', 'Reviews': '1,234 reviews · 5 photos'},
+        {'Rating': 'Rated 4,5 étoiles', 'Reviews': '(12)'},
+    ])
+    assert list(frame['Rating']) == [4.5, 4.5]
+    assert list(frame['Reviews']) == [1234, 12]
@@ -0,0 +1,108 @@
+import itertools
+import sqlite3
+
+import pytest
+
+from gmaps.storage import ResultStore
+
+
+def place(name, place_id=None, **fields):
+    record = {
+        'Business Name': name,
+        'Address': fields.pop('address', f"{name} Street"),
+        'Category': 'gym',
+        'Location': 'Delhi',
+        'Scraped Date': '2024-05-01',
+        'Place URL': f"https://www.google.com/maps/place/{name}/data=!4m2!3m1!19s{place_id}" if place_id else '',
+    }
+    record.update(fields)
+    return record
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Make ResultStore timestamps advance one second per call"""
+    ticks = itertools.count()
+    monkeypatch.setattr(ResultStore, '_now', staticmethod(lambda: f"2024-05-01T10:{next(ticks):05d}"))
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResultStore(str(tmp_path / "results.db"))
+    yield store
+    store.close()
+
+
+def run(store, records, keyword='gym', location='Delhi'):
+    run_id = store.begin_run(keyword, location)
+    for record in records:
+        store.upsert(record)
+    store.finish_run(run_id, len(records))
+
+
+def test_upsert_keys_by_place_id_and_keeps_known_fields(store, clock):
+    first_id = store.upsert(place("Iron Gym", "ChIJiron", Phone="+91 98100 00000", Rating=4.5))
+    assert first_id == "ChIJiron"
+    first = store.get(first_id)
+
+    # A later sighting without a phone or rating keeps the stored ones
+    assert store.upsert(place("Iron Gym Delhi", "ChIJiron")) == first_id
+    row = store.get(first_id)
+    assert row['name'] == "Iron Gym Delhi"
+    assert row['phone'] == "+91 98100 00000"
+    assert row['rating'] == "4.5"
+    assert row['first_seen'] == first['first_seen']
+    assert row['last_seen'] > first['last_seen']
+    assert len(list(store.iter_records())) == 1
+
+
+def test_places_without_place_id_are_keyed_by_name_and_address(store, clock):
+    assert store.upsert(place("Corner Gym")) == "Corner Gym|Corner Gym Street"
+    assert store.upsert(place("Corner Gym", address="Other Road")) == "Corner Gym|Other Road"
+    assert len(list(store.iter_records())) == 2
+
+
+def test_new_since_last_run(store, clock):
+    run(store, [place("Iron Gym", "ChIJiron"), place("Flex Gym", "ChIJflex")])
+    run(store, [place("Iron Gym", "ChIJiron"), place("Pulse Gym", "ChIJpulse")])
+    run(store, [place("Yoga Hub", "ChIJyoga", Category='yoga')], keyword='yoga')
+
+    new = store.new_since_last_run('gym', 'Delhi')
+    assert [record['Business Name'] for record in new] == ["Pulse Gym"]
+    assert new[0]['Sr No.'] == 1
+    assert [record['Business Name'] for record in store.new_since_last_run('yoga', 'Delhi')] == ["Yoga Hub"]
+
+
+def test_unfinished_runs_are_ignored(store, clock):
+    run(store, [place("Iron Gym", "ChIJiron")])
+    store.begin_run('gym', 'Delhi')
+    store.upsert(place("Flex Gym", "ChIJflex"))
+    # The interrupted run never finished, so the last finished run is the first one
+    assert [record['Business Name'] for record in store.new_since_last_run('gym', 'Delhi')] == ["Iron Gym", "Flex Gym"]
+
+
+def test_no_finished_run_returns_everything(store, clock):
+    store.upsert(place("Iron Gym", "ChIJiron"))
+    assert store.last_run_started('gym', 'Delhi') is None
+    assert len(store.new_since_last_run('gym', 'Delhi')) == 1
+
+
+def test_is_fresh_tracks_detail_reads(store):
+    store.upsert(place("Iron Gym", "ChIJiron"))
+    assert not store.is_fresh("ChIJiron", 3600)
+    store.upsert(place("Iron Gym", "ChIJiron"), details=True)
+    assert store.is_fresh("ChIJiron", 3600)
+    assert not store.is_fresh("ChIJiron", 0)
+    assert not store.is_fresh("ChIJmissing", 3600)
+
+
+def test_old_database_is_migrated(tmp_path):
+    path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(path)
+    conn.executescript(ResultStore.SCHEMA)
+    conn.close()
+
+    store = ResultStore(path)
+    store.upsert(place("Iron Gym", "ChIJiron"), details=True)
+    assert store.get("ChIJiron")['details_at']
+    store.close()
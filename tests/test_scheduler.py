@@ -0,0 +1,128 @@
+import pytest
+
+import google_maps_scraper as scraper
+from gmaps import scheduling
+from gmaps.scheduling import BlockedError, RequestScheduler, TokenBucket
+
+
+def test_bucket_starts_full_and_refills_at_its_rate():
+    bucket = TokenBucket(3600, burst=2)
+    bucket.updated = 0.0
+    assert bucket.wait_time(now=0.0) == 0
+    bucket.take(now=0.0)
+    bucket.take(now=0.0)
+    # One token per second at 3600/hour
+    assert bucket.wait_time(now=0.0) == pytest.approx(1.0)
+    assert bucket.wait_time(now=0.5) == pytest.approx(0.5)
+    assert bucket.wait_time(now=1.0) == 0
+
+
+def test_bucket_never_holds_more_than_its_burst():
+    bucket = TokenBucket(3600, burst=2)
+    bucket.updated = 0.0
+    bucket.wait_time(now=1000.0)
+    assert bucket.tokens == 2
+
+
+def test_rate_change_keeps_tokens_earned_so_far():
+    bucket = TokenBucket(3600, burst=1)
+    bucket.updated = 0.0
+    bucket.take(now=0.0)
+    bucket.set_rate(1800, now=0.5)
+    assert bucket.tokens == pytest.approx(0.5)
+    assert bucket.wait_time(now=0.5) == pytest.approx(1.0)
+
+
+def test_acquire_needs_both_the_global_and_the_session_bucket():
+    scheduler = RequestScheduler(rate_per_hour=3600, session_rate_per_hour=360, burst=3, session_burst=1)
+    start = scheduler.bucket.updated
+    assert scheduler.acquire('a', now=start) == 0
+    # Session 'a' is spent for ten seconds, while 'b' still has a token
+    assert scheduler.acquire('a', now=start) == pytest.approx(10.0)
+    assert scheduler.acquire('b', now=start) == 0
+    assert scheduler.acquire('c', now=start) == 0
+    # The global bucket is now empty for everyone
+    assert scheduler.acquire('d', now=start) == pytest.approx(1.0)
+    assert scheduler.stats['started'] == 3
+
+
+def test_block_halves_the_rate_and_pauses_with_growing_cooldowns(monkeypatch):
+    monkeypatch.setattr(scheduling.random, 'uniform', lambda low, high: 1.0)
+    scheduler = RequestScheduler(rate_per_hour=720)
+    now = scheduler.bucket.updated
+    assert scheduler.record_block('captcha', now=now) == scheduling.BLOCK_BACKOFF_SECONDS
+    assert scheduler.bucket.rate_per_hour == 360
+    assert scheduler.acquire('a', now=now) == pytest.approx(scheduling.BLOCK_BACKOFF_SECONDS)
+
+    assert scheduler.record_block('captcha', now=now) == 2 * scheduling.BLOCK_BACKOFF_SECONDS
+    assert scheduler.stats['blocks'] == 2
+    assert scheduler.stats['captcha'] == 2
+
+    for _ in range(20):
+        scheduler.record_block('consent', now=now)
+    assert scheduler.bucket.rate_per_hour == scheduling.RATE_LIMIT_FLOOR_PER_HOUR
+    assert scheduler.paused_until - now == scheduling.BLOCK_BACKOFF_MAX_SECONDS
+
+
+def test_successes_climb_back_to_the_configured_rate(monkeypatch):
+    monkeypatch.setattr(scheduling.random, 'uniform', lambda low, high: 1.0)
+    scheduler = RequestScheduler(rate_per_hour=1000)
+    scheduler.record_block('captcha')
+    scheduler.record_success()
+    assert scheduler.bucket.rate_per_hour == pytest.approx(500 + 1000 * scheduling.RATE_RECOVERY_STEP)
+    assert scheduler.consecutive_blocks == 0
+    for _ in range(20):
+        scheduler.record_success()
+    assert scheduler.bucket.rate_per_hour == 1000
+    assert scheduler.summary()['rate_per_hour'] == 1000
+
+
+def test_retries_stop_after_max_retries():
+    scheduler = RequestScheduler(max_retries=2)
+    assert scheduler.should_retry(1)
+    assert scheduler.should_retry(2)
+    assert not scheduler.should_retry(3)
+    assert scheduler.stats['retries'] == 2
+
+
+def test_blocked_error_names_the_page():
+    error = BlockedError('captcha')
+    assert error.kind == 'captcha'
+    assert isinstance(error, RuntimeError)
+    assert "captcha" in str(error)
+
+
+class PageDriver:
+    def __init__(self, kind):
+        self.kind = kind
+
+    def execute_script(self, script, *args):
+        return self.kind if script == scraper.BLOCK_CHECK_JS else False
+
+
+@pytest.mark.parametrize('kind', ['captcha', None])
+def test_check_blocked_reports_the_page(kind):
+    extractor = scraper.GoogleMapsExtractor()
+    extractor.driver = PageDriver(kind)
+    assert extractor.check_blocked() == kind
+    assert extractor.blocked == kind
+
+
+def test_blocked_search_raises_blocked_error(monkeypatch):
+    extractor = scraper.GoogleMapsExtractor()
+    monkeypatch.setattr(extractor, 'open_google_maps', lambda: True)
+
+    def blocked_search(keyword, location):
+        extractor.blocked = 'captcha'
+        return False
+
+    monkeypatch.setattr(extractor, 'search_businesses', blocked_search)
+    with pytest.raises(BlockedError) as raised:
+        extractor.run_query('gym', 'Delhi')
+    assert raised.value.kind == 'captcha'
+
+    extractor.blocked = None
+    monkeypatch.setattr(extractor, 'search_businesses', lambda keyword, location: False)
+    with pytest.raises(RuntimeError) as raised:
+        extractor.run_query('gym', 'Delhi')
+    assert not isinstance(raised.value, BlockedError)
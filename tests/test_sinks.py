@@ -0,0 +1,95 @@
+import gzip
+import json
+
+import pytest
+
+from gmaps.records import BusinessRecord
+from gmaps.sinks import CallbackSink, JsonlSink, ListSink
+from google_maps_scraper import GoogleMapsExtractor
+
+
+def make_records(count):
+    return [BusinessRecord(serial=i, name=f"Business {i}", rating=4.5) for i in range(1, count + 1)]
+
+
+def read_jsonl(path, opener=open):
+    with opener(path, 'rt', encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_list_and_callback_sinks_receive_every_record():
+    records = make_records(3)
+    shared = []
+    list_sink = ListSink(shared)
+    seen = []
+    callback_sink = CallbackSink(seen.append)
+    for record in records:
+        list_sink.write(record)
+        callback_sink.write(record)
+    assert list_sink.records is shared
+    assert shared == records
+    assert seen == records
+
+
+@pytest.mark.parametrize('batch_size', [1, 2, 10])
+def test_jsonl_sink_writes_one_line_per_record(tmp_path, batch_size):
+    path = tmp_path / "out.jsonl"
+    sink = JsonlSink(str(path), batch_size=batch_size)
+    for record in make_records(5):
+        sink.write(record)
+    sink.close()
+    lines = read_jsonl(path)
+    assert [line['Business Name'] for line in lines] == [f"Business {i}" for i in range(1, 6)]
+    assert lines[0]['Rating'] == "4.5"
+
+
+def test_jsonl_sink_flushes_full_batches_before_close(tmp_path):
+    path = tmp_path / "out.jsonl"
+    sink = JsonlSink(str(path), batch_size=2)
+    for record in make_records(3):
+        sink.write(record)
+    assert len(read_jsonl(path)) == 2
+    sink.close()
+    assert len(read_jsonl(path)) == 3
+
+
+def test_jsonl_sink_appends_or_overwrites(tmp_path):
+    path = tmp_path / "out.jsonl"
+    for append in (True, True):
+        sink = JsonlSink(str(path), append=append)
+        sink.write(make_records(1)[0])
+        sink.close()
+    assert len(read_jsonl(path)) == 2
+
+    sink = JsonlSink(str(path), append=False)
+    sink.write(make_records(1)[0])
+    sink.close()
+    assert len(read_jsonl(path)) == 1
+
+
+def test_jsonl_sink_gzip(tmp_path):
+    path = tmp_path / "out.jsonl.gz"
+    sink = JsonlSink(str(path), compression='gzip')
+    for record in make_records(2):
+        sink.write(record)
+    sink.close()
+    assert len(read_jsonl(path, gzip.open)) == 2
+
+    with pytest.raises(ValueError):
+        JsonlSink(str(tmp_path / "out.jsonl.zst"), compression='zstd')
+
+
+def test_stream_results_feeds_every_sink(tmp_path, monkeypatch):
+    records = make_records(4)
+    monkeypatch.setattr(GoogleMapsExtractor, 'iter_businesses',
+                        lambda self, max_results=100, seen=None, skip_to=0: iter(records))
+    extractor = GoogleMapsExtractor()
+    seen = []
+    path = tmp_path / "stream.jsonl"
+    count = extractor.stream_results(4, sinks=[CallbackSink(seen.append), JsonlSink(str(path))],
+                                     keep_results=False)
+    assert count == 4
+    assert seen == records
+    assert extractor.results == []
+    assert len(read_jsonl(path)) == 4
+    assert extractor.total_businesses_scraped == 4
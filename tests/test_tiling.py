@@ -0,0 +1,129 @@
+import io
+import json
+import time
+
+import pytest
+
+import google_maps_scraper as scraper
+from gmaps import scheduling
+from google_maps_scraper import BusinessRecord, RequestScheduler, TiledSearch, geocode_bbox
+
+# Sixteen places packed into the south-west quarter of the unit box, two in each other quarter
+DENSE_POINTS = [(0.0625 + 0.125 * i, 0.0625 + 0.125 * j) for i in range(4) for j in range(4)]
+SPARSE_POINTS = [(0.6, 0.1), (0.7, 0.2), (0.1, 0.6), (0.2, 0.7), (0.6, 0.6), (0.7, 0.7)]
+POINTS = DENSE_POINTS + SPARSE_POINTS
+
+
+def place(index):
+    return BusinessRecord(name=f"Place {index}",
+                          place_url=f"https://www.google.com/maps/place/P/data=!4m2!3m1!19sChIJplace{index}")
+
+
+def fake_search(blocked_tiles=()):
+    """Tile search stub returning the places inside the tile plus one that every tile lists"""
+    calls = []
+
+    def search(self, extractor, tile):
+        calls.append(tile)
+        if tile in blocked_tiles and calls.count(tile) == 1:
+            raise scraper.BlockedError('captcha')
+        south, west, north, east, _ = tile
+        inside = [place(i) for i, (lat, lng) in enumerate(POINTS) if south <= lat < north and west <= lng < east]
+        return inside + [place('shared')]
+
+    return search, calls
+
+
+def tiled_search(monkeypatch, search, **options):
+    monkeypatch.setattr(TiledSearch, '_search_tile', search)
+    tiled = TiledSearch('gym', 'Delhi', (0.0, 0.0, 1.0, 1.0), pool=None, workers=2, rows=2, cols=2,
+                        max_depth=2, scheduler=RequestScheduler(1e6, 1e6, max_retries=1), **options)
+    # A quarter with the 16 dense places counts as full, a sixteenth with 4 does not
+    tiled.dense_threshold = 6
+    return tiled
+
+
+def test_split_quarters_a_tile():
+    children = TiledSearch.split((0.0, 0.0, 1.0, 2.0, 0))
+    assert children == [
+        (0.0, 0.0, 0.5, 1.0, 1), (0.0, 1.0, 0.5, 2.0, 1),
+        (0.5, 0.0, 1.0, 1.0, 1), (0.5, 1.0, 1.0, 2.0, 1),
+    ]
+
+
+def test_initial_tiles_cover_the_box():
+    tiled = TiledSearch('gym', 'Delhi', (10.0, 20.0, 13.0, 22.0), pool=None, rows=3, cols=2)
+    tiles = tiled.initial_tiles()
+    assert len(tiles) == 6
+    assert tiles[0] == (10.0, 20.0, 11.0, 21.0, 0)
+    assert tiles[-1] == (12.0, 21.0, 13.0, 22.0, 0)
+
+
+def test_dense_tiles_are_split_and_places_deduplicated(monkeypatch):
+    search, calls = fake_search()
+    tiled = tiled_search(monkeypatch, search)
+    records = tiled.run(max_results=1000)
+
+    # Four quarters, then the dense south-west quarter split once more
+    assert len(calls) == 8
+    assert sum(1 for tile in calls if tile[4] == 1) == 4
+    assert len(records) == len(POINTS) + 1
+    assert sorted(record['Sr No.'] for record in records) == list(range(1, len(POINTS) + 2))
+
+    stats = tiled.stats()
+    assert stats['unique_places'] == len(POINTS) + 1
+    # The split quarter's places are listed again by its children
+    assert stats['results'] == len(POINTS) + len(DENSE_POINTS) + 8
+    assert stats['by_depth'][0]['dense'] == 1
+    assert stats['by_depth'][1]['new'] == 0
+    assert stats['by_depth'][1]['duplicate_rate'] == 1.0
+    assert stats['fully_listed_area'] == 1.0
+
+
+def test_max_results_stops_the_search(monkeypatch):
+    search, calls = fake_search()
+    tiled = tiled_search(monkeypatch, search)
+    records = tiled.run(max_results=3)
+    assert len(records) == 3
+    assert len(calls) < 8
+
+
+def test_blocked_tile_is_retried(monkeypatch):
+    monkeypatch.setattr(scheduling, 'BLOCK_BACKOFF_SECONDS', 0.01)
+    blocked = (0.5, 0.5, 1.0, 1.0, 0)
+    search, calls = fake_search(blocked_tiles={blocked})
+    tiled = tiled_search(monkeypatch, search)
+    records = tiled.run(max_results=1000)
+
+    assert calls.count(blocked) == 2
+    assert tiled.attempts == {blocked: 1}
+    assert len(records) == len(POINTS) + 1
+    assert tiled.stats()['blocks'] == 1
+
+
+@pytest.fixture
+def nominatim(monkeypatch):
+    """Record geocoding requests instead of sending them"""
+    import urllib.request
+
+    requests = []
+
+    def fake_urlopen(request, timeout=None):
+        requests.append((time.monotonic(), request))
+        return io.BytesIO(json.dumps([{'boundingbox': ["28.4", "28.9", "76.8", "77.4"]}]).encode())
+
+    monkeypatch.setattr(urllib.request, 'urlopen', fake_urlopen)
+    monkeypatch.setattr(scraper, 'GEOCODE_MIN_INTERVAL', 0.2)
+    geocode_bbox.cache_clear()
+    yield requests
+    geocode_bbox.cache_clear()
+
+
+def test_geocode_is_cached_and_rate_limited(nominatim):
+    assert geocode_bbox("Delhi") == (28.4, 76.8, 28.9, 77.4)
+    assert geocode_bbox("Delhi") == (28.4, 76.8, 28.9, 77.4)
+    geocode_bbox("Mumbai")
+
+    assert len(nominatim) == 2
+    assert nominatim[1][0] - nominatim[0][0] >= 0.2
+    assert nominatim[0][1].get_header('User-agent') == scraper.GEOCODE_USER_AGENT
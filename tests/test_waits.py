@@ -0,0 +1,93 @@
+import threading
+import time
+
+import pytest
+
+from google_maps_scraper import FEED_STATE_JS, PLACE_COUNT_JS, CancelToken, GoogleMapsExtractor, WaitEngine
+
+
+class ScriptDriver:
+    """Driver answering execute_script from a dict of script -> callable"""
+
+    def __init__(self, scripts=None):
+        self.scripts = scripts or {}
+
+    def execute_script(self, script, *args):
+        return self.scripts[script]()
+
+
+def test_wait_returns_condition_value():
+    waits = WaitEngine(ScriptDriver(), timeout=1, poll_interval=0.01)
+    calls = []
+
+    def ready(driver):
+        calls.append(1)
+        return len(calls) >= 3 and "ready"
+
+    assert waits.wait_for('ready', ready) == "ready"
+    assert waits.timings[-1]['timed_out'] is False
+
+
+def test_wait_times_out_with_none():
+    waits = WaitEngine(ScriptDriver(), timeout=0.2, poll_interval=0.02)
+    start = time.perf_counter()
+    assert waits.wait_for('never', lambda driver: False) is None
+    assert 0.2 <= time.perf_counter() - start < 1.0
+    assert waits.summary()['never'] == {**waits.summary()['never'], 'count': 1, 'timeouts': 1}
+
+
+def test_cancel_ends_wait_within_a_poll():
+    token = CancelToken()
+    waits = WaitEngine(ScriptDriver(), timeout=10, poll_interval=0.02, cancel_token=token)
+    threading.Timer(0.1, token.cancel).start()
+    start = time.perf_counter()
+    assert waits.wait_for('never', lambda driver: False) is None
+    assert time.perf_counter() - start < 1.0
+    assert waits.timings[-1]['timed_out'] is False
+
+
+def test_result_count_changed_falls_back_to_link_count():
+    counts = iter([5, 5, 8])
+    driver = ScriptDriver({FEED_STATE_JS: lambda: None, PLACE_COUNT_JS: lambda: next(counts)})
+    waits = WaitEngine(driver, timeout=1, poll_interval=0.01)
+    assert waits.result_count_changed(5) == {'count': 8, 'ended': False}
+
+
+def test_result_count_changed_stops_at_end_of_list():
+    driver = ScriptDriver({FEED_STATE_JS: lambda: {'count': 20, 'ended': True}})
+    waits = WaitEngine(driver, timeout=1, poll_interval=0.01)
+    assert waits.result_count_changed(20) == {'count': 20, 'ended': True}
+
+
+class EmptyPageDriver(ScriptDriver):
+    """A page where no element ever appears"""
+
+    def find_element(self, by, value):
+        from selenium.common.exceptions import NoSuchElementException
+        raise NoSuchElementException(value)
+
+
+def extractor_on_empty_page(timeout, token=None):
+    extractor = GoogleMapsExtractor(cancel_token=token)
+    extractor.driver = EmptyPageDriver()
+    extractor.waits = WaitEngine(extractor.driver, timeout=timeout, poll_interval=0.02, cancel_token=token)
+    return extractor
+
+
+def test_cancel_ends_search_and_feed_waits():
+    token = CancelToken()
+    extractor = extractor_on_empty_page(10, token)
+    threading.Timer(0.1, token.cancel).start()
+    start = time.perf_counter()
+    assert extractor.search_businesses('gym', 'Delhi') is False
+    assert extractor.scroll_and_load(50) is False
+    assert list(extractor.iter_businesses(50)) == []
+    assert time.perf_counter() - start < 2.0
+    assert [timing['name'] for timing in extractor.waits.timings] == ['search_box', 'feed_present']
+
+
+def test_missing_feed_fails_after_the_wait_timeout():
+    extractor = extractor_on_empty_page(0.1)
+    with pytest.raises(RuntimeError):
+        list(extractor.iter_businesses(50))
+    assert extractor.waits.summary()['feed_present']['timeouts'] == 1